@@ -3,12 +3,27 @@
 Script to resize app icons and create feature graphics for app stores.
 - Resizes input image to 512x512 for app icon
 - Creates 1024x500 feature graphic by padding square image on the right
+- Batch mode (--batch) decodes each source once, builds a downscale pyramid
+  and writes the store icon, feature graphic and every Android mipmap size,
+  processing files in parallel
 """
 
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageOps
 
+STORE_ICON_SIZE = 512
+FEATURE_SIZE = (1024, 500)
+# Launcher icon sizes per Android density bucket (48dp baseline)
+MIPMAP_SIZES = {
+    "mdpi": 48,
+    "hdpi": 72,
+    "xhdpi": 96,
+    "xxhdpi": 144,
+    "xxxhdpi": 192,
+}
+
 def resize_to_icon(input_path, output_path, size=512):
     """Resize image to square icon format"""
     try:
@@ -38,12 +53,7 @@ def create_feature_graphic(input_path, output_path, target_width=1024, target_he
             square_size = min(target_width, target_height)
             img_square = ImageOps.fit(img, (square_size, square_size), Image.Resampling.LANCZOS)
             
-            # Create new image with target dimensions
-            feature_img = Image.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
-            
-            # Calculate position to center vertically and place on the left
-            y_offset = (target_height - square_size) // 2
-            feature_img.paste(img_square, (0, y_offset), img_square)
+            feature_img = compose_feature_graphic(img_square, target_width, target_height)
             
             feature_img.save(output_path, 'PNG')
             print(f"✓ Feature graphic created: {output_path} ({target_width}x{target_height})")
@@ -52,9 +62,115 @@ def create_feature_graphic(input_path, output_path, target_width=1024, target_he
         print(f"✗ Error creating feature graphic: {e}")
         return False
 
+def compose_feature_graphic(img_square, target_width=1024, target_height=500):
+    """Place a square image on the left of a transparent target_width x target_height canvas"""
+    # Create new image with target dimensions
+    feature_img = Image.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
+    
+    # Calculate position to center vertically and place on the left
+    y_offset = (target_height - img_square.height) // 2
+    feature_img.paste(img_square, (0, y_offset), img_square)
+    return feature_img
+
+def center_square(img):
+    """Center-crop to a square, the crop ImageOps.fit would use"""
+    side = min(img.size)
+    left = (img.width - side) // 2
+    top = (img.height - side) // 2
+    return img.crop((left, top, left + side, top + side))
+
+def build_pyramid(img, sizes):
+    """
+    Return {size: square image} for every requested size.
+
+    Works from the largest size down: each level halves the previous one
+    with a 2x box reduction while it stays at least twice the target, then
+    finishes with a single LANCZOS resample, so no size is resampled from
+    the full-resolution original.
+    """
+    # Premultiplied alpha keeps transparent pixels from bleeding color into edges
+    level = center_square(img).convert('RGBa')
+    result = {}
+    for size in sorted(set(sizes), reverse=True):
+        while level.width >= size * 2:
+            level = level.reduce(2)
+        result[size] = level.resize((size, size), Image.Resampling.LANCZOS).convert('RGBA')
+    return result
+
+def export_all_sizes(input_path, output_dir):
+    """Decode input_path once and write the store icon, feature graphic and mipmaps"""
+    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    target_dir = os.path.join(output_dir, base_name)
+    os.makedirs(target_dir, exist_ok=True)
+
+    with Image.open(input_path) as img:
+        img = img.convert('RGBA')
+    feature_square = min(FEATURE_SIZE)
+    pyramid = build_pyramid(img, [STORE_ICON_SIZE, feature_square, *MIPMAP_SIZES.values()])
+
+    written = []
+    icon_path = os.path.join(target_dir, f"icon_{STORE_ICON_SIZE}.png")
+    pyramid[STORE_ICON_SIZE].save(icon_path, 'PNG')
+    written.append(icon_path)
+
+    feature_path = os.path.join(target_dir, f"feature_{FEATURE_SIZE[0]}x{FEATURE_SIZE[1]}.png")
+    compose_feature_graphic(pyramid[feature_square], *FEATURE_SIZE).save(feature_path, 'PNG')
+    written.append(feature_path)
+
+    for density, size in MIPMAP_SIZES.items():
+        mipmap_dir = os.path.join(target_dir, f"mipmap-{density}")
+        os.makedirs(mipmap_dir, exist_ok=True)
+        mipmap_path = os.path.join(mipmap_dir, "ic_launcher.png")
+        pyramid[size].save(mipmap_path, 'PNG')
+        written.append(mipmap_path)
+    return input_path, written
+
+def main_batch(argv):
+    """Batch CLI: resize.py --batch <input>... [--out DIR] [--workers N]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="resize.py --batch")
+    parser.add_argument("inputs", nargs="+", help="Source images (or directories of PNG/JPG images)")
+    parser.add_argument("--out", dest="out_dir", default="store_icons", help="Output directory (one subfolder per source)")
+    parser.add_argument("--workers", dest="workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    sources = []
+    for item in args.inputs:
+        if os.path.isdir(item):
+            sources.extend(sorted(
+                os.path.join(item, name) for name in os.listdir(item)
+                if name.lower().endswith((".png", ".jpg", ".jpeg", ".webp"))
+            ))
+        elif os.path.exists(item):
+            sources.append(item)
+        else:
+            print(f"✗ Input file not found: {item}")
+            sys.exit(1)
+
+    # Each source writes to <out>/<stem>/, so two sources with the same stem would overwrite each other
+    targets = {}
+    for source in sources:
+        stem = os.path.splitext(os.path.basename(source))[0]
+        if stem in targets:
+            print(f"✗ Output name clash: {targets[stem]} and {source} both write to {os.path.join(args.out_dir, stem)}")
+            sys.exit(1)
+        targets[stem] = source
+
+    print(f"Processing {len(sources)} source image(s) into {args.out_dir}")
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for input_path, written in executor.map(export_all_sizes, sources, [args.out_dir] * len(sources)):
+            print(f"✓ {input_path}: {len(written)} images")
+    print("\n✓ All images created successfully!")
+
 def main():
+    if len(sys.argv) >= 2 and sys.argv[1] == "--batch":
+        main_batch(sys.argv[2:])
+        return
+
     if len(sys.argv) < 2:
         print("Usage: python resize.py <input_image> [output_icon] [output_feature]")
+        print("       python resize.py --batch <input>... [--out DIR] [--workers N]")
         print("Example: python resize.py input.png icon_512.png feature_1024x500.png")
         sys.exit(1)
     
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+# Incremental build graph for the image asset pipeline
+# - Each node records its input files, parameters and output files
+# - Content hashes of inputs/outputs and a params hash are kept in a state file
+# - Only stale nodes rebuild; independent nodes run in parallel on a process pool
+#
+# Pipeline (see define_pipeline):
+#   travel_icons/<sheet>.png --split--> <sheet>_split_squares/square_r_c.png
+#       --reduce--> <sheet>_split_squares_reduced/square_r_c.png
+#       --copy--> HelloGoodbye/app/src/main/assets/travel_icons/ (active sheet only)
+#   app_icon/app_icon.svg --vector--> res/drawable/ic_launcher_foreground.xml
+#   app_icon/app_icon.svg --png--> app_icon/png_icons/app_icon_<size>x<size>.png
+#   SVGs/<name>.svg --png--> src/png_icons/SVGs/<name>_<size>px.png (as convert_to_png.py --batch)
+#   app_icon/<store source>.png --store--> store_assets/icons/<stem>/...
+
+import hashlib
+import json
+import shutil
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STATE_FILE = REPO_ROOT / ".asset_build_state.json"
+ASSETS_DIR = REPO_ROOT / "HelloGoodbye/app/src/main/assets"
+
+# Sheet whose reduced squares are shipped as assets/travel_icons/square_r_c.png
+ACTIVE_TRAVEL_SHEET = "Copilot_20250927_220508"
+# Source for the store icon / feature graphic / mipmaps
+STORE_ICON_SOURCE = REPO_ROOT / "app_icon/Copilot_20250825_175034_last.png"
+TRAVEL_GRID = 3
+
+
+# --- Actions (module level so they can run in worker processes) ---
+def action_split(inputs, outputs, params):
+    from split_image import split_image_into_squares
+
+    split_image_into_squares(inputs[0], Path(outputs[0]).parent, grid_size=params["grid"], padding=params["padding"])
+
+
+def action_reduce(inputs, outputs, params):
+    from reduce_colors import quantize_image_to_max_colors
+
+    quantize_image_to_max_colors(inputs[0], outputs[0], max_colors=params["max_colors"],
+                                 method=params["method"], dither=params["dither"])
+
+
+def action_copy(inputs, outputs, params):
+    Path(outputs[0]).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(inputs[0], outputs[0])
+
+
+def action_vector(inputs, outputs, params):
+    from svg_to_android_final import svg_file_to_vector_drawable
+
+    svg_file_to_vector_drawable(inputs[0], outputs[0], size_dp=params["size_dp"],
+                                safe_area_scale=params["safe_area_scale"])
+
+
+def action_png_sizes(inputs, outputs, params):
+    from convert_to_png import _render_job, plan_svg_jobs
+
+    # Render serially: the graph already runs nodes on a process pool
+    jobs = plan_svg_jobs(inputs[0], Path(outputs[0]).parent, params["sizes"], square=params["square"],
+                         name_format=params["name_format"])
+    for job in jobs:
+        _render_job(job)
+
+
+def action_store_icons(inputs, outputs, params):
+    sys.path.insert(0, str(REPO_ROOT / "app_icon"))
+    from resize import export_all_sizes
+
+    export_all_sizes(inputs[0], params["out_dir"])
+
+
+# --- Graph ---
+class Node:
+    """One build step: action(inputs, outputs, params) producing outputs from inputs."""
+
+    def __init__(self, name, action, inputs, outputs, params=None):
+        self.name = name
+        self.action = action
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.params = params or {}
+
+    def params_hash(self):
+        payload = json.dumps({"action": self.action.__name__, "params": self.params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _run_node(action, inputs, outputs, params):
+    # Worker entry point
+    action([str(p) for p in inputs], [str(p) for p in outputs], params)
+
+
+class BuildGraph:
+    """Nodes keyed by name; edges come from one node's outputs being another's inputs."""
+
+    def __init__(self, state_file=STATE_FILE):
+        self.nodes = {}
+        self.producers = {}
+        self.state_file = Path(state_file)
+        self.state = json.loads(self.state_file.read_text()) if self.state_file.exists() else {"nodes": {}, "files": {}}
+
+    def add(self, node):
+        if node.name in self.nodes:
+            raise ValueError(f"Duplicate node name: {node.name}")
+        for output in node.outputs:
+            if output in self.producers:
+                raise ValueError(f"{output} is produced by both {self.producers[output]} and {node.name}")
+            self.producers[output] = node.name
+        self.nodes[node.name] = node
+        return node
+
+    def dependencies(self, name):
+        return {self.producers[p] for p in self.nodes[name].inputs if p in self.producers}
+
+    def dependents(self, paths):
+        # Nodes that read any of paths, directly or through other nodes' outputs
+        consumers = {}
+        for node in self.nodes.values():
+            for p in node.inputs:
+                consumers.setdefault(p, set()).add(node.name)
+        selected = set()
+        pending = [Path(p) for p in paths]
+        while pending:
+            for name in consumers.get(pending.pop(), ()):
+                if name not in selected:
+                    selected.add(name)
+                    pending.extend(self.nodes[name].outputs)
+        return selected
+
+    def closure(self, targets):
+        # Requested nodes plus everything upstream of them
+        selected = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in selected:
+                selected.add(name)
+                pending.extend(self.dependencies(name))
+        return selected
+
+    def file_hash(self, path):
+        # sha256 of a file, memoized on (size, mtime) so unchanged files are not re-read
+        stat = path.stat()
+        key = str(path)
+        cached = self.state["files"].get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha256"]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.state["files"][key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def is_stale(self, name):
+        node = self.nodes[name]
+        record = self.state["nodes"].get(name)
+        if record is None or record["params"] != node.params_hash():
+            return True
+        if any(not p.exists() for p in node.outputs):
+            return True
+        inputs = {str(p): self.file_hash(p) for p in node.inputs}
+        outputs = {str(p): self.file_hash(p) for p in node.outputs}
+        return inputs != record["inputs"] or outputs != record["outputs"]
+
+    def record(self, name):
+        node = self.nodes[name]
+        missing = [str(p) for p in node.outputs if not p.exists()]
+        if missing:
+            raise RuntimeError(f"Node {name} did not produce {missing}")
+        self.state["nodes"][name] = {
+            "params": node.params_hash(),
+            "inputs": {str(p): self.file_hash(p) for p in node.inputs},
+            "outputs": {str(p): self.file_hash(p) for p in node.outputs},
+        }
+
+    def save(self):
+        self.state_file.write_text(json.dumps(self.state, indent=1, sort_keys=True))
+
+    def run(self, targets=None, executor=None, max_workers=None, force=False, dry_run=False, log=print):
+        """
+        Build targets (default: every node), rebuilding only stale nodes.
+
+        Staleness is decided once a node's dependencies have finished, so a
+        rebuilt upstream node that produced identical bytes does not cascade.
+        An existing executor can be passed in to keep worker processes warm.
+        Returns the list of node names that were rebuilt.
+        """
+        selected = self.closure(targets or list(self.nodes))
+        waiting = {name: self.dependencies(name) & selected for name in selected}
+        done = set()
+        rebuilt = []
+        running = {}
+        own_executor = None
+        if executor is None and not dry_run:
+            executor = own_executor = ProcessPoolExecutor(max_workers=max_workers)
+
+        while waiting or running:
+            ready = sorted(name for name, deps in waiting.items() if deps <= done)
+            for name in ready:
+                del waiting[name]
+                node = self.nodes[name]
+                missing = [p for p in node.inputs if not p.exists()]
+                # In a dry run, inputs of not-yet-built upstream nodes legitimately do not exist
+                if missing and not (dry_run and all(self.producers.get(p) in rebuilt for p in missing)):
+                    raise FileNotFoundError(f"Node {name} is missing inputs {[str(p) for p in missing]}")
+                if not force and not missing and not self.is_stale(name):
+                    done.add(name)
+                    continue
+                log(f"🔨 {name}")
+                if dry_run:
+                    rebuilt.append(name)
+                    done.add(name)
+                    continue
+                running[executor.submit(_run_node, node.action, node.inputs, node.outputs, node.params)] = name
+
+            if not running:
+                if waiting and not any(deps <= done for deps in waiting.values()):
+                    raise RuntimeError(f"Dependency cycle among {sorted(waiting)}")
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                future.result()
+                self.record(name)
+                rebuilt.append(name)
+                done.add(name)
+
+        if own_executor is not None:
+            own_executor.shutdown()
+        if not dry_run:
+            self.save()
+        return rebuilt
+
+
+def define_pipeline(graph=None, repo_root=REPO_ROOT):
+    """Register every asset node of the repository on graph"""
+    graph = graph or BuildGraph()
+    repo_root = Path(repo_root)
+
+    for sheet in sorted((repo_root / "travel_icons").glob("*.png")):
+        split_dir = repo_root / "travel_icons" / f"{sheet.stem}_split_squares"
+        reduced_dir = repo_root / "travel_icons" / f"{sheet.stem}_split_squares_reduced"
+        squares = [f"square_{r}_{c}.png" for r in range(TRAVEL_GRID) for c in range(TRAVEL_GRID)]
+        graph.add(Node(f"split:{sheet.stem}", action_split, [sheet], [split_dir / s for s in squares],
+                       {"grid": TRAVEL_GRID, "padding": 5}))
+        for square in squares:
+            graph.add(Node(f"reduce:{sheet.stem}/{square}", action_reduce, [split_dir / square], [reduced_dir / square],
+                           {"max_colors": 4, "method": "median", "dither": "none"}))
+            if sheet.stem == ACTIVE_TRAVEL_SHEET:
+                graph.add(Node(f"copy:travel_icons/{square}", action_copy, [reduced_dir / square],
+                               [ASSETS_DIR / "travel_icons" / square]))
+
+    app_svg = repo_root / "app_icon/app_icon.svg"
+    graph.add(Node("vector:ic_launcher_foreground", action_vector, [app_svg],
+                   [repo_root / "HelloGoodbye/app/src/main/res/drawable/ic_launcher_foreground.xml"],
+                   {"size_dp": 108, "safe_area_scale": 0.65}))
+    sizes = [512, 256, 128, 64, 48, 32]
+    graph.add(Node("png:app_icon", action_png_sizes, [app_svg],
+                   [repo_root / f"app_icon/png_icons/app_icon_{s}x{s}.png" for s in sizes],
+                   {"sizes": sizes, "square": True, "name_format": "{stem}_{size}x{size}.png"}))
+    svg_png_dir = repo_root / "src/png_icons/SVGs"
+    for svg in sorted((repo_root / "SVGs").glob("*.svg")):
+        graph.add(Node(f"png:SVGs/{svg.stem}", action_png_sizes, [svg],
+                       [svg_png_dir / f"{svg.stem}_{s}px.png" for s in sizes],
+                       {"sizes": sizes, "square": False, "name_format": "{stem}_{size}px.png"}))
+
+    store_dir = repo_root / "store_assets/icons"
+    store_outputs = [store_dir / STORE_ICON_SOURCE.stem / name for name in ("icon_512.png", "feature_1024x500.png")]
+    store_outputs += [store_dir / STORE_ICON_SOURCE.stem / f"mipmap-{d}" / "ic_launcher.png"
+                      for d in ("mdpi", "hdpi", "xhdpi", "xxhdpi", "xxxhdpi")]
+    graph.add(Node("store:app_icon", action_store_icons, [STORE_ICON_SOURCE], store_outputs,
+                   {"out_dir": str(store_dir)}))
+    return graph
+
+
+def main():
+    # CLI: asset_build.py [targets...] [--jobs N] [--force] [--dry-run] [--list]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("targets", nargs="*", help="Node names or name prefixes to build (default: all)")
+    parser.add_argument("--jobs", dest="jobs", type=int, default=None, help="Parallel workers (default: CPU count)")
+    parser.add_argument("--force", dest="force", action="store_true", help="Rebuild selected nodes even if up to date")
+    parser.add_argument("--dry-run", dest="dry_run", action="store_true", help="Only print what would be rebuilt")
+    parser.add_argument("--list", dest="list_nodes", action="store_true", help="List nodes and whether they are stale")
+    args = parser.parse_args()
+
+    graph = define_pipeline()
+    if args.list_nodes:
+        for name in sorted(graph.nodes):
+            state = "stale" if any(not p.exists() for p in graph.nodes[name].inputs) or graph.is_stale(name) else "ok"
+            print(f"{state:>5}  {name}")
+        return
+
+    targets = None
+    if args.targets:
+        targets = [name for name in graph.nodes if any(name == t or name.startswith(t) for t in args.targets)]
+        if not targets:
+            print(f"❌ No nodes match {args.targets}")
+            sys.exit(1)
+
+    rebuilt = graph.run(targets, max_workers=args.jobs, force=args.force, dry_run=args.dry_run)
+    verb = "Would rebuild" if args.dry_run else "Rebuilt"
+    print(f"\nDone. {verb} {len(rebuilt)} of {len(graph.closure(targets or list(graph.nodes)))} node(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+# Watch asset sources and incrementally rebuild what changed
+# - Watches travel_icons/, SVGs/ and app_icon/ (watchdog/inotify if installed, else mtime polling)
+# - Changes are debounced, then only nodes downstream of the changed files run
+#   (split_image -> reduce_colors -> copy into HelloGoodbye/app/src/main/assets, etc.)
+# - Content hashes in the build graph skip files that were touched but not changed
+# - One process pool stays up for the whole session with the image libraries pre-imported
+
+import importlib.util
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from asset_build import REPO_ROOT, STATE_FILE, BuildGraph, define_pipeline
+
+WATCH_DIRS = [REPO_ROOT / "travel_icons", REPO_ROOT / "SVGs", REPO_ROOT / "app_icon"]
+WATCH_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".svg"}
+
+
+def _warm_worker():
+    # Process pool initializer: pay the import cost once per worker, not per change
+    import PIL.Image  # noqa: F401
+
+    import reduce_colors  # noqa: F401
+    import split_image  # noqa: F401
+    import svg_to_android_final  # noqa: F401
+
+    if importlib.util.find_spec("cairosvg") is not None:
+        import cairosvg  # noqa: F401
+
+
+def _is_source(path):
+    return path.suffix.lower() in WATCH_SUFFIXES
+
+
+class PollingWatcher:
+    """Detects added, removed and modified files by comparing (size, mtime) snapshots."""
+
+    def __init__(self, roots):
+        self.roots = [Path(r) for r in roots]
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for root in self.roots:
+            if not root.exists():
+                continue
+            for path in root.rglob("*"):
+                if _is_source(path) and path.is_file():
+                    stat = path.stat()
+                    snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def poll(self):
+        current = self._scan()
+        changed = {p for p in current.keys() | self.snapshot.keys() if current.get(p) != self.snapshot.get(p)}
+        self.snapshot = current
+        return changed
+
+    def stop(self):
+        pass
+
+
+class WatchdogWatcher:
+    """Collects paths from watchdog (inotify/FSEvents) events between polls."""
+
+    def __init__(self, roots):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        self._lock = threading.Lock()
+        self._changed = set()
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                paths = [event.src_path] + ([event.dest_path] if getattr(event, "dest_path", None) else [])
+                with watcher._lock:
+                    watcher._changed.update(Path(p) for p in paths if _is_source(Path(p)))
+
+        self._observer = Observer()
+        for root in roots:
+            if Path(root).exists():
+                self._observer.schedule(Handler(), str(root), recursive=True)
+        self._observer.start()
+
+    def poll(self):
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def stop(self):
+        self._observer.stop()
+        self._observer.join()
+
+
+def rebuild(changed, executor, state_file=STATE_FILE, log=print):
+    """Re-plan the pipeline (new files add nodes) and run the nodes downstream of changed"""
+    graph = define_pipeline(BuildGraph(state_file))
+    targets = graph.dependents(changed)
+    if not targets:
+        return graph, []
+    start = time.perf_counter()
+    rebuilt = graph.run(sorted(targets), executor=executor, log=log)
+    if rebuilt:
+        log(f"✅ Rebuilt {len(rebuilt)} node(s) in {time.perf_counter() - start:.2f}s")
+    return graph, rebuilt
+
+
+def watch(roots=WATCH_DIRS, interval=0.2, debounce=0.3, max_workers=None, polling=False,
+          initial_build=True, state_file=STATE_FILE, log=print):
+    """Watch roots until interrupted, rebuilding affected nodes after each burst of changes"""
+    use_watchdog = not polling and importlib.util.find_spec("watchdog") is not None
+    watcher = WatchdogWatcher(roots) if use_watchdog else PollingWatcher(roots)
+    log(f"👀 Watching {', '.join(str(Path(r).relative_to(REPO_ROOT)) for r in roots)} "
+        f"({'watchdog' if use_watchdog else 'polling'}, debounce {debounce}s)")
+
+    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_worker)
+    pending = set()
+    last_change = 0.0
+    try:
+        # Inside the try: a failing initial build still stops the watcher and the pool
+        graph = define_pipeline(BuildGraph(state_file))
+        if initial_build:
+            graph.run(executor=executor, log=log)
+
+        while True:
+            # Files written by the graph itself (e.g. split squares) are not sources
+            changed = {p for p in watcher.poll() if p not in graph.producers}
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= debounce:
+                for path in sorted(pending):
+                    log(f"📝 {path.relative_to(REPO_ROOT) if path.is_relative_to(REPO_ROOT) else path}")
+                batch, pending = pending, set()
+                # A failing step (e.g. a half-copied file) is reported and retried on the next change
+                try:
+                    graph, _ = rebuild(batch, executor, state_file=state_file, log=log)
+                except Exception:
+                    log(f"❌ Rebuild failed:\n{traceback.format_exc()}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        log("\n👋 Stopping watch")
+    finally:
+        watcher.stop()
+        executor.shutdown()
+
+
+def main():
+    # CLI: asset_watch.py [--interval 0.2] [--debounce 0.3] [--jobs N] [--polling] [--no-initial-build]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--interval", dest="interval", type=float, default=0.2, help="Seconds between change checks")
+    parser.add_argument("--debounce", dest="debounce", type=float, default=0.3, help="Quiet period before rebuilding")
+    parser.add_argument("--jobs", dest="jobs", type=int, default=None, help="Warm worker processes (default: CPU count)")
+    parser.add_argument("--polling", dest="polling", action="store_true", help="Poll mtimes even if watchdog is installed")
+    parser.add_argument("--no-initial-build", dest="initial_build", action="store_false", help="Do not bring everything up to date before watching")
+    args = parser.parse_args()
+
+    watch(interval=args.interval, debounce=args.debounce, max_workers=args.jobs, polling=args.polling,
+          initial_build=args.initial_build)
+
+
+if __name__ == "__main__":
+    main()
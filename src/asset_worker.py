@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+
+# Long-lived asset worker
+# - Imports Pillow, cairosvg and the converters once, then serves requests
+# - Avoids per-call interpreter startup when a watcher or CI loop runs many small jobs
+# - Transport: JSON lines over stdin/stdout (default) or a Unix socket (--socket PATH)
+#
+# Protocol: one JSON object per line
+#   request:  {"id": 1, "op": "quantize", "args": {"img_path": "a.png", "out_path": "b.png", "max_colors": 4}}
+#   response: {"id": 1, "ok": true, "result": "b.png", "ms": 12.5}
+#             {"id": 1, "ok": false, "error": "FileNotFoundError: ...", "traceback": "..."}
+#
+# Ops:
+#   ping                                                   -> "pong"
+#   quantize    img_path, out_path, max_colors, method, dither  (reduce_colors.quantize_image_to_max_colors)
+#   split       input_path, output_dir, grid_size, padding      (split_image.split_image_into_squares)
+#   svg_to_png  svg_path, png_path, size, keep_aspect            (convert_to_png, SVG bytes kept warm)
+#   vector      svg_path, output_path, size_dp, safe_area_scale, optimize, precision
+#                                                                (svg_to_android_final.svg_file_to_vector_drawable)
+#   shutdown    stop the worker
+
+import contextlib
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+
+
+class WorkerError(RuntimeError):
+    """A request failed inside the worker; carries the remote traceback"""
+
+
+# --- Ops (imports are deferred to load_ops so clients stay lightweight) ---
+def load_ops():
+    """Import the image libraries and return {op name: handler}"""
+    from PIL import Image  # noqa: F401  (warm import)
+
+    from convert_to_png import _render_job
+    from reduce_colors import quantize_image_to_max_colors
+    from split_image import split_image_into_squares
+    from svg_to_android_final import svg_file_to_vector_drawable
+
+    def op_quantize(img_path, out_path, max_colors=4, method="median", dither="none"):
+        quantize_image_to_max_colors(img_path, out_path, max_colors=max_colors, method=method, dither=dither)
+        return str(out_path)
+
+    def op_split(input_path, output_dir, grid_size=3, padding=5):
+        split_image_into_squares(input_path, output_dir, grid_size=grid_size, padding=padding)
+        return [str(Path(output_dir) / f"square_{r}_{c}.png") for r in range(grid_size) for c in range(grid_size)]
+
+    # Raw SVG bytes per path, re-read when the file changes; the tree itself is
+    # parsed per request because cairosvg mutates it while rendering
+    svg_bytes = {}
+
+    def read_svg(svg_path):
+        stat = os.stat(svg_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = svg_bytes.get(svg_path)
+        if cached is None or cached[0] != key:
+            cached = (key, Path(svg_path).read_bytes())
+            svg_bytes[svg_path] = cached
+        return cached[1]
+
+    def op_svg_to_png(svg_path, png_path, size=512, keep_aspect=False):
+        job = (str(svg_path), read_svg(str(svg_path)), str(png_path), size, None if keep_aspect else size)
+        return _render_job(job)[0]
+
+    def op_vector(svg_path, output_path, **options):
+        return svg_file_to_vector_drawable(svg_path, output_path, **options)
+
+    return {
+        "ping": lambda: "pong",
+        "quantize": op_quantize,
+        "split": op_split,
+        "svg_to_png": op_svg_to_png,
+        "vector": op_vector,
+    }
+
+
+def handle_request(ops, line):
+    """Run one request line and return (response dict, whether to shut down)"""
+    request = json.loads(line)
+    op = request.get("op")
+    response = {"id": request.get("id")}
+    if op == "shutdown":
+        response.update(ok=True, result="bye")
+        return response, True
+    if op not in ops:
+        response.update(ok=False, error=f"Unknown op: {op!r}", traceback="")
+        return response, False
+
+    start = time.perf_counter()
+    # A bad request must not take the worker down; the failure is reported to the client
+    try:
+        result = ops[op](**request.get("args", {}))
+    except Exception as e:
+        response.update(ok=False, error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+    else:
+        response.update(ok=True, result=result)
+    response["ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return response, False
+
+
+def serve_stdio(ops):
+    """Serve requests from stdin; progress prints of the tools go to stderr"""
+    out = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            response, stop = handle_request(ops, line)
+            out.write(json.dumps(response) + "\n")
+            out.flush()
+            if stop:
+                break
+
+
+def serve_socket(ops, socket_path):
+    """Serve requests on a Unix socket; each connection may send many lines"""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                if not raw.strip():
+                    continue
+                response, stop = handle_request(ops, raw.decode("utf-8"))
+                self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+                self.wfile.flush()
+                if stop:
+                    # Called from a handler thread, so serve_forever can return
+                    self.server.shutdown()
+                    return
+
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        socket_path.unlink()
+    with socketserver.ThreadingUnixStreamServer(str(socket_path), Handler) as server:
+        server.daemon_threads = True
+        print(f"🟢 Asset worker listening on {socket_path} (pid {os.getpid()})")
+        server.serve_forever()
+    socket_path.unlink()
+
+
+# --- Client ---
+class WorkerClient:
+    """
+    Send requests to a worker.
+
+    With socket_path, connects to a running `asset_worker.py --socket PATH`;
+    otherwise spawns a private stdio worker that lives as long as the client.
+    """
+
+    def __init__(self, socket_path=None):
+        self._next_id = 0
+        self._process = None
+        self._socket = None
+        if socket_path:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(str(socket_path))
+            self._reader = self._socket.makefile("r", encoding="utf-8")
+            self._writer = self._socket.makefile("w", encoding="utf-8")
+        else:
+            self._process = subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve())],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+            )
+            self._reader = self._process.stdout
+            self._writer = self._process.stdin
+
+    def request(self, op, **args):
+        """Send one request and return the full response dict"""
+        self._next_id += 1
+        self._writer.write(json.dumps({"id": self._next_id, "op": op, "args": args}) + "\n")
+        self._writer.flush()
+        line = self._reader.readline()
+        if not line:
+            raise WorkerError(f"Worker closed the connection during {op!r}")
+        return json.loads(line)
+
+    def call(self, op, **args):
+        """Send one request and return its result, raising WorkerError on failure"""
+        response = self.request(op, **args)
+        if not response["ok"]:
+            raise WorkerError(f"{op} failed: {response['error']}\n{response['traceback']}")
+        return response["result"]
+
+    def close(self, shutdown=None):
+        # A private stdio worker is always shut down; a shared socket worker only on request
+        if shutdown or (shutdown is None and self._process is not None):
+            self.request("shutdown")
+        self._writer.close()
+        self._reader.close()
+        if self._socket is not None:
+            self._socket.close()
+        if self._process is not None:
+            self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    # CLI: asset_worker.py [--socket PATH]
+    #      asset_worker.py --socket PATH --send OP '{"arg": ...}'   (one request to a running worker)
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--socket", dest="socket_path", default=None, help="Serve on (or, with --send, connect to) this Unix socket instead of stdin/stdout")
+    parser.add_argument("--send", dest="send", nargs="+", metavar=("OP", "ARGS_JSON"), default=None, help="Send one request to a running socket worker and print the response")
+    args = parser.parse_args()
+
+    if args.send:
+        if not args.socket_path:
+            print("❌ --send requires --socket")
+            sys.exit(1)
+        op_args = json.loads(args.send[1]) if len(args.send) > 1 else {}
+        client = WorkerClient(args.socket_path)
+        response = client.request(args.send[0], **op_args)
+        client.close(shutdown=False)
+        print(json.dumps(response, indent=2))
+        sys.exit(0 if response["ok"] else 1)
+
+    ops = load_ops()
+    if args.socket_path:
+        serve_socket(ops, args.socket_path)
+    else:
+        serve_stdio(ops)
+
+
+if __name__ == "__main__":
+    main()
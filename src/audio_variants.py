@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+# Slow and loudness-normalized variants of the corpus audio clips
+# - slow:       time-stretched to --rate (default 0.75x) with WSOLA, so the pitch is
+#               unchanged, then normalized like below
+# - normalized: same speed, RMS of the voiced part brought to --target-dbfs, with the
+#               gain capped so peaks stay under -1 dBFS
+# - Clips are decoded to mono PCM (WAV with the wave module, MP3 through ffmpeg),
+#   processed with NumPy and written back in the clip's format; clips run on a process pool
+# - Cache: sha256 of the source clip + variant settings -> sha256 of the output, so a
+#   variant is only rebuilt if its source or settings changed or the file was touched
+# - Each corpus cell gets "audio_file_slow" / "audio_file_normalized" next to "audio_file"
+
+import hashlib
+import io
+import json
+import subprocess
+import sys
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    print("NumPy is required. Install with: pip install numpy")
+    sys.exit(1)
+
+from tools.audio_tools import mp3_sample_rate
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = REPO_ROOT / "HelloGoodbye/app/src/main/assets"
+AUDIO_DIR = ASSETS_DIR / "audio_files"
+CACHE_FILE = REPO_ROOT / ".audio_variants_cache.json"
+
+VARIANTS = ("slow", "normalized")
+SLOW_RATE = 0.75
+TARGET_DBFS = -20.0
+PEAK_DBFS = -1.0
+# WSOLA frame length and the range searched for the best-matching input frame
+FRAME_SECONDS = 0.04
+SEARCH_SECONDS = 0.01
+
+
+def read_audio(path):
+    """(float32 mono samples in [-1, 1], sample rate) for a WAV or MP3 file"""
+    path = Path(path)
+    if path.suffix.lower() == ".wav":
+        with wave.open(str(path)) as w:
+            rate, width, channels = w.getframerate(), w.getsampwidth(), w.getnchannels()
+            raw = w.readframes(w.getnframes())
+        if width == 1:
+            samples = (np.frombuffer(raw, np.uint8).astype(np.float32) - 128) / 128
+        else:
+            dtype = {2: np.int16, 4: np.int32}[width]
+            samples = np.frombuffer(raw, dtype).astype(np.float32) / float(np.iinfo(dtype).max)
+        return samples.reshape(-1, channels).mean(axis=1), rate
+
+    data = path.read_bytes()
+    rate = mp3_sample_rate(data)
+    raw = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", "pipe:0", "-f", "s16le", "-ac", "1", "-ar", str(rate), "pipe:1"],
+        input=data, check=True, capture_output=True,
+    ).stdout
+    return np.frombuffer(raw, np.int16).astype(np.float32) / 32767, rate
+
+
+def encode_audio(samples, rate, suffix):
+    """Bytes of a 16-bit mono WAV, or of an MP3 encoded by ffmpeg (libmp3lame VBR)"""
+    pcm = (np.clip(samples, -1, 1) * 32767).astype(np.int16).tobytes()
+    if suffix.lower() == ".wav":
+        out = io.BytesIO()
+        with wave.open(out, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(rate)
+            w.writeframes(pcm)
+        return out.getvalue()
+    return subprocess.run(
+        ["ffmpeg", "-v", "error", "-f", "s16le", "-ar", str(rate), "-ac", "1", "-i", "pipe:0",
+         "-codec:a", "libmp3lame", "-q:a", "4", "-f", "mp3", "pipe:1"],
+        input=pcm, check=True, capture_output=True,
+    ).stdout
+
+
+def time_stretch(samples, rate, factor):
+    """
+    WSOLA time stretch: output lasts len / factor samples at the same pitch.
+
+    Output frames are laid at a fixed hop; each takes the input frame near its
+    nominal position that best continues the previous frame (cross-correlation),
+    so overlapping frames stay in phase.
+    """
+    frame = max(16, int(FRAME_SECONDS * rate)) // 2 * 2
+    hop_out = frame // 2
+    hop_in = hop_out * factor
+    search = int(SEARCH_SECONDS * rate)
+    window = np.hanning(frame).astype(np.float32)
+
+    padded = np.concatenate([np.zeros(search, np.float32), samples, np.zeros(frame + search, np.float32)])
+    frames = int(np.ceil(len(samples) / hop_in))
+    out = np.zeros(frames * hop_out + frame, np.float32)
+    weight = np.zeros_like(out)
+    previous = search  # padded index of the previous input frame
+    for k in range(frames):
+        nominal = search + int(round(k * hop_in))
+        if k == 0:
+            chosen = nominal
+        else:
+            template = padded[previous + hop_out:previous + hop_out + frame]
+            region = padded[nominal - search:nominal + search + frame]
+            chosen = nominal - search + int(np.argmax(np.correlate(region, template, mode="valid")))
+        out[k * hop_out:k * hop_out + frame] += padded[chosen:chosen + frame] * window
+        weight[k * hop_out:k * hop_out + frame] += window
+        previous = chosen
+    out /= np.maximum(weight, 1e-3)
+    return out[:int(round(len(samples) / factor))]
+
+
+def normalize(samples, rate, target_dbfs=TARGET_DBFS, peak_dbfs=PEAK_DBFS):
+    """Scale to target RMS over the voiced 20 ms blocks, never pushing the peak above peak_dbfs"""
+    block = max(1, int(0.02 * rate))
+    usable = len(samples) // block * block
+    if usable == 0:
+        return samples
+    energy = np.sqrt((samples[:usable].reshape(-1, block) ** 2).mean(axis=1))
+    voiced = energy[energy > energy.max() * 0.05]  # ignore leading/trailing silence
+    rms = float(np.sqrt((voiced ** 2).mean())) if len(voiced) else 0.0
+    peak = float(np.abs(samples).max())
+    if rms == 0 or peak == 0:
+        return samples
+    gain = min(10 ** (target_dbfs / 20) / rms, 10 ** (peak_dbfs / 20) / peak)
+    return samples * gain
+
+
+def variant_path(audio_path, variant):
+    path = Path(audio_path)
+    return path.with_name(f"{path.stem}_{variant}{path.suffix}")
+
+
+def make_variant(job):
+    """Build one variant: job = (source path, variant, slow rate, target dBFS); returns (output path, sha256)"""
+    source, variant, slow_rate, target_dbfs = job
+    samples, rate = read_audio(source)
+    if variant == "slow":
+        samples = time_stretch(samples, rate, slow_rate)
+    data = encode_audio(normalize(samples, rate, target_dbfs), rate, Path(source).suffix)
+    out = variant_path(source, variant)
+    out.write_bytes(data)
+    return str(out), hashlib.sha256(data).hexdigest()
+
+
+def _sha256(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def add_audio_variants(corpus, audio_root=AUDIO_DIR, variants=VARIANTS, slow_rate=SLOW_RATE,
+                       target_dbfs=TARGET_DBFS, max_workers=None, cache_file=CACHE_FILE, log=print):
+    """
+    Create the variants of every cell's audio_file and record them in the cells.
+
+    audio_file values are resolved against audio_root and variant paths are written
+    in the same form (a basename stays a basename). Returns (built, cached) counts.
+    """
+    cache = json.loads(Path(cache_file).read_text()) if Path(cache_file).exists() else {}
+    settings = {"slow": f"slow:{slow_rate}:{target_dbfs}", "normalized": f"normalized:{target_dbfs}"}
+    jobs, job_keys = [], {}
+    cached = 0
+    for entry in corpus:
+        for lang, cell in entry.items():
+            if lang == "original" or not (cell or {}).get("audio_file"):
+                continue
+            source = Path(audio_root) / cell["audio_file"]
+            source_hash = _sha256(source)
+            for variant in variants:
+                cell[f"audio_file_{variant}"] = str(variant_path(cell["audio_file"], variant))
+                key = f"{source_hash}:{settings[variant]}"
+                out = variant_path(source, variant)
+                if key in cache and out.exists() and _sha256(out) == cache[key]:
+                    cached += 1
+                    continue
+                job = (str(source), variant, slow_rate, target_dbfs)
+                if job not in job_keys:
+                    jobs.append(job)
+                job_keys[job] = key
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for job, (out, digest) in zip(jobs, executor.map(make_variant, jobs)):
+                cache[job_keys[job]] = digest
+                log(f"✅ {out}")
+    Path(cache_file).write_text(json.dumps(cache, indent=1, sort_keys=True))
+    return len(jobs), cached
+
+
+def main():
+    # CLI: audio_variants.py [--corpus corpus.json] [--audio-dir DIR] [--variants slow,normalized] [--rate 0.75]
+    #                        [--target-dbfs -20] [--workers N] [--cache FILE]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--corpus", dest="corpus", default=str(ASSETS_DIR / "corpus.json"), help="Corpus JSON to update in place")
+    parser.add_argument("--audio-dir", dest="audio_dir", default=str(AUDIO_DIR), help="Directory audio_file values are relative to")
+    parser.add_argument("--variants", dest="variants", default=",".join(VARIANTS), help="Comma-separated variants to build")
+    parser.add_argument("--rate", dest="rate", type=float, default=SLOW_RATE, help="Speed of the slow variant (0.75 = 75%%)")
+    parser.add_argument("--target-dbfs", dest="target_dbfs", type=float, default=TARGET_DBFS, help="Loudness target (RMS dBFS)")
+    parser.add_argument("--workers", dest="workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--cache", dest="cache", default=str(CACHE_FILE), help="Cache of per-content-hash results")
+    args = parser.parse_args()
+
+    variants = [v for v in args.variants.split(",") if v]
+    unknown = set(variants) - set(VARIANTS)
+    if unknown:
+        parser.error(f"unknown variant(s): {', '.join(sorted(unknown))}")
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+    built, cached = add_audio_variants(corpus, args.audio_dir, variants, args.rate, args.target_dbfs,
+                                       args.workers, args.cache)
+    with open(args.corpus, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=2)
+    print(f"\nDone. Built {built} variant(s), {cached} up to date; updated {args.corpus}")
+
+
+if __name__ == "__main__":
+    main()
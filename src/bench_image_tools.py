@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+# Benchmark wall time and memory of the image tooling, with stored baselines
+# - Generates synthetic gradient-heavy RGBA images and SVGs of increasing size,
+#   replicated --counts times, outside the timed region
+# - Cases: reduce_colors.quantize_image_to_max_colors (per method / strip mode),
+#   split_image.split_image_into_squares, app_icon/resize.py resize_to_icon and
+#   create_feature_graphic, svg_to_android_final.svg_file_to_vector_drawable
+# - Each case runs in a fresh process, so its peak RSS is its own: best wall time of
+#   --repeat runs, peak RSS (VmHWM), tracemalloc peak (one extra traced run;
+#   Pillow's C buffers are not traced, NumPy's are) and bytes written
+# - --save-baseline stores the results; later runs are compared against the baseline
+#   and exit with status 1 if any case got slower, bigger or more memory-hungry
+#   than the tolerances allow
+
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from bench_vector_drawables import write_large_svg
+from reduce_colors import quantize_image_to_max_colors
+from split_image import split_image_into_squares
+from svg_to_android_final import svg_file_to_vector_drawable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "app_icon"))
+from resize import create_feature_graphic, resize_to_icon  # noqa: E402
+
+BASELINE_FILE = REPO_ROOT / ".bench_image_baseline.json"
+
+# tool -> (input kind, parameter sets)
+TOOLS = {
+    "quantize": ("image", [
+        {"max_colors": 4, "method": "median"},
+        {"max_colors": 4, "method": "fast"},
+        {"max_colors": 4, "method": "kmeans"},
+        {"max_colors": 4, "method": "median", "strip_height": 256},
+    ]),
+    "split": ("image", [{"grid_size": 3}]),
+    "icon": ("image", [{"size": 512}]),
+    "feature": ("image", [{}]),
+    "vector_drawable": ("svg", [{"optimize": True}, {"optimize": False}]),
+}
+
+# Relative growth allowed before a metric counts as a regression, and the absolute
+# change below which it is treated as noise
+TOLERANCES = {"seconds": 0.25, "peak_rss_kib": 0.10, "traced_peak_kib": 0.10, "output_bytes": 0.01}
+NOISE_FLOORS = {"seconds": 0.02, "peak_rss_kib": 8192, "traced_peak_kib": 256, "output_bytes": 0}
+
+
+def write_synthetic_image(path, size):
+    # Gradient art on a rounded transparent-edged canvas, with flat shapes on top
+    red = Image.linear_gradient("L").resize((size, size))
+    green = Image.radial_gradient("L").resize((size, size))
+    blue = red.transpose(Image.Transpose.ROTATE_90)
+    image = Image.merge("RGB", (red, green, blue)).convert("RGBA")
+    draw = ImageDraw.Draw(image)
+    for i in range(12):
+        x, y = (i * 37 % 100) * size // 100, (i * 61 % 100) * size // 100
+        draw.ellipse((x, y, x + size // 8, y + size // 8), fill=((i * 70) % 256, (i * 150) % 256, (i * 30) % 256, 255))
+    mask = Image.new("L", (size, size), 0)
+    margin = size // 16
+    ImageDraw.Draw(mask).rounded_rectangle((margin, margin, size - margin, size - margin), radius=size // 8, fill=255)
+    image.putalpha(mask)
+    image.save(path, format="PNG")
+    return path
+
+
+def build_fixtures(work_dir, sizes, svg_shapes, counts):
+    # {(kind, size, count): directory with count copies of one synthetic input}
+    fixtures = {}
+    for kind, values, suffix in (("image", sizes, ".png"), ("svg", svg_shapes, ".svg")):
+        for value in values:
+            seed = Path(work_dir) / f"{kind}_{value}{suffix}"
+            if kind == "image":
+                write_synthetic_image(seed, value)
+            else:
+                write_large_svg(seed, value)
+            for count in counts:
+                directory = Path(work_dir) / f"{kind}_{value}_x{count}"
+                directory.mkdir()
+                for i in range(count):
+                    shutil.copyfile(seed, directory / f"input_{i}{suffix}")
+                fixtures[(kind, value, count)] = directory
+    return fixtures
+
+
+def case_name(tool, params, kind, value, count):
+    settings = " ".join(f"{key}={setting}" for key, setting in params.items())
+    unit = "px" if kind == "image" else " shapes"
+    return f"{tool} {settings}".strip() + f" | {value}{unit} x{count}"
+
+
+def run_tool(tool, params, source, out_dir):
+    # One call of the tool under test on one input file
+    if tool == "quantize":
+        quantize_image_to_max_colors(source, out_dir / f"{source.stem}.png", **params)
+    elif tool == "split":
+        split_image_into_squares(str(source), str(out_dir / source.stem), **params)
+    elif tool == "icon":
+        if not resize_to_icon(str(source), str(out_dir / f"{source.stem}.png"), **params):
+            raise RuntimeError(f"resize_to_icon failed on {source}")
+    elif tool == "feature":
+        if not create_feature_graphic(str(source), str(out_dir / f"{source.stem}.png"), **params):
+            raise RuntimeError(f"create_feature_graphic failed on {source}")
+    else:
+        svg_file_to_vector_drawable(source, out_dir / f"{source.stem}.xml", **params)
+
+
+def _run_all(tool, params, sources, out_dir):
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+    # The tools report progress on stdout; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for source in sources:
+            run_tool(tool, params, source, out_dir)
+
+
+def peak_rss_kib():
+    # VmHWM belongs to the address space, so unlike ru_maxrss it does not carry over
+    # the parent's footprint from before exec (Linux only)
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1])
+    raise RuntimeError("VmHWM missing from /proc/self/status")
+
+
+def run_case(case):
+    # Runs in its own process: VmHWM is then this case's high-water mark
+    tool, params, input_dir, out_dir, repeat = case
+    sources = sorted(Path(input_dir).iterdir())
+    out_dir = Path(out_dir)
+    rss_before = peak_rss_kib()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _run_all(tool, params, sources, out_dir)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    peak_rss = peak_rss_kib()
+    output_bytes = sum(path.stat().st_size for path in out_dir.rglob("*") if path.is_file())
+
+    tracemalloc.start()
+    _run_all(tool, params, sources, out_dir)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    shutil.rmtree(out_dir)
+    return {
+        "seconds": round(best, 4),
+        "peak_rss_kib": peak_rss,
+        "rss_growth_kib": peak_rss - rss_before,
+        "traced_peak_kib": round(traced_peak / 1024, 1),
+        "output_bytes": output_bytes,
+    }
+
+
+def run(sizes=(256, 1024, 2048), svg_shapes=(1_000, 10_000), counts=(1, 4), tools=tuple(TOOLS), repeat=3, work_dir=None, log=print):
+    # Execute every case; returns {case name: metrics}
+    results = {}
+    if work_dir is not None:
+        Path(work_dir).mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        fixtures = build_fixtures(tmp, sizes, svg_shapes, counts)
+        cases = []
+        for tool in tools:
+            kind, param_sets = TOOLS[tool]
+            for params in param_sets:
+                for (fixture_kind, value, count), input_dir in fixtures.items():
+                    if fixture_kind == kind:
+                        cases.append((case_name(tool, params, kind, value, count),
+                                      (tool, params, str(input_dir), str(Path(tmp) / "out"), repeat)))
+        # One process per case (max_tasks_per_child), run one at a time so cases do not compete
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+            for (name, _), metrics in zip(cases, executor.map(run_case, [case for _, case in cases])):
+                results[name] = metrics
+                log(f"  {name:<62} {metrics['seconds']:>8}s  {metrics['peak_rss_kib'] / 1024:>7.1f} MiB RSS  "
+                    f"{metrics['traced_peak_kib'] / 1024:>7.1f} MiB traced  {metrics['output_bytes']:>10} B")
+    return results
+
+
+def find_regressions(results, baseline, time_tolerance=None, memory_tolerance=None):
+    # [(case, metric, baseline value, new value)] for every metric past its tolerance
+    tolerances = dict(TOLERANCES)
+    if time_tolerance is not None:
+        tolerances["seconds"] = time_tolerance
+    if memory_tolerance is not None:
+        tolerances["peak_rss_kib"] = tolerances["traced_peak_kib"] = memory_tolerance
+    regressions = []
+    for name, metrics in results.items():
+        if name not in baseline:
+            continue
+        for metric, tolerance in tolerances.items():
+            old, new = baseline[name][metric], metrics[metric]
+            if new - old > NOISE_FLOORS[metric] and new > old * (1 + tolerance):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def main():
+    # CLI: bench_image_tools.py [--sizes 256,1024,2048] [--svg-shapes 1000,10000] [--counts 1,4] [--tools quantize,split,...]
+    #                           [--repeat 3] [--baseline FILE] [--save-baseline] [--time-tolerance 0.25]
+    #                           [--memory-tolerance 0.10] [--tmp DIR] [--json OUT]
+    import argparse
+
+    def int_list(text):
+        return [int(value) for value in text.split(",") if value]
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--sizes", dest="sizes", type=int_list, default=[256, 1024, 2048], help="Square image sizes in pixels")
+    parser.add_argument("--svg-shapes", dest="svg_shapes", type=int_list, default=[1_000, 10_000], help="Shapes per synthetic SVG")
+    parser.add_argument("--counts", dest="counts", type=int_list, default=[1, 4], help="Input files per case")
+    parser.add_argument("--tools", dest="tools", default=",".join(TOOLS), help=f"Comma-separated subset of: {', '.join(TOOLS)}")
+    parser.add_argument("--repeat", dest="repeat", type=int, default=3, help="Timed runs per case (the best one is kept)")
+    parser.add_argument("--baseline", dest="baseline", default=str(BASELINE_FILE), help="Baseline results file")
+    parser.add_argument("--save-baseline", dest="save_baseline", action="store_true", help="Store these results as the baseline (merged per case)")
+    parser.add_argument("--time-tolerance", dest="time_tolerance", type=float, default=TOLERANCES["seconds"], help="Allowed relative slowdown")
+    parser.add_argument("--memory-tolerance", dest="memory_tolerance", type=float, default=TOLERANCES["peak_rss_kib"], help="Allowed relative memory growth")
+    parser.add_argument("--tmp", dest="work_dir", default=None, help="Directory for temporary benchmark files")
+    parser.add_argument("--json", dest="json_out", default=None, help="Also write results as JSON")
+    args = parser.parse_args()
+
+    tools = [tool for tool in args.tools.split(",") if tool]
+    unknown = set(tools) - set(TOOLS)
+    if unknown:
+        parser.error(f"unknown tool(s): {', '.join(sorted(unknown))}")
+
+    print(f"⏱️  Benchmarking {', '.join(tools)} on {args.sizes}px images, {args.svg_shapes}-shape SVGs, x{args.counts} files")
+    results = run(args.sizes, args.svg_shapes, args.counts, tools, args.repeat, args.work_dir)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    if args.save_baseline:
+        baseline.update(results)
+        baseline_path.write_text(json.dumps(baseline, indent=1, sort_keys=True))
+        print(f"\n💾 Saved {len(results)} case(s) to {baseline_path}")
+        return
+    if not baseline:
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one")
+        return
+
+    compared = sum(1 for name in results if name in baseline)
+    regressions = find_regressions(results, baseline, args.time_tolerance, args.memory_tolerance)
+    for name, metric, old, new in regressions:
+        print(f"❌ {name}: {metric} {old} -> {new} ({(new / old - 1) * 100 if old else float('inf'):+.0f}%)")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) in {compared} case(s) compared with {baseline_path}")
+        sys.exit(1)
+    print(f"\n✅ No regressions in {compared} case(s) compared with {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# Benchmark SVG flattening and Vector Drawable conversion at scale
+# - Replicates the flag set, SVGs/ and cup icons into thousands of files
+# - Generates one very large synthetic SVG
+# - Compares tree parsing (ET.parse + flatten_svg) with streaming (iterparse)
+#   on wall time and tracemalloc peak, then times the parallel batch converter
+
+import json
+import shutil
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from svg_flatten import flatten_svg, iter_flattened_shapes
+from svg_to_android_final import BATCH_INPUTS, batch_convert
+
+
+def collect_seed_svgs(inputs=BATCH_INPUTS):
+    # The real icon set used as the benchmark seed
+    svgs = []
+    for item in inputs:
+        item = Path(item)
+        svgs.extend([item] if item.is_file() else sorted(item.rglob("*.svg")))
+    return svgs
+
+
+def build_corpus(work_dir, copies):
+    # Copy every seed SVG `copies` times under work_dir/corpus
+    corpus_dir = Path(work_dir) / "corpus"
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    seeds = collect_seed_svgs()
+    for copy in range(copies):
+        for seed in seeds:
+            shutil.copyfile(seed, corpus_dir / f"{seed.stem}_{copy}.svg")
+    return corpus_dir
+
+
+def write_large_svg(path, path_count):
+    # One document with path_count small transformed shapes, written incrementally
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1000 1000">\n')
+        f.write('<g transform="translate(10 10)" fill="#3A86FF">\n')
+        for i in range(path_count):
+            x, y = (i * 7) % 990, (i * 13) % 990
+            if i % 3 == 0:
+                f.write(f'<rect id="r{i}" x="{x}" y="{y}" width="5" height="5" rx="1"/>\n')
+            elif i % 3 == 1:
+                f.write(f'<circle id="c{i}" cx="{x}" cy="{y}" r="3" fill="#FF4D6D"/>\n')
+            else:
+                f.write(f'<path id="p{i}" d="M{x} {y}l4 0 0 4-4 0z" transform="rotate(15 {x} {y})"/>\n')
+        f.write("</g>\n</svg>\n")
+    return path
+
+
+def _flatten_tree(files):
+    count = 0
+    for file in files:
+        count += sum(1 for _ in flatten_svg(ET.parse(file).getroot()))
+    return count
+
+
+def _flatten_stream(files):
+    count = 0
+    for file in files:
+        count += sum(1 for _ in iter_flattened_shapes(file))
+    return count
+
+
+def measure(label, func, *args):
+    # Run func once, returning wall time, tracemalloc peak and its result
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"case": label, "seconds": round(elapsed, 4), "peak_kib": round(peak / 1024, 1), "result": result}
+
+
+def run(copies=100, large_paths=100_000, workers=None, work_dir=None):
+    # Execute all cases and return a list of result rows
+    rows = []
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        corpus_dir = build_corpus(tmp, copies)
+        files = sorted(corpus_dir.glob("*.svg"))
+        large = write_large_svg(Path(tmp) / "large.svg", large_paths)
+
+        for mode, func in (("tree", _flatten_tree), ("stream", _flatten_stream)):
+            row = measure(f"{mode}: {len(files)} files", func, files)
+            row["files_per_s"] = round(len(files) / row["seconds"], 1)
+            rows.append(row)
+            rows.append(measure(f"{mode}: 1 file x {large_paths} shapes", func, [large]))
+
+        start = time.perf_counter()
+        results = batch_convert([corpus_dir], Path(tmp) / "drawables", max_workers=workers)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "case": f"batch_convert: {len(files)} files",
+            "seconds": round(elapsed, 4),
+            "files_per_s": round(len(results) / elapsed, 1),
+            "result": sum(r[2] for r in results),
+        })
+    return rows
+
+
+def main():
+    # CLI: bench_vector_drawables.py [--copies 100] [--large-paths 100000] [--workers N] [--json OUT]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--copies", dest="copies", type=int, default=100, help="Replicas of each seed SVG in the corpus")
+    parser.add_argument("--large-paths", dest="large_paths", type=int, default=100_000, help="Shapes in the synthetic large SVG")
+    parser.add_argument("--workers", dest="workers", type=int, default=None, help="Process pool size for batch_convert")
+    parser.add_argument("--tmp", dest="work_dir", default=None, help="Directory for temporary benchmark files")
+    parser.add_argument("--json", dest="json_out", default=None, help="Also write results as JSON")
+    args = parser.parse_args()
+
+    print(f"⏱️  Benchmarking with {args.copies} copies per seed SVG and a {args.large_paths}-shape document")
+    rows = run(args.copies, args.large_paths, args.workers, args.work_dir)
+    for row in rows:
+        extra = f", {row['peak_kib']} KiB peak" if "peak_kib" in row else ""
+        rate = f", {row['files_per_s']} files/s" if "files_per_s" in row else ""
+        print(f"  {row['case']:<40} {row['seconds']:>8}s{extra}{rate} ({row['result']} shapes/paths)")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
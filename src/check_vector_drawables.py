@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+# Regression check for the SVG -> Vector Drawable converter
+# - Converts SVGs (default: the batch inputs, which include the kr flag) into a temp dir
+# - Every path with a strokeColor must carry a strokeWidth: Vector Drawables default
+#   to 0 where SVG defaults to 1, so a missing width silently drops the outline
+# - Exits with status 1 if any converted path breaks that rule
+
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+
+from svg_to_android_final import ANDROID_NS, ASSETS_DIR, BATCH_INPUTS, batch_convert
+
+# Must be converted on every run: its stroke paths rely on the default stroke width
+REQUIRED_INPUTS = [ASSETS_DIR / "flags/4x3/kr.svg"]
+
+
+def stroked_without_width(drawable_path):
+    # <path> elements that have a stroke color but no stroke width
+    return [
+        path for path in ET.parse(drawable_path).getroot().iter("path")
+        if f"{{{ANDROID_NS}}}strokeColor" in path.attrib and f"{{{ANDROID_NS}}}strokeWidth" not in path.attrib
+    ]
+
+
+def check(inputs, max_workers=None):
+    # Returns [(svg_path, number of stroked paths without a width)] for failing files
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for svg_path, output_path, _ in batch_convert(inputs, tmp, max_workers=max_workers):
+            missing = stroked_without_width(output_path)
+            if missing:
+                failures.append((svg_path, len(missing)))
+    return failures
+
+
+def main():
+    # CLI: check_vector_drawables.py [INPUT ...] [--workers N]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("inputs", nargs="*", help="SVG files/directories to check (default: SVGs/, flags, cups)")
+    parser.add_argument("--workers", dest="workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    inputs = args.inputs or BATCH_INPUTS
+    if not args.inputs:
+        missing = [str(path) for path in REQUIRED_INPUTS if not path.is_file()]
+        if missing:
+            print(f"❌ Required input not found: {', '.join(missing)}")
+            sys.exit(1)
+
+    failures = check(inputs, args.workers)
+    for svg_path, count in failures:
+        print(f"❌ {svg_path}: {count} stroked path(s) without strokeWidth")
+    if failures:
+        sys.exit(1)
+    print("✅ Every stroked path has a strokeWidth")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,34 @@
 """
 Convert SVG icon to PNG format
 Requires: pip install cairosvg
+
+Each SVG is read once but parsed afresh for every render: cairosvg mutates
+the parsed tree while drawing, so a tree cannot be reused across sizes, and
+copy.deepcopy of a parsed tree is slower than parsing the bytes again. All
+requested sizes (and Android mipmap densities) render on a process pool.
+Use --batch to regenerate every SVG under SVGs/ and the app's flag assets.
 """
 
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BATCH_SVG_DIRS = [
+    REPO_ROOT / "SVGs",
+    REPO_ROOT / "HelloGoodbye/app/src/main/assets/flags",
+]
+DEFAULT_SIZES = [512, 256, 128, 64, 48, 32]
+# Launcher icon sizes per Android density bucket (48dp baseline)
+ANDROID_MIPMAP_SIZES = {
+    "mdpi": 48,
+    "hdpi": 72,
+    "xhdpi": 96,
+    "xxhdpi": 144,
+    "xxxhdpi": 192,
+}
+
 def convert_svg_to_png(svg_path, png_path, size=512):
     """Convert SVG to PNG using cairosvg"""
     try:
@@ -44,34 +66,105 @@ def convert_svg_to_png(svg_path, png_path, size=512):
         print(f"❌ Error converting SVG to PNG: {e}")
         return False
 
+def _render_job(job):
+    """Render one (svg, size) job from an already-read SVG document"""
+    from cairosvg.parser import Tree
+    from cairosvg.surface import PNGSurface
+
+    svg_path, svg_bytes, png_path, width, height = job
+    # cairosvg mutates the tree while rendering (<use> offsets, pattern opacity,
+    # cached bounding boxes), so every render parses its own tree from the bytes
+    tree = Tree(bytestring=svg_bytes, url=svg_path)
+    Path(png_path).parent.mkdir(parents=True, exist_ok=True)
+    # height=None lets cairosvg keep the SVG aspect ratio (e.g. 4x3 flags)
+    surface = PNGSurface(tree, png_path, 96, output_width=width, output_height=height)
+    surface.finish()
+    return png_path, width
+
+
+def plan_svg_jobs(svg_file, output_dir, sizes, mipmaps=False, square=True, name_format="{stem}_{size}x{size}.png"):
+    """Read an SVG once and expand it into render jobs for every size/density"""
+    svg_file = Path(svg_file)
+    svg_bytes = svg_file.read_bytes()
+    jobs = []
+    for size in sizes:
+        png_file = Path(output_dir) / name_format.format(stem=svg_file.stem, size=size)
+        jobs.append((str(svg_file), svg_bytes, str(png_file), size, size if square else None))
+    if mipmaps:
+        for density, size in ANDROID_MIPMAP_SIZES.items():
+            png_file = Path(output_dir) / f"mipmap-{density}" / f"{svg_file.stem}.png"
+            jobs.append((str(svg_file), svg_bytes, str(png_file), size, size if square else None))
+    return jobs
+
+
+def render_jobs(jobs, max_workers=None):
+    """Render jobs on a process pool; returns the list of (png_path, width) written"""
+    # Jobs for the same SVG are contiguous: one chunk per SVG cuts dispatch
+    # overhead on large batches, while a lone SVG fans out per size
+    svg_count = len({job[0] for job in jobs})
+    chunksize = max(1, len(jobs) // svg_count) if svg_count > 1 else 1
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_job, jobs, chunksize=chunksize))
+
+
+def collect_batch_svgs(dirs=BATCH_SVG_DIRS):
+    """Yield (svg_path, source_dir) for every SVG under the batch directories"""
+    for base in dirs:
+        for svg in sorted(Path(base).rglob("*.svg")):
+            yield svg, Path(base)
+
+
+def main_batch(output_dir, sizes, mipmaps=False, max_workers=None):
+    """Render every SVG under SVGs/ and assets/flags at all sizes in parallel"""
+    jobs = []
+    for svg, base in collect_batch_svgs():
+        out = Path(output_dir) / base.name / svg.parent.relative_to(base)
+        jobs.extend(plan_svg_jobs(svg, out, sizes, mipmaps=mipmaps, square=False, name_format="{stem}_{size}px.png"))
+
+    print(f"🎨 Rendering {len(jobs)} PNG(s) from {len({j[0] for j in jobs})} SVG(s)...")
+    print(f"📁 Output directory: {output_dir}")
+    written = render_jobs(jobs, max_workers=max_workers)
+    print(f"🎉 Successfully created {len(written)} PNG files!")
+
+
 def main():
     """Main conversion function"""
+    import argparse
+
     # Get current directory
     current_dir = Path(__file__).parent
-    svg_file = current_dir / "app_icon.svg"
-    
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("svg", nargs="?", default=str(current_dir / "app_icon.svg"), help="SVG file to convert")
+    parser.add_argument("--out", dest="out_dir", default=None, help="Output directory (default: png_icons next to this script)")
+    parser.add_argument("--sizes", dest="sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Square output sizes in pixels")
+    parser.add_argument("--mipmaps", dest="mipmaps", action="store_true", help="Also render Android mipmap-<density> launcher sizes")
+    parser.add_argument("--batch", dest="batch", action="store_true", help="Convert every SVG under SVGs/ and assets/flags")
+    parser.add_argument("--workers", dest="workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    # Create output directory
+    output_dir = Path(args.out_dir) if args.out_dir else current_dir / "png_icons"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.batch:
+        main_batch(output_dir, args.sizes, mipmaps=args.mipmaps, max_workers=args.workers)
+        return
+
+    svg_file = Path(args.svg)
     if not svg_file.exists():
         print(f"❌ SVG file not found: {svg_file}")
         return
-    
-    # Create output directory
-    output_dir = current_dir / "png_icons"
-    output_dir.mkdir(exist_ok=True)
-    
-    # Convert to different sizes
-    sizes = [512, 256, 128, 64, 48, 32]
-    
+
     print("🎨 Converting SVG to PNG icons...")
     print(f"📁 Output directory: {output_dir}")
     print()
-    
-    success_count = 0
-    for size in sizes:
-        png_file = output_dir / f"app_icon_{size}x{size}.png"
-        
-        if convert_svg_to_png(svg_file, png_file, size):
-            success_count += 1
-    
+
+    jobs = plan_svg_jobs(svg_file, output_dir, args.sizes, mipmaps=args.mipmaps)
+    for png_file, size in render_jobs(jobs, max_workers=args.workers):
+        print(f"✅ Successfully converted {svg_file} to {png_file} ({size}px wide)")
+    success_count = len(jobs)
+
     print()
     if success_count > 0:
         print(f"🎉 Successfully created {success_count} PNG icons!")
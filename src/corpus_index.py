@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Precomputed lookup indexes derived from corpus.json.
+
+Word ids are positions in the corpus list. The index holds:
+  languages        lang -> word ids that have a translation in lang
+  audio_languages  word id -> langs with an audio_file for that word
+  distractors      lang -> word id -> other word ids usable as wrong answers
+
+Distractors exclude words whose translation is identical to the answer's
+(case-insensitive), and are ordered by closeness in length so the first
+choices are the most plausible.
+
+validate_indexes() checks an index against the corpus it was built from and
+against language_metadata.json; run this file with --check to validate the
+shipped assets.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = REPO_ROOT / "HelloGoodbye/app/src/main/assets"
+INDEX_VERSION = 1
+DISTRACTOR_LIMIT = 8
+
+
+def corpus_languages(corpus):
+    """Every language code that appears in any corpus entry"""
+    return sorted({lang for entry in corpus for lang in entry if lang != "original"})
+
+
+def _translation(entry, lang):
+    cell = entry.get(lang) or {}
+    return cell.get("word")
+
+
+def build_indexes(corpus, distractor_limit=DISTRACTOR_LIMIT):
+    """Build the index dict for a corpus list as written by create_corpus.py"""
+    languages = {}
+    audio_languages = {}
+    distractors = {}
+    for lang in corpus_languages(corpus):
+        ids = [i for i, entry in enumerate(corpus) if _translation(entry, lang)]
+        languages[lang] = ids
+        per_word = {}
+        for word_id in ids:
+            answer = _translation(corpus[word_id], lang)
+            candidates = [i for i in ids if i != word_id and _translation(corpus[i], lang).casefold() != answer.casefold()]
+            candidates.sort(key=lambda i: (abs(len(_translation(corpus[i], lang)) - len(answer)), i))
+            per_word[str(word_id)] = candidates[:distractor_limit]
+        distractors[lang] = per_word
+
+    for word_id, entry in enumerate(corpus):
+        audio_languages[str(word_id)] = sorted(
+            lang for lang in entry if lang != "original" and (entry[lang] or {}).get("audio_file")
+        )
+
+    return {
+        "version": INDEX_VERSION,
+        "distractor_limit": distractor_limit,
+        "words": [entry["original"] for entry in corpus],
+        "languages": languages,
+        "audio_languages": audio_languages,
+        "distractors": distractors,
+    }
+
+
+def write_indexes(corpus, path, distractor_limit=DISTRACTOR_LIMIT):
+    indexes = build_indexes(corpus, distractor_limit)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(indexes, f, ensure_ascii=False, separators=(",", ":"))
+    return indexes
+
+
+def validate_indexes(indexes, corpus, metadata):
+    """Return a list of problems (empty if the index is consistent with corpus and metadata)"""
+    errors = []
+    if indexes.get("version") != INDEX_VERSION:
+        errors.append(f"index version {indexes.get('version')} != {INDEX_VERSION}")
+
+    meta_langs = set(metadata["languages"])
+    corpus_langs = set(corpus_languages(corpus))
+    index_langs = set(indexes["languages"])
+    if corpus_langs != meta_langs:
+        errors.append(f"corpus languages differ from metadata: "
+                      f"only in corpus {sorted(corpus_langs - meta_langs)}, only in metadata {sorted(meta_langs - corpus_langs)}")
+    if index_langs != meta_langs:
+        errors.append(f"index languages differ from metadata: "
+                      f"only in index {sorted(index_langs - meta_langs)}, only in metadata {sorted(meta_langs - index_langs)}")
+
+    if indexes["words"] != [entry["original"] for entry in corpus]:
+        errors.append("index word list does not match the corpus order")
+
+    word_count = len(corpus)
+    for lang, ids in indexes["languages"].items():
+        for word_id in ids:
+            if not 0 <= word_id < word_count:
+                errors.append(f"{lang}: word id {word_id} out of range")
+            elif not _translation(corpus[word_id], lang):
+                errors.append(f"{lang}: word id {word_id} ({corpus[word_id]['original']}) has no translation")
+        for word_id, candidates in indexes["distractors"].get(lang, {}).items():
+            answer = _translation(corpus[int(word_id)], lang) or ""
+            for other in candidates:
+                if other == int(word_id):
+                    errors.append(f"{lang}: word {word_id} lists itself as a distractor")
+                elif other not in ids:
+                    errors.append(f"{lang}: distractor {other} for word {word_id} has no translation")
+                elif _translation(corpus[other], lang).casefold() == answer.casefold():
+                    errors.append(f"{lang}: distractor {other} for word {word_id} has the same translation")
+
+    for word_id, langs in indexes["audio_languages"].items():
+        for lang in langs:
+            if not ((corpus[int(word_id)].get(lang) or {}).get("audio_file")):
+                errors.append(f"{lang}: word {word_id} listed with audio but has no audio_file")
+
+    # Anything not caught above (e.g. a missing word) shows up as a stale index
+    if not errors and indexes != build_indexes(corpus, indexes["distractor_limit"]):
+        errors.append("index is stale: rebuilding it from the corpus gives a different result")
+    return errors
+
+
+def main():
+    # CLI: corpus_index.py [--corpus corpus.json] [--metadata language_metadata.json] [--out corpus_index.json] [--check]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--corpus", dest="corpus", default=str(ASSETS_DIR / "corpus.json"), help="Corpus JSON written by create_corpus.py")
+    parser.add_argument("--metadata", dest="metadata", default=str(ASSETS_DIR / "language_metadata.json"), help="Language metadata JSON")
+    parser.add_argument("--out", dest="out", default=str(ASSETS_DIR / "corpus_index.json"), help="Index file to write or check")
+    parser.add_argument("--check", dest="check", action="store_true", help="Validate the existing index instead of writing it")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+    with open(args.metadata, encoding="utf-8") as f:
+        metadata = json.load(f)
+
+    if args.check:
+        with open(args.out, encoding="utf-8") as f:
+            indexes = json.load(f)
+    else:
+        indexes = write_indexes(corpus, args.out)
+        print(f"✅ Wrote {args.out} ({len(indexes['words'])} words x {len(indexes['languages'])} languages)")
+
+    errors = validate_indexes(indexes, corpus, metadata)
+    for error in errors:
+        print(f"❌ {error}")
+    if errors:
+        sys.exit(1)
+    print("✅ Index is consistent with the corpus and language metadata")
+
+
+if __name__ == "__main__":
+    main()
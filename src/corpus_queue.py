@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+# Distributed corpus build over a shared SQLite work queue
+# - init:   shard words x languages into units (one language, up to --unit-size words)
+# - worker: lease a unit, build it with create_corpus.build_corpus, write its cells back;
+#           any number of workers on any number of machines can share the queue file
+# - status: unit counts by state
+# - merge:  upsert the finished cells into the corpus store (corpus_store.py) and
+#           export corpus.json and the lookup index from it
+#
+# Leases expire unless the worker heartbeats, so units of a crashed worker go back
+# to the pool. Once nothing is pending, idle workers steal (re-run) the unit that has
+# been leased longest, once per unit, so one slow box cannot hold up the build.
+# Results are upserted per (word, lang): a duplicate run of a unit is harmless, and
+# a successful cell is never overwritten by a failed one.
+#
+# Run workers from a directory on the shared storage so their audio_files/ land in
+# one place. The queue uses SQLite's rollback journal: WAL needs shared memory and
+# does not work across machines on network filesystems.
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from tools.tts_backends import BACKENDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    lang TEXT NOT NULL,
+    words TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    leased_at REAL,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    stolen INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (lang, words)
+);
+CREATE INDEX IF NOT EXISTS units_status ON units (status, lease_expires);
+CREATE TABLE IF NOT EXISTS results (
+    word TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    cell TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    worker TEXT,
+    finished_at REAL,
+    PRIMARY KEY (word, lang)
+);
+CREATE TABLE IF NOT EXISTS plan (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+DEFAULT_DB = "corpus_queue.sqlite"
+LEASE_SECONDS = 300
+
+
+def connect(db_path):
+    # isolation_level=None: transactions are explicit (BEGIN IMMEDIATE takes the write lock up front)
+    conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+    conn.execute("PRAGMA busy_timeout = 60000")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def init_queue(conn, words, langs, unit_size=25):
+    """Create the units for words x langs (re-running with the same inputs adds nothing); returns units added"""
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("INSERT OR REPLACE INTO plan VALUES ('words', ?), ('langs', ?)", (json.dumps(words), json.dumps(langs)))
+    added = 0
+    for lang in langs:
+        for start in range(0, len(words), unit_size):
+            cursor = conn.execute("INSERT OR IGNORE INTO units (lang, words) VALUES (?, ?)",
+                                  (lang, json.dumps(words[start:start + unit_size])))
+            added += cursor.rowcount
+    conn.execute("COMMIT")
+    return added
+
+
+def lease_unit(conn, worker, lease_seconds=LEASE_SECONDS, steal=True):
+    """
+    Lease the next unit for worker: pending first, then expired leases, then (if
+    steal) a still-leased unit nobody has stolen yet, oldest lease first.
+    Returns (unit id, lang, words) or None when there is nothing left to do.
+    """
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    row = conn.execute(
+        "SELECT id, lang, words, 0 FROM units WHERE status = 'pending' "
+        "OR (status = 'leased' AND lease_expires < ?) ORDER BY attempts, id LIMIT 1",
+        (now,),
+    ).fetchone()
+    if row is None and steal:
+        row = conn.execute(
+            "SELECT id, lang, words, 1 FROM units WHERE status = 'leased' AND stolen = 0 AND worker != ? "
+            "ORDER BY leased_at LIMIT 1",
+            (worker,),
+        ).fetchone()
+    if row is None:
+        conn.execute("COMMIT")
+        return None
+    unit_id, lang, words, stealing = row
+    conn.execute(
+        "UPDATE units SET status = 'leased', worker = ?, leased_at = ?, lease_expires = ?, "
+        "attempts = attempts + 1, stolen = stolen + ? WHERE id = ?",
+        (worker, now, now + lease_seconds, stealing, unit_id),
+    )
+    conn.execute("COMMIT")
+    return unit_id, lang, json.loads(words)
+
+
+def heartbeat(conn, unit_id, worker, lease_seconds=LEASE_SECONDS):
+    """Extend worker's lease on a unit; returns False if the unit is done or leased to someone else"""
+    cursor = conn.execute(
+        "UPDATE units SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+        (time.time() + lease_seconds, unit_id, worker),
+    )
+    return cursor.rowcount == 1
+
+
+def complete_unit(conn, unit_id, worker, cells):
+    """Store [(word, lang, cell)] and mark the unit done, in one transaction"""
+    now = time.time()
+    rows = [(word, lang, json.dumps(cell, ensure_ascii=False), int("error" not in cell), worker, now)
+            for word, lang, cell in cells]
+    conn.execute("BEGIN IMMEDIATE")
+    # A failed cell never replaces a successful one; otherwise the newest result wins
+    conn.executemany(
+        "INSERT INTO results (word, lang, cell, ok, worker, finished_at) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (word, lang) DO UPDATE SET cell = excluded.cell, ok = excluded.ok, "
+        "worker = excluded.worker, finished_at = excluded.finished_at WHERE excluded.ok >= results.ok",
+        rows,
+    )
+    conn.execute("UPDATE units SET status = 'done', worker = ? WHERE id = ?", (worker, unit_id))
+    conn.execute("COMMIT")
+
+
+def queue_status(conn):
+    """{"pending": n, "leased": n, "done": n, "expired": n, "cells": n, "failed_cells": n}"""
+    status = dict.fromkeys(("pending", "leased", "done"), 0)
+    status.update(conn.execute("SELECT status, COUNT(*) FROM units GROUP BY status").fetchall())
+    status["expired"] = conn.execute(
+        "SELECT COUNT(*) FROM units WHERE status = 'leased' AND lease_expires < ?", (time.time(),)).fetchone()[0]
+    status["cells"], status["failed_cells"] = conn.execute(
+        "SELECT COUNT(*), COUNT(*) - COALESCE(SUM(ok), 0) FROM results").fetchone()
+    return status
+
+
+def merge_results(conn):
+    """Corpus list in the planned word and language order, from the finished cells"""
+    plan = dict(conn.execute("SELECT key, value FROM plan").fetchall())
+    words, langs = json.loads(plan["words"]), json.loads(plan["langs"])
+    cells = {(word, lang): json.loads(cell) for word, lang, cell in conn.execute("SELECT word, lang, cell FROM results")}
+    return [
+        {"original": word, **{lang: cells[(word, lang)] for lang in langs if (word, lang) in cells}}
+        for word in words
+    ]
+
+
+def run_worker(db_path, worker=None, lease_seconds=LEASE_SECONDS, max_workers=10, tts=None, tts_fallback=None, steal=True):
+    """Lease and build units until the queue is drained; returns the number of units built"""
+    from create_corpus import build_corpus
+
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    conn = connect(db_path)
+    built = 0
+    while True:
+        unit = lease_unit(conn, worker, lease_seconds, steal)
+        if unit is None:
+            break
+        unit_id, lang, words = unit
+        print(f"🔧 {worker}: unit {unit_id} ({lang}, {len(words)} word(s))")
+
+        # Heartbeats run on their own connection while the unit builds
+        stop = threading.Event()
+
+        def keep_alive():
+            beat_conn = connect(db_path)
+            while not stop.wait(lease_seconds / 3):
+                if not heartbeat(beat_conn, unit_id, worker, lease_seconds):
+                    break
+            beat_conn.close()
+
+        beat = threading.Thread(target=keep_alive, daemon=True)
+        beat.start()
+        entries = build_corpus(words, [lang], max_workers=max_workers, tts=tts, tts_fallback=tts_fallback)
+        stop.set()
+        beat.join()
+
+        cells = [(entry["original"], lang, entry[lang]) for entry in entries if lang in entry]
+        complete_unit(conn, unit_id, worker, cells)
+        built += 1
+        print(f"✅ {worker}: unit {unit_id} done")
+    conn.close()
+    return built
+
+
+def main():
+    # CLI: corpus_queue.py init|worker|status|merge [--db corpus_queue.sqlite] [--unit-size 25] [--all-voices]
+    #                      [--worker-id ID] [--lease 300] [--no-steal] [--tts ...] [--tts-fallback ...] [--batch-tts]
+    #                      [--workers N] [--out corpus.json] [--store corpus.sqlite]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("command", choices=["init", "worker", "status", "merge"], help="What to do")
+    parser.add_argument("--db", dest="db", default=DEFAULT_DB, help="Queue database (on storage shared by all workers)")
+    parser.add_argument("--unit-size", dest="unit_size", type=int, default=25, help="init: words per work unit")
+    parser.add_argument("--all-voices", dest="all_voices", action="store_true", help="init: every language in VOICE_MAPPING instead of create_corpus.target_langs")
+    parser.add_argument("--worker-id", dest="worker_id", default=None, help="worker: name recorded on leases (default: host:pid)")
+    parser.add_argument("--lease", dest="lease", type=float, default=LEASE_SECONDS, help="worker: lease length in seconds")
+    parser.add_argument("--no-steal", dest="steal", action="store_false", help="worker: exit instead of re-running slow units")
+    parser.add_argument("--tts", dest="tts", choices=sorted(BACKENDS), default="google", help="worker: speech synthesis backend (see create_corpus.py)")
+    parser.add_argument("--tts-fallback", dest="tts_fallback", choices=sorted(BACKENDS), default=None, help="worker: backend for unsupported languages")
+    parser.add_argument("--batch-tts", dest="batch_tts", action="store_true", help="worker: one SSML request per language")
+    parser.add_argument("--workers", dest="workers", type=int, default=10, help="worker: thread pool size per unit")
+    parser.add_argument("--out", dest="out", default="corpus.json", help="merge: corpus file to write")
+    parser.add_argument("--store", dest="store", default="corpus.sqlite", help="merge: corpus store to upsert the results into")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == "init":
+        from create_corpus import the_words, target_langs
+
+        langs = target_langs
+        if args.all_voices:
+            from tools.google_api import VOICE_MAPPING
+
+            langs = list(VOICE_MAPPING)
+        added = init_queue(conn, the_words, langs, args.unit_size)
+        print(f"📦 Added {added} unit(s) for {len(the_words)} word(s) x {len(langs)} language(s) to {args.db}")
+    elif args.command == "worker":
+        from create_corpus import select_tts
+
+        tts, tts_fallback = select_tts(args.tts, args.batch_tts, args.tts_fallback)
+        built = run_worker(args.db, args.worker_id, args.lease, args.workers, tts, tts_fallback, args.steal)
+        print(f"Done. Built {built} unit(s).")
+    elif args.command == "status":
+        for key, value in queue_status(conn).items():
+            print(f"{key:13} {value}")
+    else:
+        from corpus_store import import_corpus, open_store, write_corpus
+
+        status = queue_status(conn)
+        if status["pending"] or status["leased"]:
+            print(f"⚠️  {status['pending']} pending and {status['leased']} leased unit(s) remain; merging what is done")
+        data = merge_results(conn)
+        store = open_store(args.store)
+        import_corpus(store, data, {"source": "corpus_queue", "queue": args.db})
+        data = write_corpus(store, args.out, words=[entry["original"] for entry in data],
+                            langs={lang for entry in data for lang in entry if lang != "original"})
+        print(f"Wrote {len(data)} entries to {args.out} (via {args.store}) and the lookup index next to it")
+
+
+if __name__ == "__main__":
+    main()
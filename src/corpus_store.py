@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+
+# SQLite corpus store: the build-side source of truth for corpus.json
+# - words, languages and one row per (word, language) cell: translation, respelling,
+#   audio file and its variants, error, and provenance (which tool/host/backend produced it, and when)
+# - WAL mode, so readers (queries, exports) never block the build writing cells
+# - Bulk upserts with executemany; a cell row is replaced as a whole, except that a
+#   failed cell (one with "error") never replaces a successful one
+# - export_corpus() writes the app's corpus.json format (plus corpus_index.json)
+#
+# CLI examples:
+#   corpus_store.py import corpus.json          (seed the store from an existing corpus)
+#   corpus_store.py export --out corpus.json
+#   corpus_store.py missing-audio --lang ja
+#   corpus_store.py stats
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    original TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS languages (
+    code TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cells (
+    word_id INTEGER NOT NULL REFERENCES words (id),
+    lang TEXT NOT NULL REFERENCES languages (code),
+    translation TEXT,
+    respelling TEXT,
+    audio_file TEXT,
+    audio_variants TEXT,
+    error TEXT,
+    provenance TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (word_id, lang)
+);
+CREATE INDEX IF NOT EXISTS cells_lang ON cells (lang);
+CREATE INDEX IF NOT EXISTS cells_missing_audio ON cells (lang) WHERE audio_file IS NULL;
+"""
+DEFAULT_STORE = "corpus.sqlite"
+
+
+def open_store(path=DEFAULT_STORE, readonly=False):
+    if readonly:
+        # For dry runs: no schema changes, no WAL files, fails if the store does not exist
+        return sqlite3.connect(f"file:{Path(path).resolve()}?mode=ro", uri=True, timeout=60)
+    conn = sqlite3.connect(path, timeout=60)
+    conn.execute("PRAGMA journal_mode = WAL")
+    # With WAL, NORMAL only risks the last transactions on power loss, never corruption
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    if "audio_variants" not in {row[1] for row in conn.execute("PRAGMA table_info(cells)")}:
+        # Stores created before audio variants existed
+        conn.execute("ALTER TABLE cells ADD COLUMN audio_variants TEXT")
+    return conn
+
+
+def _append(conn, table, column, values):
+    # Insert new values after the existing ones, keeping their order
+    start = conn.execute(f"SELECT COALESCE(MAX(position) + 1, 0) FROM {table}").fetchone()[0]
+    known = {row[0] for row in conn.execute(f"SELECT {column} FROM {table}")}
+    new = [value for value in dict.fromkeys(values) if value not in known]
+    conn.executemany(f"INSERT INTO {table} ({column}, position) VALUES (?, ?)",
+                     [(value, start + offset) for offset, value in enumerate(new)])
+    return len(new)
+
+
+def upsert_cells(conn, cells, provenance=None, keep_audio=False):
+    """
+    Insert or replace [(original word, lang, cell dict)] in one transaction.
+
+    cell is a corpus.json cell ({"word", "respelling", "audio_file"[, "error"]});
+    unknown words and languages are added at the end of their order. A cell with
+    an error leaves an existing successful row untouched. With keep_audio, a cell
+    without audio (not synthesized yet) keeps the stored audio_file and variants.
+    """
+    cells = list(cells)
+    provenance = json.dumps(provenance, ensure_ascii=False, sort_keys=True) if provenance else None
+    now = time.time()
+    with conn:
+        _append(conn, "words", "original", [word for word, _, _ in cells])
+        _append(conn, "languages", "code", [lang for _, lang, _ in cells])
+        word_ids = dict(conn.execute("SELECT original, id FROM words"))
+        audio_file, audio_variants = "excluded.audio_file", "excluded.audio_variants"
+        if keep_audio:
+            audio_file = "COALESCE(excluded.audio_file, cells.audio_file)"
+            audio_variants = "COALESCE(excluded.audio_variants, cells.audio_variants)"
+        conn.executemany(
+            "INSERT INTO cells (word_id, lang, translation, respelling, audio_file, audio_variants, error, provenance, "
+            "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (word_id, lang) DO UPDATE SET "
+            f"translation = excluded.translation, respelling = excluded.respelling, audio_file = {audio_file}, "
+            f"audio_variants = {audio_variants}, error = excluded.error, provenance = excluded.provenance, "
+            "updated_at = excluded.updated_at WHERE excluded.error IS NULL OR cells.error IS NOT NULL",
+            [(word_ids[word], lang, cell.get("word"), cell.get("respelling"), cell.get("audio_file"),
+              _variants_json(cell), cell.get("error"), provenance, now) for word, lang, cell in cells],
+        )
+    return len(cells)
+
+
+def import_corpus(conn, corpus, provenance=None):
+    """Upsert a corpus.json list (word order and language order included); returns cells written"""
+    with conn:
+        _append(conn, "words", "original", [entry["original"] for entry in corpus])
+        _append(conn, "languages", "code", [lang for entry in corpus for lang in entry if lang != "original"])
+    return upsert_cells(
+        conn,
+        [(entry["original"], lang, cell) for entry in corpus for lang, cell in entry.items()
+         if lang != "original" and cell is not None],
+        provenance,
+    )
+
+
+def _variants_json(cell):
+    # audio_file_slow, audio_file_normalized, ... (see audio_variants.py)
+    variants = {key: value for key, value in cell.items() if key.startswith("audio_file_")}
+    return json.dumps(variants, ensure_ascii=False, sort_keys=True) if variants else None
+
+
+def _cell(translation, respelling, audio_file, audio_variants, error):
+    cell = {"word": translation, "respelling": respelling, "audio_file": audio_file}
+    if audio_variants is not None:
+        cell.update(json.loads(audio_variants))
+    if error is not None:
+        cell["error"] = error
+    return cell
+
+
+def export_corpus(conn, words=None, langs=None):
+    """corpus.json list in stored order, optionally restricted to some words and languages"""
+    lang_order = [code for code, in conn.execute("SELECT code FROM languages ORDER BY position")]
+    if langs is not None:
+        wanted_langs = set(langs)
+        lang_order = [lang for lang in lang_order if lang in wanted_langs]
+    wanted = None if words is None else set(words)
+    entries = {}
+    for original, in conn.execute("SELECT original FROM words ORDER BY position"):
+        if wanted is None or original in wanted:
+            entries[original] = {"original": original}
+    cells = {}
+    for original, lang, *fields in conn.execute(
+            "SELECT w.original, c.lang, c.translation, c.respelling, c.audio_file, c.audio_variants, c.error "
+            "FROM cells c JOIN words w ON w.id = c.word_id"):
+        cells[(original, lang)] = _cell(*fields)
+    for original, entry in entries.items():
+        entry.update((lang, cells[(original, lang)]) for lang in lang_order if (original, lang) in cells)
+    return list(entries.values())
+
+
+def write_corpus(conn, corpus_path, index_path=None, words=None, langs=None):
+    """Export the store to corpus.json (and corpus_index.json next to it); returns the corpus list"""
+    from corpus_index import write_indexes
+
+    data = export_corpus(conn, words, langs)
+    with open(corpus_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_indexes(data, index_path or Path(corpus_path).with_name("corpus_index.json"))
+    return data
+
+
+def cells_missing_audio(conn, lang=None):
+    """[(original, lang, translation)] for translated cells without an audio file"""
+    query = ("SELECT w.original, c.lang, c.translation FROM cells c JOIN words w ON w.id = c.word_id "
+             "WHERE c.audio_file IS NULL AND c.translation IS NOT NULL")
+    if lang is not None:
+        return conn.execute(query + " AND c.lang = ? ORDER BY w.position", (lang,)).fetchall()
+    return conn.execute(query + " ORDER BY c.lang, w.position").fetchall()
+
+
+def store_stats(conn):
+    """Counts of words, languages, cells, failed cells and cells missing audio"""
+    return {
+        "words": conn.execute("SELECT COUNT(*) FROM words").fetchone()[0],
+        "languages": conn.execute("SELECT COUNT(*) FROM languages").fetchone()[0],
+        "cells": conn.execute("SELECT COUNT(*) FROM cells").fetchone()[0],
+        "failed": conn.execute("SELECT COUNT(*) FROM cells WHERE error IS NOT NULL").fetchone()[0],
+        "missing_audio": conn.execute(
+            "SELECT COUNT(*) FROM cells WHERE audio_file IS NULL AND translation IS NOT NULL").fetchone()[0],
+    }
+
+
+def main():
+    # CLI: corpus_store.py import|export|missing-audio|stats [corpus.json] [--store corpus.sqlite] [--out corpus.json] [--lang LANG]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("command", choices=["import", "export", "missing-audio", "stats"], help="What to do")
+    parser.add_argument("corpus", nargs="?", default="corpus.json", help="import: corpus JSON to load")
+    parser.add_argument("--store", dest="store", default=DEFAULT_STORE, help="SQLite store file")
+    parser.add_argument("--out", dest="out", default="corpus.json", help="export: corpus file to write (index goes next to it)")
+    parser.add_argument("--lang", dest="lang", default=None, help="missing-audio: only this language")
+    args = parser.parse_args()
+
+    conn = open_store(args.store)
+    if args.command == "import":
+        with open(args.corpus, encoding="utf-8") as f:
+            corpus = json.load(f)
+        written = import_corpus(conn, corpus, {"source": "import", "file": str(args.corpus)})
+        print(f"✅ Imported {written} cell(s) from {args.corpus} into {args.store}")
+    elif args.command == "export":
+        data = write_corpus(conn, args.out)
+        print(f"✅ Wrote {len(data)} entries to {args.out}")
+    elif args.command == "missing-audio":
+        for original, lang, translation in cells_missing_audio(conn, args.lang):
+            print(f"{lang}\t{original}\t{translation}")
+    else:
+        for key, value in store_stats(conn).items():
+            print(f"{key:14} {value}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,21 @@
 import json
+import os
+import re
+import socket
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from tools.google_api import process_word_and_generate_audio, PROJECT_ID
+from tools.google_api import (
+    process_word_and_generate_audio,
+    translate_and_respell,
+    audio_output_path,
+    respelling_messages,
+    build_ssml_batches,
+    RULE_MIN_CONFIDENCE,
+    PROJECT_ID,
+)
+from tools.tts_backends import BACKENDS, get_backend, pick_backend
+from tools.respelling import rule_respelling
+from tools.api_stats import load_latency_stats, save_latency_stats
+from corpus_store import open_store, import_corpus, export_corpus, upsert_cells, write_corpus, store_stats
 
 # Input words to translate
 the_words = [
@@ -16,8 +31,12 @@ the_words = [
     "no",
 ]
 
-# Output file
+# Output files (the SQLite store is the source of truth; corpus.json is exported from it)
+store_file = "corpus.sqlite"
 corpus_file = "corpus.json"
+index_file = "corpus_index.json"
+# Completed cells are written to the store in batches of this size while the build runs
+STORE_BATCH = 50
 
 # Target languages (10 total). Keys are Google Translate language codes.
 target_langs = [
@@ -34,15 +53,21 @@ target_langs = [
 ]
 
 
-def process_word_language(word, lang):
-    """Process a single word for a single language"""
+def process_word_language(word, lang, synthesize=True):
+    """Process a single word for a single language (audio is left empty if synthesize is False)"""
     try:
-        # Use the new unified function
-        processing_results = process_word_and_generate_audio(
-            project_id=PROJECT_ID,
-            text=word,
-            target_language_code=lang
-        )
+        if synthesize:
+            # Use the new unified function
+            processing_results = process_word_and_generate_audio(
+                project_id=PROJECT_ID,
+                text=word,
+                target_language_code=lang
+            )
+        else:
+            processing_results = dict(
+                translate_and_respell(project_id=PROJECT_ID, text=word, target_language_code=lang),
+                audio=None,
+            )
 
         return {
             "word": word,
@@ -67,27 +92,59 @@ def process_word_language(word, lang):
         }
 
 
-def build_corpus(words, langs, max_workers=10):
-    """Build corpus using multi-threading to process all word-language combinations in parallel"""
+def cell_is_complete(cell):
+    """A cell needs no more API calls if it has a translation and its audio file exists"""
+    return bool(cell and cell.get("word") and "error" not in cell
+                and cell.get("audio_file") and os.path.exists(cell["audio_file"]))
+
+
+def reusable_cells(existing):
+    """{(word, lang): cell} for the complete cells of an existing corpus list"""
+    return {
+        (entry["original"], lang): cell
+        for entry in existing or []
+        for lang, cell in entry.items()
+        if lang != "original" and cell_is_complete(cell)
+    }
+
+
+def build_corpus(words, langs, max_workers=10, tts=None, tts_fallback=None, existing=None, store=None, provenance=None):
+    """
+    Build corpus using multi-threading to process all word-language combinations in parallel
+
+    By default each cell is synthesized with Google TTS as it is translated. With
+    a tts backend (see tools.tts_backends), cells are only translated and
+    respelled here and audio is synthesized afterwards by synthesize_corpus_audio.
+    Complete cells of an existing corpus (--resume) are kept without any API call.
+    With a store connection, finished cells are upserted in batches as they come in;
+    cells still waiting for the tts backend keep the audio already in the store.
+    """
+    reused = reusable_cells(existing)
+    results = {}
+    for (word, lang), cell in reused.items():
+        if word in words and lang in langs:
+            results.setdefault(word, {"original": word})[lang] = cell
+
     # Create all word-language combinations
     tasks = []
     for word in words:
         for lang in langs:
-            tasks.append((word, lang))
+            if (word, lang) not in reused:
+                tasks.append((word, lang))
     
     print(f"Processing {len(tasks)} word-language combinations with {max_workers} workers...")
     
     # Process all combinations in parallel
-    results = {}
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         # Submit all tasks
         future_to_task = {
-            executor.submit(process_word_language, word, lang): (word, lang) 
+            executor.submit(process_word_language, word, lang, tts is None): (word, lang)
             for word, lang in tasks
         }
         
         # Collect results as they complete
         completed = 0
+        pending_rows = []
         for future in as_completed(future_to_task):
             word, lang = future_to_task[future]
             try:
@@ -102,6 +159,11 @@ def build_corpus(words, langs, max_workers=10):
                 
                 # Add language result
                 results[word][lang] = lang_result
+                if store is not None:
+                    pending_rows.append((word, lang, lang_result))
+                    if len(pending_rows) >= STORE_BATCH:
+                        upsert_cells(store, pending_rows, provenance, keep_audio=tts is not None)
+                        pending_rows = []
                 
                 completed += 1
                 print(f"Completed {completed}/{len(tasks)}: '{word}' -> {lang}")
@@ -110,19 +172,234 @@ def build_corpus(words, langs, max_workers=10):
                 print(f"Unexpected error processing '{word}' for '{lang}': {e}")
                 completed += 1
     
+    if store is not None and pending_rows:
+        upsert_cells(store, pending_rows, provenance, keep_audio=tts is not None)
+
     # Convert results dict to list in original order
     final_results = []
     for word in words:
         if word in results:
-            final_results.append(results[word])
+            entry = results[word]
+            final_results.append({"original": word, **{lang: entry[lang] for lang in langs if lang in entry}})
         else:
             # Fallback if word wasn't processed
             final_results.append({"original": word})
-    
+
+    if tts is not None:
+        synthesize_corpus_audio(final_results, langs, tts, tts_fallback, max_workers)
+
     return final_results
 
+
+def synthesize_corpus_audio(corpus, langs, backend, fallback=None, max_workers=None):
+    """
+    Fill in audio_file for every translated cell with a TTS backend.
+
+    Languages the backend does not support go to fallback (if given). Batched
+    backends get one job per language, the others one job per clip; each backend
+    runs its jobs on its own pool (threads for APIs, processes for local engines).
+    """
+    groups = {}
+    for lang in langs:
+        cells = [(entry["original"], entry[lang]) for entry in corpus
+                 if (entry.get(lang) or {}).get("word") and not entry[lang].get("audio_file")]
+        if not cells:
+            continue
+        chosen = pick_backend(lang, backend, fallback)
+        jobs = groups.setdefault(id(chosen), (chosen, []))[1]
+        if chosen.batched:
+            jobs.append((lang, cells))
+        else:
+            jobs.extend((lang, [cell]) for cell in cells)
+
+    for chosen, jobs in groups.values():
+        print(f"Synthesizing {sum(len(cells) for _, cells in jobs)} clip(s) with {chosen.name} in {len(jobs)} job(s)...")
+        with chosen.executor(max_workers) as executor:
+            future_to_job = {}
+            for lang, cells in jobs:
+                output_files = [audio_output_path(word, lang, extension=chosen.extension) for word, _ in cells]
+                texts = [cell["word"] for _, cell in cells]
+                future = executor.submit(chosen.synthesize_group, texts, lang, output_files)
+                future_to_job[future] = (lang, cells)
+            for future in as_completed(future_to_job):
+                lang, cells = future_to_job[future]
+                try:
+                    output_files = future.result()
+                except Exception as e:
+                    print(f"Error synthesizing audio for language '{lang}' with {chosen.name}: {e}")
+                    for _, cell in cells:
+                        cell["error"] = str(e)
+                    continue
+                for (_, cell), output_file in zip(cells, output_files):
+                    cell["audio_file"] = output_file
+                print(f"Synthesized {len(output_files)} clip(s) for {lang}")
+
+
+def select_tts(name="google", batch_tts=False, fallback=None):
+    """(tts, tts_fallback) backends for build_corpus; (None, None) keeps inline Google TTS per cell"""
+    if name == "google" and not batch_tts and not fallback:
+        return None, None
+    tts = get_backend("google", batch=batch_tts) if name == "google" else get_backend(name)
+    return tts, get_backend(fallback) if fallback else None
+
+
+# Mean seconds per request assumed by --plan until a build has recorded real ones
+DEFAULT_LATENCY = {"translate": 0.3, "tts": 0.8, "tts_batch": 3.0, "llm": 2.0, "local_tts": 0.3}
+# Rough size of the LLM's JSON reply
+LLM_OUTPUT_TOKENS = 20
+CHARS_PER_TOKEN = 4
+
+
+def plan_corpus(words, langs, max_workers=10, tts=None, tts_fallback=None, existing=None, resume=False, latency=None):
+    """
+    Expand the build into API requests without calling anything and estimate its cost.
+
+    Translations already in the existing corpus give exact text lengths and tell
+    whether the respelling rules will suffice; otherwise lengths are scaled from
+    the English word by the language's ratio in the existing corpus, and an LLM
+    call is assumed (so LLM figures are an upper bound).
+    """
+    latency = dict(DEFAULT_LATENCY, **(latency if latency is not None else load_latency_stats()))
+    known = {(entry["original"], lang): cell for entry in existing or [] for lang, cell in entry.items()
+             if lang != "original" and cell and cell.get("word")}
+    complete = reusable_cells(existing)
+
+    ratios = {}
+    for lang in langs:
+        pairs = [(len(cell["word"]), len(word)) for (word, cell_lang), cell in known.items() if cell_lang == lang]
+        ratios[lang] = sum(p[0] for p in pairs) / sum(p[1] for p in pairs) if pairs else 1.0
+
+    requests = dict.fromkeys(DEFAULT_LATENCY, 0)
+    characters = {"translate": 0, "tts": 0}
+    tokens = {"input": 0, "output": 0}
+    guessed = 0
+    cell_seconds = 0.0
+    pending_audio = {}  # lang -> translations still needing audio from a separate backend
+    for word in words:
+        for lang in langs:
+            if resume and (word, lang) in complete:
+                continue
+            translation = (known.get((word, lang)) or {}).get("word")
+            if translation is None:
+                guessed += 1
+                text = "x" * max(1, round(len(word) * ratios[lang]))
+            else:
+                text = translation
+            requests["translate"] += 1
+            characters["translate"] += len(word)
+            seconds = latency["translate"]
+
+            respelling, confidence = rule_respelling(translation, lang) if translation else (None, 0.0)
+            if not respelling or confidence < RULE_MIN_CONFIDENCE:
+                requests["llm"] += 1
+                prompt = "".join(m["content"] for m in respelling_messages(translation or word, lang))
+                tokens["input"] += len(prompt) // CHARS_PER_TOKEN
+                tokens["output"] += LLM_OUTPUT_TOKENS
+                seconds += latency["llm"]
+
+            if tts is None:
+                requests["tts"] += 1
+                characters["tts"] += len(text)
+                seconds += latency["tts"]
+            else:
+                pending_audio.setdefault(lang, []).append(text)
+            cell_seconds += seconds
+
+    wall_seconds = cell_seconds / max_workers
+    for lang, texts in pending_audio.items():
+        backend = pick_backend(lang, tts, tts_fallback)
+        if backend.name != "google":
+            requests["local_tts"] += len(texts)
+            wall_seconds += len(texts) * latency["local_tts"] / max_workers
+        elif backend.batched:
+            batches = build_ssml_batches(texts)
+            requests["tts_batch"] += len(batches)
+            # <mark> tags are not billed; the rest of the SSML is
+            characters["tts"] += sum(len(re.sub(r'<mark name="[^"]*"/>', "", ssml)) for _, ssml in batches)
+            wall_seconds += len(batches) * latency["tts_batch"] / min(max_workers, len(pending_audio))
+        else:
+            requests["tts"] += len(texts)
+            characters["tts"] += sum(len(t) for t in texts)
+            wall_seconds += len(texts) * latency["tts"] / max_workers
+
+    return {
+        "cells": len(words) * len(langs),
+        "complete_in_existing": sum(1 for word in words for lang in langs if (word, lang) in complete),
+        "reused": resume,
+        "translations_estimated": guessed,
+        "requests": {api: count for api, count in requests.items() if count},
+        "billable_characters": characters,
+        "llm_tokens": tokens,
+        "wall_seconds": wall_seconds,
+        "latency_seconds": {api: latency[api] for api in requests if requests[api]},
+    }
+
+
+def print_plan(plan, max_workers):
+    print(f"📋 Plan for {plan['cells']} word-language cell(s) at {max_workers} worker(s)")
+    if plan["reused"]:
+        print(f"   Reusing {plan['complete_in_existing']} complete cell(s) from the existing corpus")
+    elif plan["complete_in_existing"]:
+        print(f"   {plan['complete_in_existing']} cell(s) are already complete in the existing corpus (use --resume to skip them)")
+    for api, count in plan["requests"].items():
+        print(f"   {api:10} {count:6} request(s) at ~{plan['latency_seconds'][api]:.2f}s")
+    print(f"   Billable characters: translation {plan['billable_characters']['translate']}, TTS {plan['billable_characters']['tts']}")
+    print(f"   LLM tokens: ~{plan['llm_tokens']['input']} in, ~{plan['llm_tokens']['output']} out")
+    if plan["translations_estimated"]:
+        print(f"   {plan['translations_estimated']} cell(s) have no known translation: TTS lengths are estimated "
+              f"and an LLM respelling is assumed (upper bound)")
+    print(f"   Projected wall time: ~{plan['wall_seconds']:.0f}s")
+
+
 if __name__ == "__main__":
-    data = build_corpus(the_words, target_langs)
-    with open(corpus_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    print(f"Wrote {len(data)} entries to {corpus_file}")
\ No newline at end of file
+    # CLI: create_corpus.py [--tts google|espeak|piper] [--tts-fallback espeak|piper] [--batch-tts] [--workers N] [--resume] [--audio-variants] [--plan]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--tts", dest="tts", choices=sorted(BACKENDS), default="google", help="Speech synthesis backend")
+    parser.add_argument("--tts-fallback", dest="tts_fallback", choices=sorted(BACKENDS), default=None,
+                        help="Backend for languages the main one does not support (e.g. espeak for ha)")
+    parser.add_argument("--batch-tts", dest="batch_tts", action="store_true", help="Google only: one SSML request per language")
+    parser.add_argument("--workers", dest="workers", type=int, default=10, help="Thread pool size (process pool size for local TTS)")
+    parser.add_argument("--resume", dest="resume", action="store_true", help=f"Keep complete cells of an existing {corpus_file}")
+    parser.add_argument("--audio-variants", dest="audio_variants", action="store_true", help="Also build slow and loudness-normalized clips (audio_variants.py)")
+    parser.add_argument("--plan", dest="plan", action="store_true", help="Print request, character, token and time estimates without calling any API")
+    args = parser.parse_args()
+
+    tts, tts_fallback = select_tts(args.tts, args.batch_tts, args.tts_fallback)
+
+    if args.plan:
+        # A dry run reads the store (or the corpus it would be seeded from) but writes nothing
+        existing = []
+        if os.path.exists(store_file):
+            reader = open_store(store_file, readonly=True)
+            existing = export_corpus(reader, the_words, target_langs)
+            reader.close()
+        if not existing and os.path.exists(corpus_file):
+            with open(corpus_file, encoding="utf-8") as f:
+                existing = json.load(f)
+        plan = plan_corpus(the_words, target_langs, args.workers, tts, tts_fallback, existing, args.resume)
+        print_plan(plan, args.workers)
+        raise SystemExit(0)
+
+    store = open_store(store_file)
+    if not store_stats(store)["cells"] and os.path.exists(corpus_file):
+        # First run with a store: seed it from the corpus built before
+        with open(corpus_file, encoding="utf-8") as f:
+            import_corpus(store, json.load(f), {"source": "import", "file": corpus_file})
+    existing = export_corpus(store, the_words, target_langs)
+
+    provenance = {"source": "create_corpus", "host": socket.gethostname(), "tts": tts.name if tts else "google"}
+    data = build_corpus(the_words, target_langs, max_workers=args.workers, tts=tts, tts_fallback=tts_fallback,
+                        existing=existing if args.resume else None, store=store, provenance=provenance)
+    save_latency_stats()
+    if args.audio_variants:
+        from audio_variants import add_audio_variants
+
+        built, cached = add_audio_variants(data, audio_root=".", max_workers=args.workers)
+        print(f"Built {built} audio variant(s), {cached} up to date")
+    # Audio is filled in after translation, so the final cells are written once more
+    import_corpus(store, data, provenance)
+    data = write_corpus(store, corpus_file, index_file, the_words, target_langs)
+    print(f"Wrote {len(data)} entries to {corpus_file} (from {store_file})")
+    print(f"Wrote lookup indexes to {index_file}")
\ No newline at end of file
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+# Shared raster export backend: WebP (lossy/lossless) and AVIF writers
+# - Lossy output uses the lowest quality whose SSIM (or PSNR) against the source
+#   meets a target, found by binary search; metrics are computed with NumPy
+# - Transparent images are compared premultiplied, with alpha as an extra channel
+# - --mode auto (WebP) also tries lossless and keeps whichever file is smaller
+# - Files run in parallel on a process pool
+#
+# Note: the app currently lists assets/travel_icons/*.png only, so WebP output
+# has to be paired with an app-side change before it can replace those PNGs.
+
+import io
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import numpy as np
+    from PIL import Image, features
+except ImportError:
+    print("NumPy and Pillow are required. Install with: pip install numpy pillow")
+    sys.exit(1)
+
+from reduce_colors import collect_images, ensure_dir
+
+FORMATS = {"webp": ("WEBP", ".webp"), "avif": ("AVIF", ".avif"), "png": ("PNG", ".png")}
+DEFAULT_TARGETS = {"ssim": 0.99, "psnr": 40.0}
+SSIM_WINDOW = 7
+
+
+def _box_mean(x, size):
+    # Mean over every size x size window (valid positions) via a summed-area table
+    c = np.pad(x, ((1, 0), (1, 0), (0, 0))).cumsum(0).cumsum(1)
+    total = c[size:, size:] - c[:-size, size:] - c[size:, :-size] + c[:-size, :-size]
+    return total / (size * size)
+
+
+def _comparable(img):
+    # float64 (h, w, c): premultiplied RGB plus alpha, or RGB for opaque images
+    rgba = np.asarray(img.convert("RGBA"), dtype=np.float64)
+    alpha = rgba[..., 3:]
+    if (alpha == 255).all():
+        return rgba[..., :3]
+    return np.concatenate([rgba[..., :3] * alpha / 255.0, alpha], axis=2)
+
+
+def ssim(a, b, window=SSIM_WINDOW):
+    """Mean SSIM over channels of two (h, w, c) float arrays in the 0..255 range"""
+    window = min(window, a.shape[0], a.shape[1])
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    mu_a, mu_b = _box_mean(a, window), _box_mean(b, window)
+    var_a = _box_mean(a * a, window) - mu_a * mu_a
+    var_b = _box_mean(b * b, window) - mu_b * mu_b
+    cov = _box_mean(a * b, window) - mu_a * mu_b
+    ssim_map = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(ssim_map.mean())
+
+
+def psnr(a, b):
+    """Peak signal-to-noise ratio in dB (inf for identical inputs)"""
+    mse = float(((a - b) ** 2).mean())
+    return float("inf") if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+
+METRICS = {"ssim": ssim, "psnr": psnr}
+
+
+def encode(img, fmt, quality=None, lossless=False):
+    """Encode img to bytes in fmt ("webp", "avif" or "png")"""
+    pil_format, _ = FORMATS[fmt]
+    out = io.BytesIO()
+    if fmt == "png":
+        img.save(out, format=pil_format, optimize=True)
+    elif fmt == "webp":
+        if lossless:
+            img.save(out, format=pil_format, lossless=True, quality=100, method=6)
+        else:
+            img.save(out, format=pil_format, quality=quality, alpha_quality=100, method=6)
+    else:
+        img.save(out, format=pil_format, quality=quality, speed=4)
+    return out.getvalue()
+
+
+def _decode(data):
+    with Image.open(io.BytesIO(data)) as img:
+        return img.convert("RGBA")
+
+
+def search_quality(img, fmt, metric="ssim", target=None, low=1, high=100):
+    """
+    Binary search the lowest quality in [low, high] whose decoded output meets target.
+
+    Returns (quality, encoded bytes, score, met). If even `high` misses the
+    target, the `high` encoding is returned with met=False.
+    """
+    target = DEFAULT_TARGETS[metric] if target is None else target
+    measure = METRICS[metric]
+    reference = _comparable(img)
+    high_start = high
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        data = encode(img, fmt, quality=quality)
+        score = measure(reference, _comparable(_decode(data)))
+        if score >= target:
+            best = (quality, data, score, True)
+            high = quality - 1
+        else:
+            low = quality + 1
+    if best is None:
+        data = encode(img, fmt, quality=high_start)
+        best = (high_start, data, measure(reference, _comparable(_decode(data))), False)
+    return best
+
+
+def export_image(src_path, out_path, fmt="webp", mode="auto", metric="ssim", target=None):
+    """
+    Write src_path as fmt to out_path.
+
+    mode: "lossy" (quality search), "lossless" (WebP only) or "auto" (smaller of
+    both for WebP, lossy for AVIF). In auto mode a lossy result that cannot reach
+    the target at any quality is discarded in favour of lossless. Returns a dict
+    describing the chosen encoding.
+    """
+    if fmt == "avif" and not features.check("avif"):
+        raise RuntimeError("This Pillow build has no AVIF support (Pillow >= 11.2 with libavif is required)")
+    if fmt != "webp" and mode == "lossless":
+        raise ValueError(f"Lossless mode is only supported for WebP, not {fmt}")
+
+    with Image.open(src_path) as im:
+        img = im.convert("RGBA") if "A" in im.getbands() or im.mode == "P" else im.convert("RGB")
+
+    candidates = []
+    if fmt == "png":
+        candidates.append(("png", None, encode(img, "png"), None))
+    else:
+        if mode in ("lossy", "auto"):
+            quality, data, score, met = search_quality(img, fmt, metric=metric, target=target)
+            if met or not (fmt == "webp" and mode == "auto"):
+                candidates.append(("lossy", quality, data, score))
+        if fmt == "webp" and mode in ("lossless", "auto"):
+            candidates.append(("lossless", None, encode(img, fmt, lossless=True), None))
+
+    kind, quality, data, score = min(candidates, key=lambda c: len(c[2]))
+    ensure_dir(Path(out_path).parent)
+    Path(out_path).write_bytes(data)
+    return {
+        "source": str(src_path),
+        "output": str(out_path),
+        "kind": kind,
+        "quality": quality,
+        "score": score,
+        "source_bytes": Path(src_path).stat().st_size,
+        "bytes": len(data),
+    }
+
+
+def _export_job(job):
+    src, out, fmt, mode, metric, target = job
+    return export_image(src, out, fmt=fmt, mode=mode, metric=metric, target=target)
+
+
+def export_many(jobs, max_workers=None):
+    """Run (src, out, fmt, mode, metric, target) jobs on a process pool, yielding result dicts"""
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(_export_job, jobs)
+
+
+def main():
+    # CLI: export_image.py <input> [--out OUT_DIR] [--format webp|avif|png] [--mode auto|lossy|lossless] [--metric ssim|psnr] [--target X] [--workers N]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("input", help="Input image file or directory")
+    parser.add_argument("--out", dest="out_dir", default=None, help="Output directory (default: <input>_<format>)")
+    parser.add_argument("--format", dest="fmt", choices=sorted(FORMATS), default="webp", help="Output format")
+    parser.add_argument("--mode", dest="mode", choices=["auto", "lossy", "lossless"], default="auto", help="Encoding mode")
+    parser.add_argument("--metric", dest="metric", choices=sorted(METRICS), default="ssim", help="Quality metric for the lossy search")
+    parser.add_argument("--target", dest="target", type=float, default=None, help="Metric target (default: SSIM 0.99 / PSNR 40 dB)")
+    parser.add_argument("--workers", dest="workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"❌ Input not found: {input_path}")
+        sys.exit(1)
+
+    if args.out_dir:
+        out_dir = Path(args.out_dir)
+    elif input_path.is_dir():
+        out_dir = Path(f"{input_path}_{args.fmt}")
+    else:
+        out_dir = input_path.parent / f"{input_path.stem}_{args.fmt}"
+
+    suffix = FORMATS[args.fmt][1]
+    jobs = []
+    for src in sorted(collect_images(input_path)):
+        rel = src.relative_to(input_path) if input_path.is_dir() else Path(src.name)
+        jobs.append((str(src), str(out_dir / rel.with_suffix(suffix)), args.fmt, args.mode, args.metric, args.target))
+    if not jobs:
+        print("No images found to process.")
+        return
+
+    print(f"🗜️  Exporting {len(jobs)} image(s) as {args.fmt} ({args.mode}, {args.metric} target {args.target or DEFAULT_TARGETS[args.metric]})")
+    total_in = total_out = 0
+    for result in export_many(jobs, max_workers=args.workers):
+        total_in += result["source_bytes"]
+        total_out += result["bytes"]
+        detail = f"q={result['quality']}, {args.metric}={result['score']:.4f}" if result["kind"] == "lossy" else result["kind"]
+        print(f"✅ {Path(result['output']).name}: {result['source_bytes']} -> {result['bytes']} bytes ({detail})")
+
+    print(f"\nDone. {total_in} -> {total_out} bytes ({1 - total_out / total_in:.1%} smaller) in {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+
+# Find (and optionally collapse) near-duplicate image assets
+# - Perceptual hashes computed with NumPy: aHash (mean), dHash (gradient), pHash (DCT)
+# - Transparent pixels are composited on white so icons compare by their visible shape
+# - pHash values go into a BK-tree for Hamming-radius queries; dHash confirms matches
+# - Duplicates are grouped; shipped app assets are kept first, then sources over
+#   build-graph outputs (asset_build.py), then the largest (then newest) image
+# - --collapse moves the others to a quarantine directory and writes a JSON map;
+#   it never moves shipped assets (app assets/ and res/) or build-graph outputs,
+#   which asset_build would only recreate
+
+import json
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    print("NumPy and Pillow are required. Install with: pip install numpy pillow")
+    sys.exit(1)
+
+from reduce_colors import collect_images
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = REPO_ROOT / "HelloGoodbye/app/src/main/assets"
+SHIPPED_DIRS = [ASSETS_DIR, REPO_ROOT / "HelloGoodbye/app/src/main/res"]
+DEFAULT_ROOTS = [REPO_ROOT / "travel_icons", REPO_ROOT / "app_icon", ASSETS_DIR]
+
+HASH_SIZE = 8
+PHASH_SIZE = 32
+
+
+def _dct_matrix(n):
+    # Orthonormal DCT-II basis: row k holds cos(pi * (2i + 1) * k / 2n)
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def _bits_to_int(bits):
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def _grayscale(img, size):
+    # RGBA composited on white, then luminance, resized to size (w, h)
+    rgba = img.convert("RGBA")
+    background = Image.new("RGBA", rgba.size, (255, 255, 255, 255))
+    gray = Image.alpha_composite(background, rgba).convert("L")
+    return np.asarray(gray.resize(size, Image.LANCZOS), dtype=np.float64)
+
+
+def average_hash(img):
+    pixels = _grayscale(img, (HASH_SIZE, HASH_SIZE))
+    return _bits_to_int(pixels > pixels.mean())
+
+
+def difference_hash(img):
+    pixels = _grayscale(img, (HASH_SIZE + 1, HASH_SIZE))
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def perceptual_hash(img):
+    pixels = _grayscale(img, (PHASH_SIZE, PHASH_SIZE))
+    low = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    # The DC term only encodes overall brightness, so it is left out of the median
+    median = np.median(low.ravel()[1:])
+    return _bits_to_int(low > median)
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+def hash_image(path):
+    """Return (path, {"ahash", "dhash", "phash", "width", "height", "mtime"}) for one file"""
+    with Image.open(path) as img:
+        img.load()
+        return str(path), {
+            "ahash": average_hash(img),
+            "dhash": difference_hash(img),
+            "phash": perceptual_hash(img),
+            "width": img.width,
+            "height": img.height,
+            "mtime": Path(path).stat().st_mtime,
+        }
+
+
+class BKTree:
+    """Burkhard-Keller tree over integer hashes with Hamming distance."""
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def add(self, value, item):
+        # Nodes are [value, item, {distance: child}]
+        self.size += 1
+        if self.root is None:
+            self.root = [value, item, {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, item, {}]
+                return
+            node = child
+
+    def query(self, value, radius):
+        """Return [(distance, item)] for every stored hash within radius of value"""
+        found = []
+        pending = [self.root] if self.root is not None else []
+        while pending:
+            node = pending.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                found.append((distance, node[1]))
+            # Triangle inequality: only children keyed within radius of distance can match
+            for key, child in node[2].items():
+                if distance - radius <= key <= distance + radius:
+                    pending.append(child)
+        return sorted(found)
+
+
+def hash_images(paths, max_workers=None):
+    """Hash every path on a process pool; returns {path: hashes}"""
+    paths = [str(p) for p in paths]
+    chunksize = max(1, len(paths) // 64)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(executor.map(hash_image, paths, chunksize=chunksize))
+
+
+def is_shipped(path):
+    """True for files the app ships (under its assets/ or res/ directories)"""
+    path = Path(path).resolve()
+    return any(path.is_relative_to(directory) for directory in SHIPPED_DIRS)
+
+
+def build_outputs():
+    """Resolved paths of every file the asset build graph produces"""
+    from asset_build import define_pipeline
+
+    return {p.resolve() for node in define_pipeline().nodes.values() for p in node.outputs}
+
+
+def find_duplicate_groups(hashes, phash_radius=6, dhash_radius=10, generated=frozenset()):
+    """
+    Group images whose pHash is within phash_radius and dHash within dhash_radius.
+
+    Matches are merged transitively (union-find); each group is sorted so the
+    image to keep comes first: shipped app assets, then files not in generated
+    (build outputs), then most pixels, newest mtime, and the last name in sort
+    order (timestamped generations sort oldest first).
+    """
+    tree = BKTree()
+    for path, h in hashes.items():
+        tree.add(h["phash"], path)
+
+    parent = {path: path for path in hashes}
+
+    def find(path):
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    for path, h in hashes.items():
+        for _, other in tree.query(h["phash"], phash_radius):
+            if other != path and hamming(h["dhash"], hashes[other]["dhash"]) <= dhash_radius:
+                parent[find(other)] = find(path)
+
+    groups = {}
+    for path in hashes:
+        groups.setdefault(find(path), []).append(path)
+
+    def keep_order(path):
+        h = hashes[path]
+        return is_shipped(path), Path(path).resolve() not in generated, h["width"] * h["height"], h["mtime"], path
+
+    return sorted((sorted(g, key=keep_order, reverse=True) for g in groups.values() if len(g) > 1), key=lambda g: g[0])
+
+
+def collapse_groups(groups, quarantine_dir, base=REPO_ROOT, protected=frozenset()):
+    """
+    Move every non-kept image into quarantine_dir (mirroring its path); returns {moved: kept}.
+
+    Shipped assets and paths in protected (build outputs) stay where they are.
+    """
+    mapping = {}
+    for group in groups:
+        kept = group[0]
+        for duplicate in group[1:]:
+            if is_shipped(duplicate) or Path(duplicate).resolve() in protected:
+                continue
+            source = Path(duplicate)
+            relative = source.relative_to(base) if source.is_relative_to(base) else Path(source.name)
+            target = Path(quarantine_dir) / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(source), str(target))
+            mapping[duplicate] = kept
+    return mapping
+
+
+def main():
+    # CLI: image_dedup.py [roots...] [--radius 6] [--dhash-radius 10] [--json OUT] [--collapse] [--quarantine DIR] [--workers N]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("roots", nargs="*", default=[str(p) for p in DEFAULT_ROOTS], help="Image files or directories to index")
+    parser.add_argument("--radius", dest="radius", type=int, default=6, help="Max pHash Hamming distance (of 64 bits)")
+    parser.add_argument("--dhash-radius", dest="dhash_radius", type=int, default=10, help="Max dHash Hamming distance to confirm a match")
+    parser.add_argument("--json", dest="json_out", default=None, help="Write groups (and hashes) as JSON")
+    parser.add_argument("--collapse", dest="collapse", action="store_true", help="Move duplicates out of the tree, keeping one per group")
+    parser.add_argument("--quarantine", dest="quarantine", default=str(REPO_ROOT / "dedup_removed"), help="Where --collapse moves duplicates")
+    parser.add_argument("--workers", dest="workers", type=int, default=None, help="Process pool size for hashing")
+    args = parser.parse_args()
+
+    paths = sorted({p for root in args.roots for p in collect_images(root)})
+    if not paths:
+        print("No images found.")
+        return
+
+    print(f"🔎 Hashing {len(paths)} image(s)...")
+    hashes = hash_images(paths, max_workers=args.workers)
+    generated = build_outputs()
+    groups = find_duplicate_groups(hashes, args.radius, args.dhash_radius, generated)
+
+    for group in groups:
+        kept = hashes[group[0]]
+        print(f"\n🟰 {group[0]} ({kept['width']}x{kept['height']}) keep")
+        for path in group[1:]:
+            h = hashes[path]
+            note = " [shipped, kept]" if is_shipped(path) else " [build output, kept]" if Path(path).resolve() in generated else ""
+            print(f"   {path} ({h['width']}x{h['height']}){note} "
+                  f"pHash {hamming(kept['phash'], h['phash'])}, dHash {hamming(kept['dhash'], h['dhash'])}, "
+                  f"aHash {hamming(kept['ahash'], h['ahash'])}")
+
+    duplicates = sum(len(g) - 1 for g in groups)
+    print(f"\nFound {duplicates} duplicate(s) in {len(groups)} group(s) among {len(paths)} image(s).")
+
+    mapping = {}
+    if args.collapse and groups:
+        mapping = collapse_groups(groups, args.quarantine, protected=generated)
+        print(f"📦 Moved {len(mapping)} duplicate(s) to {args.quarantine}")
+
+    if args.json_out:
+        report = {
+            "groups": groups,
+            "moved": mapping,
+            "hashes": {p: {k: (f"{v:016x}" if k.endswith("hash") else v) for k, v in h.items()} for p, h in hashes.items()},
+        }
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+K-means palette quantization in CIELAB, used by reduce_colors.py --method kmeans.
+
+kmeans_palette() clusters a random sample of the visible (non-transparent)
+pixels: k-means++ seeding, mini-batch updates, then a few full Lloyd passes
+over the sample. Distances are Euclidean in Lab (D65), so the palette follows
+perceived color differences rather than raw RGB. apply_palette() maps every
+pixel to its nearest centroid in vectorized chunks, which keeps the extra
+memory bounded on large images. Seeds are fixed: the same image and settings
+always give the same palette.
+"""
+
+import sys
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    print("NumPy and Pillow are required. Install with: pip install numpy pillow")
+    sys.exit(1)
+
+# Pixels clustered to find the palette, and pixels mapped per vectorized chunk
+KMEANS_SAMPLE_PIXELS = 1 << 16
+MAP_CHUNK_PIXELS = 1 << 18
+BATCH_SIZE = 4096
+MINIBATCH_ITERATIONS = 50
+LLOYD_ITERATIONS = 3
+
+# sRGB (D65) -> XYZ, and the D65 reference white
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+], dtype=np.float32)
+_XYZ_TO_RGB = np.linalg.inv(_RGB_TO_XYZ).astype(np.float32)
+_WHITE = np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+_DELTA = 6 / 29
+
+_channel = np.arange(256, dtype=np.float64) / 255
+_SRGB_TO_LINEAR = np.where(_channel <= 0.04045, _channel / 12.92, ((_channel + 0.055) / 1.055) ** 2.4).astype(np.float32)
+
+
+def rgb_to_lab(rgb):
+    """(N, 3) uint8 sRGB -> (N, 3) float32 Lab"""
+    xyz = _SRGB_TO_LINEAR[rgb] @ (_RGB_TO_XYZ.T / _WHITE)
+    f = np.where(xyz > _DELTA ** 3, np.cbrt(xyz), xyz / (3 * _DELTA ** 2) + 4 / 29)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+
+
+def lab_to_rgb(lab):
+    """(N, 3) Lab -> (N, 3) uint8 sRGB, clipped to the gamut"""
+    fy = (lab[:, 0] + 16) / 116
+    f = np.stack([fy + lab[:, 1] / 500, fy, fy - lab[:, 2] / 200], axis=1)
+    xyz = np.where(f > _DELTA, f ** 3, 3 * _DELTA ** 2 * (f - 4 / 29)) * _WHITE
+    linear = np.clip(xyz @ _XYZ_TO_RGB.T, 0, 1)
+    srgb = np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+    return np.round(srgb * 255).astype(np.uint8)
+
+
+def nearest_centroid(points, centroids):
+    """Index of the closest centroid for each point (|p|^2 is the same for every centroid, so it is dropped)"""
+    distances = (centroids ** 2).sum(axis=1) - 2 * points @ centroids.T
+    return distances.argmin(axis=1)
+
+
+def kmeans_plus_plus(points, k, rng):
+    """k-means++ seeding; returns fewer than k centroids if the points have fewer distinct values"""
+    centroids = [points[rng.integers(len(points))]]
+    closest = ((points - centroids[0]) ** 2).sum(axis=1, dtype=np.float64)
+    for _ in range(1, k):
+        total = closest.sum()
+        if total == 0:
+            break
+        centroids.append(points[rng.choice(len(points), p=closest / total)])
+        closest = np.minimum(closest, ((points - centroids[-1]) ** 2).sum(axis=1))
+    return np.array(centroids, dtype=np.float32)
+
+
+def kmeans(points, k, seed=0):
+    """Cluster (N, 3) points: k-means++, mini-batch updates, then Lloyd passes; returns the centroids"""
+    rng = np.random.default_rng(seed)
+    centroids = kmeans_plus_plus(points, k, rng)
+    counts = np.zeros(len(centroids))
+    for _ in range(MINIBATCH_ITERATIONS):
+        batch = points[rng.integers(len(points), size=min(BATCH_SIZE, len(points)))]
+        labels = nearest_centroid(batch, centroids)
+        batch_counts = np.bincount(labels, minlength=len(centroids))
+        sums = np.stack([np.bincount(labels, batch[:, c], len(centroids)) for c in range(3)], axis=1)
+        # Per-centroid learning rate 1 / (points seen so far): each centroid is the running mean of its points
+        counts += batch_counts
+        seen = counts > 0
+        centroids[seen] += (sums[seen] - batch_counts[seen, None] * centroids[seen]) / counts[seen, None]
+    for _ in range(LLOYD_ITERATIONS):
+        labels = nearest_centroid(points, centroids)
+        sizes = np.bincount(labels, minlength=len(centroids))
+        sums = np.stack([np.bincount(labels, points[:, c], len(centroids)) for c in range(3)], axis=1)
+        filled = sizes > 0  # an empty cluster keeps its centroid
+        centroids[filled] = sums[filled] / sizes[filled, None]
+    return centroids
+
+
+def kmeans_palette(image, max_colors, sample_pixels=KMEANS_SAMPLE_PIXELS, seed=0):
+    """Lab centroids (at most max_colors) for an RGB or RGBA Pillow image; fully transparent pixels are ignored"""
+    if not 1 <= max_colors <= 256:
+        # Same limit as Image.quantize: palettes (and apply_palette's uint8 indices) hold 256 entries
+        raise ValueError(f"max_colors must be between 1 and 256, got {max_colors}")
+    rgba = np.asarray(image.convert("RGBA")).reshape(-1, 4)
+    if len(rgba) > sample_pixels:
+        # Sampling with replacement: a permutation of a large image costs more than the clustering
+        rgba = rgba[np.random.default_rng(seed).integers(len(rgba), size=sample_pixels)]
+    visible = rgba[rgba[:, 3] > 0] if (rgba[:, 3] > 0).any() else rgba
+    centroids = kmeans(rgb_to_lab(visible[:, :3]), max_colors, seed)
+    # Centroids that land on the same 8-bit color would waste palette entries
+    _, first = np.unique(lab_to_rgb(centroids), axis=0, return_index=True)
+    return centroids[np.sort(first)]
+
+
+def palette_image(centroids):
+    """Pillow "P" image holding the centroids' sRGB colors (for Image.quantize(palette=...))"""
+    palette = Image.new("P", (1, 1))
+    colors = lab_to_rgb(centroids)
+    palette.putpalette(colors.ravel().tolist() + colors[-1].tolist() * (256 - len(colors)))
+    return palette
+
+
+def apply_palette(image, centroids, dither="none"):
+    """
+    Map an RGB image to the nearest centroid colors; returns an RGB image.
+
+    Without dithering the match is nearest in Lab, chunk by chunk. Floyd-Steinberg
+    diffuses error pixel by pixel, so it goes through Pillow (nearest in RGB).
+    """
+    if dither == "floyd":
+        return image.quantize(palette=palette_image(centroids), dither=Image.Dither.FLOYDSTEINBERG).convert("RGB")
+    colors = lab_to_rgb(centroids)
+    pixels = np.asarray(image.convert("RGB")).reshape(-1, 3)
+    indices = np.empty(len(pixels), dtype=np.uint8)
+    for start in range(0, len(pixels), MAP_CHUNK_PIXELS):
+        chunk = pixels[start:start + MAP_CHUNK_PIXELS]
+        indices[start:start + len(chunk)] = nearest_centroid(rgb_to_lab(chunk), centroids)
+    return Image.fromarray(colors[indices].reshape(image.height, image.width, 3), "RGB")
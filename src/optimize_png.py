@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+# Lossless PNG recompression
+# - Per file, tries every color-type reduction that keeps the pixels exact
+#   (RGBA -> RGB / gray / gray+alpha, palette with tRNS, 1/2/4-bit depths)
+# - For each, tries the five PNG row filters, per-row adaptive filtering and
+#   several zlib strategies (plus zopfli if installed) and keeps the smallest
+# - Ancillary chunks (text, time, pHYs, gAMA, cHRM, sRGB, ...) are dropped; an ICC
+#   profile is kept for color outputs and dropped for gray ones (an RGB profile is
+#   not valid in a gray PNG)
+# - Every result is decoded again and compared to the original pixels
+# - Decisions are cached by content hash, so re-runs skip files already optimized
+
+import hashlib
+import io
+import json
+import struct
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    print("NumPy and Pillow are required. Install with: pip install numpy pillow")
+    sys.exit(1)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APP_MAIN = REPO_ROOT / "HelloGoodbye/app/src/main"
+DEFAULT_ROOTS = [APP_MAIN / "assets", APP_MAIN / "res"]
+CACHE_FILE = REPO_ROOT / ".png_optimize_cache.json"
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG color types
+GRAY, RGB, PALETTE, GRAY_ALPHA, RGBA = 0, 2, 3, 4, 6
+CHANNELS = {GRAY: 1, RGB: 3, PALETTE: 1, GRAY_ALPHA: 2, RGBA: 4}
+ZLIB_STRATEGIES = [zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED]
+ZLIB_NAMES = {zlib.Z_DEFAULT_STRATEGY: "zlib9", zlib.Z_FILTERED: "zlib9-filtered"}
+FILTER_NAMES = ["none", "sub", "up", "average", "paeth", "adaptive"]
+
+
+def _chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+def _pack_rows(samples, bit_depth):
+    # samples: (h, w * channels) uint8 -> (h, stride) bytes at bit_depth
+    if bit_depth == 8:
+        return samples
+    bits = np.unpackbits(samples[..., None], axis=-1)[..., 8 - bit_depth:]
+    return np.packbits(bits.reshape(samples.shape[0], -1), axis=1)
+
+
+def filter_rows(raw, bpp):
+    """Return a (5, h, stride) uint8 stack of raw filtered with none/sub/up/average/paeth"""
+    raw16 = raw.astype(np.int16)
+    left = np.zeros_like(raw16)
+    left[:, bpp:] = raw16[:, :-bpp]
+    up = np.zeros_like(raw16)
+    up[1:] = raw16[:-1]
+    up_left = np.zeros_like(raw16)
+    up_left[1:, bpp:] = raw16[:-1, :-bpp]
+
+    p = left + up - up_left
+    pa, pb, pc = np.abs(p - left), np.abs(p - up), np.abs(p - up_left)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+
+    predictions = [np.zeros_like(raw16), left, up, (left + up) // 2, paeth]
+    return np.stack([((raw16 - pred) & 0xFF).astype(np.uint8) for pred in predictions])
+
+
+def filtered_streams(raw, bpp):
+    """Yield (filter name, filtered bytes with per-row type bytes) for each filter strategy"""
+    stack = filter_rows(raw, bpp)
+    height = raw.shape[0]
+    for index in range(5):
+        rows = np.concatenate([np.full((height, 1), index, np.uint8), stack[index]], axis=1)
+        yield FILTER_NAMES[index], rows.tobytes()
+    # Adaptive: per row, the filter with the smallest sum of absolute signed bytes
+    cost = np.abs(stack.view(np.int8).astype(np.int32)).sum(axis=2)
+    choice = cost.argmin(axis=0)
+    rows = np.concatenate([choice[:, None].astype(np.uint8), stack[choice, np.arange(height)]], axis=1)
+    yield "adaptive", rows.tobytes()
+
+
+def _deflate(data, strategy):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+    return compressor.compress(data) + compressor.flush()
+
+
+def encoding_candidates(rgba):
+    """
+    Yield (label, color_type, bit_depth, samples, palette_chunks) for lossless encodings of rgba.
+
+    samples is (h, w * channels) uint8 before bit packing; palette_chunks are
+    the PLTE/tRNS chunk bytes for palette images.
+    """
+    height, width, _ = rgba.shape
+    alpha = rgba[..., 3]
+    opaque = bool((alpha == 255).all())
+    gray = bool(((rgba[..., 0] == rgba[..., 1]) & (rgba[..., 1] == rgba[..., 2])).all())
+
+    if gray and opaque:
+        values = rgba[..., 0]
+        # Low bit depths are exact only if every value is a multiple of 255 / (2^b - 1)
+        for bits in (1, 2, 4):
+            scale = 255 // ((1 << bits) - 1)
+            if not (values % scale).any():
+                yield f"gray{bits}", GRAY, bits, values // scale, b""
+                break
+        else:
+            yield "gray8", GRAY, 8, values, b""
+    elif gray:
+        yield "gray+alpha", GRAY_ALPHA, 8, rgba[..., [0, 3]].reshape(height, -1), b""
+    elif opaque:
+        yield "rgb", RGB, 8, rgba[..., :3].reshape(height, -1), b""
+    yield "rgba", RGBA, 8, rgba.reshape(height, -1), b""
+
+    packed = rgba.view(np.uint32).reshape(height, width)
+    colors, inverse, counts = np.unique(packed, return_inverse=True, return_counts=True)
+    if len(colors) <= 256:
+        entries = colors.view(np.uint8).reshape(-1, 4)
+        # Translucent entries first keeps tRNS short; then most frequent first
+        order = np.lexsort((-counts, entries[:, 3] == 255))
+        remap = np.empty(len(colors), np.uint8)
+        remap[order] = np.arange(len(colors), dtype=np.uint8)
+        indices = remap[inverse.reshape(height, width)]
+        entries = entries[order]
+        chunks = _chunk(b"PLTE", entries[:, :3].tobytes())
+        translucent = int((entries[:, 3] != 255).sum())
+        if translucent:
+            chunks += _chunk(b"tRNS", entries[:translucent, 3].tobytes())
+        bits = next(b for b in (1, 2, 4, 8) if len(colors) <= 1 << b)
+        yield f"palette{bits}", PALETTE, bits, indices, chunks
+
+
+def encode_png(width, height, color_type, bit_depth, idat, palette_chunks=b"", icc_profile=None):
+    ihdr = struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)
+    out = PNG_SIGNATURE + _chunk(b"IHDR", ihdr)
+    # The source profile describes RGB; gray color types may only carry a gray profile
+    if icc_profile and color_type not in (GRAY, GRAY_ALPHA):
+        out += _chunk(b"iCCP", b"icc\x00\x00" + zlib.compress(icc_profile, 9))
+    return out + palette_chunks + _chunk(b"IDAT", idat) + _chunk(b"IEND", b"")
+
+
+def _decode_rgba(data):
+    with Image.open(io.BytesIO(data)) as img:
+        return np.asarray(img.convert("RGBA"))
+
+
+def optimize_png_bytes(data, use_zopfli=False):
+    """
+    Return (best bytes, strategy label) for a PNG, or (data, "original") if nothing is smaller.
+
+    16-bit PNGs are returned unchanged: Pillow's 8-bit RGBA view of them is not lossless.
+    """
+    if data[24] == 16:
+        return data, "original (16-bit)"
+
+    with Image.open(io.BytesIO(data)) as img:
+        icc_profile = img.info.get("icc_profile")
+        rgba = np.ascontiguousarray(np.asarray(img.convert("RGBA")))
+    height, width, _ = rgba.shape
+
+    best, label, winner = data, "original", None
+    for name, color_type, bit_depth, samples, palette_chunks in encoding_candidates(rgba):
+        raw = _pack_rows(np.ascontiguousarray(samples, dtype=np.uint8), bit_depth)
+        bpp = max(1, CHANNELS[color_type] * bit_depth // 8)
+        header = (width, height, color_type, bit_depth)
+        for filter_name, stream in filtered_streams(raw, bpp):
+            for strategy in ZLIB_STRATEGIES:
+                png = encode_png(*header, _deflate(stream, strategy), palette_chunks, icc_profile)
+                if len(png) < len(best):
+                    best, label = png, f"{name}/{filter_name}/{ZLIB_NAMES[strategy]}"
+                    winner = (header, stream, palette_chunks)
+
+    if winner is None:
+        return data, label
+    if use_zopfli:
+        import zopfli.zlib
+
+        # zopfli is slow, so it only re-compresses the winning filtered stream
+        header, stream, palette_chunks = winner
+        png = encode_png(*header, zopfli.zlib.compress(stream), palette_chunks, icc_profile)
+        if len(png) < len(best):
+            best, label = png, label.rsplit("/", 1)[0] + "/zopfli"
+
+    if not np.array_equal(_decode_rgba(best), rgba):
+        raise ValueError(f"Re-encoded PNG ({label}) does not match the original pixels")
+    return best, label
+
+
+def optimize_file(path, use_zopfli=False):
+    """Optimize one PNG in place; returns (path, sha256 in, sha256 out, size in, size out, strategy)"""
+    path = Path(path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    best, strategy = optimize_png_bytes(data, use_zopfli=use_zopfli)
+    if best is not data:
+        path.write_bytes(best)
+    return str(path), digest, hashlib.sha256(best).hexdigest(), len(data), len(best), strategy
+
+
+def collect_pngs(roots):
+    for root in roots:
+        root = Path(root)
+        if root.is_file():
+            yield root
+        else:
+            yield from sorted(root.rglob("*.png"))
+
+
+def optimize_tree(roots, cache_file=CACHE_FILE, use_zopfli=False, max_workers=None, log=print):
+    """Optimize every PNG under roots in parallel, skipping files whose hash is known to be optimal"""
+    cache = json.loads(Path(cache_file).read_text()) if Path(cache_file).exists() else {}
+    todo = []
+    skipped = 0
+    for path in collect_pngs(roots):
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        # Outputs are recorded as well, so an optimized file is recognized as final
+        if digest in cache and (cache[digest]["zopfli"] or not use_zopfli):
+            skipped += 1
+        else:
+            todo.append(str(path))
+
+    results = []
+    if todo:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(optimize_file, path, use_zopfli) for path in todo]
+            for future in futures:
+                path, digest_in, digest_out, size_in, size_out, strategy = future.result()
+                results.append((path, size_in, size_out, strategy))
+                log(f"{'✅' if size_out < size_in else '➖'} {path}: {size_in} -> {size_out} bytes ({strategy})")
+                entry = {"size": size_out, "strategy": strategy, "zopfli": use_zopfli}
+                cache[digest_in] = dict(entry, output=digest_out)
+                cache[digest_out] = dict(entry, output=digest_out)
+
+    Path(cache_file).write_text(json.dumps(cache, indent=1, sort_keys=True))
+    return results, skipped
+
+
+def main():
+    # CLI: optimize_png.py [paths...] [--zopfli] [--workers N] [--cache FILE]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("paths", nargs="*", default=[str(p) for p in DEFAULT_ROOTS], help="PNG files or directories (default: app assets/ and res/)")
+    parser.add_argument("--zopfli", dest="zopfli", action="store_true", help="Re-compress the best candidate with zopfli (pip install zopfli)")
+    parser.add_argument("--workers", dest="workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--cache", dest="cache", default=str(CACHE_FILE), help="Cache of per-content-hash decisions")
+    args = parser.parse_args()
+
+    results, skipped = optimize_tree(args.paths, cache_file=args.cache, use_zopfli=args.zopfli, max_workers=args.workers)
+    before = sum(r[1] for r in results)
+    after = sum(r[2] for r in results)
+    saved = f", saved {before - after} bytes ({(before - after) / before:.1%})" if before else ""
+    print(f"\nDone. Optimized {len(results)} file(s), {skipped} already optimal{saved}.")
+
+
+if __name__ == "__main__":
+    main()
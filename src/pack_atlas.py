@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+
+# Pack many small image assets into one (or a few) texture atlases
+# - Sources: PNG/JPG/WEBP files and SVGs (rasterized with cairosvg)
+# - Skyline bottom-left bin packing, spilling into extra pages when full
+# - Writes atlas_<n>.png plus a JSON (and optional binary) index of pixel/UV rects
+# - Optional palette reduction of each page via reduce_colors
+
+import io
+import json
+import struct
+import sys
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    print("Pillow (PIL) is required. Install with: pip install pillow")
+    sys.exit(1)
+
+from reduce_colors import collect_images, ensure_dir, quantize_image_to_max_colors
+from split_image import trim_alpha_and_add_padding
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = REPO_ROOT / "HelloGoodbye/app/src/main/assets"
+DEFAULT_SOURCES = [
+    ASSETS_DIR / "travel_icons",
+    ASSETS_DIR / "badges",
+    ASSETS_DIR / "flags/4x3",
+    ASSETS_DIR / "cup_bronze.svg",
+    ASSETS_DIR / "cup_silver.svg",
+    ASSETS_DIR / "cup_gold.svg",
+    ASSETS_DIR / "cup_platinum.svg",
+]
+
+# Binary index layout (little endian):
+#   header: magic "HGAT", u16 version, u16 page count, u32 sprite count
+#   page:   u16 width, u16 height
+#   sprite: u16 name length, name (utf-8), u16 page, u16 x, u16 y, u16 w, u16 h
+BINARY_MAGIC = b"HGAT"
+BINARY_VERSION = 1
+
+
+def collect_sources(paths):
+    # Yield (key, path) pairs; keys are paths relative to the assets dir when possible,
+    # otherwise relative to the parent of the source they were found under
+    seen = {}
+    for p in paths:
+        p = Path(p)
+        if p.is_file():
+            files = [p]
+        else:
+            files = sorted(set(collect_images(p)) | set(p.rglob("*.svg")))
+        for file in files:
+            if file.resolve().is_relative_to(ASSETS_DIR):
+                key = file.resolve().relative_to(ASSETS_DIR).as_posix()
+            else:
+                key = file.relative_to(p.parent).as_posix()
+            if key in seen:
+                raise ValueError(f"Sprite key clash: {seen[key]} and {file} both map to {key}")
+            seen[key] = file
+            yield key, file
+
+
+def load_sprite(path, svg_height=96):
+    # Load a source as RGBA; SVGs are rasterized at svg_height preserving aspect ratio
+    if path.suffix.lower() == ".svg":
+        from cairosvg import svg2png
+
+        png_bytes = svg2png(url=str(path), output_height=svg_height)
+        return Image.open(io.BytesIO(png_bytes)).convert("RGBA")
+    with Image.open(path) as im:
+        return im.convert("RGBA")
+
+
+class SkylinePacker:
+    """Bottom-left skyline packer for a single fixed-width page."""
+
+    def __init__(self, width, max_height):
+        self.width = width
+        self.max_height = max_height
+        # Each segment is [x, y, width]; segments cover the full page width
+        self.skyline = [[0, 0, width]]
+        self.used_height = 0
+
+    def _fit(self, index, w, h):
+        # Return the y at which a w x h rect fits starting at segment index, or None
+        x = self.skyline[index][0]
+        if x + w > self.width:
+            return None
+        remaining = w
+        y = 0
+        i = index
+        while remaining > 0:
+            y = max(y, self.skyline[i][1])
+            if y + h > self.max_height:
+                return None
+            remaining -= self.skyline[i][2]
+            i += 1
+        return y
+
+    def insert(self, w, h):
+        # Place a rect, returning (x, y) or None if the page is full
+        best = None
+        for i in range(len(self.skyline)):
+            y = self._fit(i, w, h)
+            if y is None:
+                continue
+            score = (y + h, self.skyline[i][0])
+            if best is None or score < best[0]:
+                best = (score, i, y)
+        if best is None:
+            return None
+
+        _, index, y = best
+        x = self.skyline[index][0]
+        self._add_level(index, x, y + h, w)
+        self.used_height = max(self.used_height, y + h)
+        return x, y
+
+    def _add_level(self, index, x, y, w):
+        # Raise the skyline over [x, x + w) to y and trim the segments it covers
+        self.skyline.insert(index, [x, y, w])
+        i = index + 1
+        while i < len(self.skyline):
+            seg = self.skyline[i]
+            prev_end = self.skyline[i - 1][0] + self.skyline[i - 1][2]
+            if seg[0] >= prev_end:
+                break
+            shrink = prev_end - seg[0]
+            seg[0] += shrink
+            seg[2] -= shrink
+            if seg[2] > 0:
+                break
+            del self.skyline[i]
+
+        # Merge neighbours at the same height
+        i = 0
+        while i < len(self.skyline) - 1:
+            if self.skyline[i][1] == self.skyline[i + 1][1]:
+                self.skyline[i][2] += self.skyline[i + 1][2]
+                del self.skyline[i + 1]
+            else:
+                i += 1
+
+
+def pack_sprites(sizes, page_width=2048, page_height=2048, padding=2):
+    # sizes: list of (key, w, h). Returns ({key: (page, x, y)}, [(page_w, page_h), ...])
+    order = sorted(sizes, key=lambda s: (s[2], s[1]), reverse=True)
+    pages = []
+    placements = {}
+    for key, w, h in order:
+        pw, ph = w + padding, h + padding
+        if pw > page_width or ph > page_height:
+            raise ValueError(f"Sprite {key} ({w}x{h}) does not fit in a {page_width}x{page_height} page")
+        for page_index, packer in enumerate(pages):
+            pos = packer.insert(pw, ph)
+            if pos is not None:
+                break
+        else:
+            pages.append(SkylinePacker(page_width, page_height))
+            page_index = len(pages) - 1
+            pos = pages[page_index].insert(pw, ph)
+        placements[key] = (page_index, pos[0], pos[1])
+    return placements, [(p.width, p.used_height) for p in pages]
+
+
+def write_binary_index(path, pages, sprites):
+    # Compact index for loaders that want to avoid JSON parsing at startup
+    with open(path, "wb") as f:
+        f.write(BINARY_MAGIC)
+        f.write(struct.pack("<HHI", BINARY_VERSION, len(pages), len(sprites)))
+        for page in pages:
+            f.write(struct.pack("<HH", page["width"], page["height"]))
+        for key, s in sprites.items():
+            name = key.encode("utf-8")
+            f.write(struct.pack("<H", len(name)))
+            f.write(name)
+            f.write(struct.pack("<HHHHH", s["page"], s["x"], s["y"], s["w"], s["h"]))
+
+
+def build_atlas(sources, out_dir, page_width=2048, page_height=2048, padding=2,
+                svg_height=96, trim=False, max_colors=None, binary=False):
+    # Load every source, pack, compose page images and write the index files
+    sprites_img = {}
+    for key, path in collect_sources(sources):
+        img = load_sprite(path, svg_height=svg_height)
+        if trim:
+            img = trim_alpha_and_add_padding(img, padding=0)
+        sprites_img[key] = img
+
+    if not sprites_img:
+        raise ValueError("No sprites found to pack")
+
+    sizes = [(key, img.width, img.height) for key, img in sprites_img.items()]
+    placements, page_sizes = pack_sprites(sizes, page_width, page_height, padding)
+
+    ensure_dir(out_dir)
+    canvases = [Image.new("RGBA", size, (0, 0, 0, 0)) for size in page_sizes]
+    for key, img in sprites_img.items():
+        page, x, y = placements[key]
+        canvases[page].paste(img, (x, y))
+
+    pages = []
+    for index, canvas in enumerate(canvases):
+        filename = f"atlas_{index}.png"
+        page_path = Path(out_dir) / filename
+        canvas.save(page_path, format="PNG", optimize=True)
+        if max_colors:
+            quantize_image_to_max_colors(page_path, page_path, max_colors=max_colors)
+        pages.append({"file": filename, "width": canvas.width, "height": canvas.height})
+
+    sprites = {}
+    for key in sorted(sprites_img):
+        img = sprites_img[key]
+        page, x, y = placements[key]
+        pw, ph = page_sizes[page]
+        sprites[key] = {
+            "page": page,
+            "x": x,
+            "y": y,
+            "w": img.width,
+            "h": img.height,
+            "u0": x / pw,
+            "v0": y / ph,
+            "u1": (x + img.width) / pw,
+            "v1": (y + img.height) / ph,
+        }
+
+    index = {"version": BINARY_VERSION, "pages": pages, "sprites": sprites}
+    with open(Path(out_dir) / "atlas_index.json", "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    if binary:
+        write_binary_index(Path(out_dir) / "atlas_index.bin", pages, sprites)
+    return index
+
+
+def main():
+    # Simple CLI: pack_atlas.py [sources...] [--out OUT_DIR] [--page-size 2048] [--padding 2] [--svg-height 96] [--trim] [--max-colors N] [--binary]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("sources", nargs="*", default=[str(p) for p in DEFAULT_SOURCES], help="Image/SVG files or directories to pack")
+    parser.add_argument("--out", dest="out_dir", default=str(ASSETS_DIR / "atlas"), help="Output directory for atlas pages and index")
+    parser.add_argument("--page-size", dest="page_size", type=int, default=2048, help="Maximum page width/height in pixels")
+    parser.add_argument("--padding", dest="padding", type=int, default=2, help="Transparent gap between sprites")
+    parser.add_argument("--svg-height", dest="svg_height", type=int, default=96, help="Raster height for SVG sources")
+    parser.add_argument("--trim", dest="trim", action="store_true", help="Trim transparent borders before packing")
+    parser.add_argument("--max-colors", dest="max_colors", type=int, default=None, help="Quantize each page to at most N colors")
+    parser.add_argument("--binary", dest="binary", action="store_true", help="Also write atlas_index.bin")
+
+    args = parser.parse_args()
+
+    for source in args.sources:
+        if not Path(source).exists():
+            print(f"❌ Input not found: {source}")
+            sys.exit(1)
+
+    print(f"🧩 Packing {len(args.sources)} source(s) into {args.page_size}x{args.page_size} pages")
+    index = build_atlas(
+        args.sources,
+        Path(args.out_dir),
+        page_width=args.page_size,
+        page_height=args.page_size,
+        padding=args.padding,
+        svg_height=args.svg_height,
+        trim=args.trim,
+        max_colors=args.max_colors,
+        binary=args.binary,
+    )
+    for page in index["pages"]:
+        print(f"✅ {page['file']} ({page['width']}x{page['height']})")
+    print(f"\nDone. Packed {len(index['sprites'])} sprite(s) into {len(index['pages'])} page(s) in {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
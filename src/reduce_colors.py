@@ -4,6 +4,7 @@
 # - Preserves transparency
 # - Works on a file or a directory of images
 # - Outputs PNG files with reduced palette
+# - --method kmeans clusters in Lab space with NumPy (kmeans_quantize.py) instead of Pillow
 
 import os
 import sys
@@ -16,6 +17,10 @@ except ImportError:
     sys.exit(1)
 
 
+# Pixels sampled to build the palette in strip mode
+STRIP_SAMPLE_PIXELS = 1 << 20
+
+
 def ensure_dir(path):
     # Create directory if it doesn't exist
     Path(path).mkdir(parents=True, exist_ok=True)
@@ -33,31 +38,44 @@ def count_unique_colors_rgb(image):
         return 256 * 256 * 256 + 1
 
 
-def quantize_image_to_max_colors(img_path, out_path, max_colors=4, method="median", dither="none"):
+def quantize_settings(method="median", dither="none"):
+    # Map CLI method/dither names to Pillow constants
+    if method == "fast":
+        q_method = Image.FASTOCTREE
+    elif method == "lib":
+        q_method = Image.LIBIMAGEQUANT if hasattr(Image, "LIBIMAGEQUANT") else Image.MEDIANCUT
+    else:
+        q_method = Image.MEDIANCUT
+
+    if dither == "floyd":
+        q_dither = Image.Dither.FLOYDSTEINBERG
+    else:
+        q_dither = Image.Dither.NONE
+    return q_method, q_dither
+
+
+def quantize_image_to_max_colors(img_path, out_path, max_colors=4, method="median", dither="none", strip_height=None):
     # Reduce the number of colors in the image while preserving the alpha channel
+    # strip_height switches to the memory-bounded strip mode (see quantize_image_in_strips)
+    if strip_height:
+        quantize_image_in_strips(img_path, out_path, max_colors, method, dither, strip_height)
+        return
+
     with Image.open(img_path) as im:
         im = im.convert("RGBA")
         alpha = im.getchannel("A")
         rgb = im.convert("RGB")
 
-        # Determine quantization method
-        if method == "fast":
-            q_method = Image.FASTOCTREE
-        elif method == "lib":
-            q_method = Image.LIBIMAGEQUANT if hasattr(Image, "LIBIMAGEQUANT") else Image.MEDIANCUT
-        else:
-            q_method = Image.MEDIANCUT
-
-        # Determine dithering
-        if dither == "floyd":
-            q_dither = Image.Dither.FLOYDSTEINBERG
-        else:
-            q_dither = Image.Dither.NONE
+        q_method, q_dither = quantize_settings(method, dither)
 
         # If already within limit, no need to quantize
         unique_count = count_unique_colors_rgb(rgb)
         if unique_count <= max_colors:
             reduced = rgb
+        elif method == "kmeans":
+            from kmeans_quantize import apply_palette, kmeans_palette
+
+            reduced = apply_palette(rgb, kmeans_palette(im, max_colors), dither)
         else:
             reduced = rgb.quantize(colors=max_colors, method=q_method, dither=q_dither)
             reduced = reduced.convert("RGB")
@@ -70,6 +88,56 @@ def quantize_image_to_max_colors(img_path, out_path, max_colors=4, method="media
         reduced.save(out_path, format="PNG", optimize=True)
 
 
+def quantize_image_in_strips(img_path, out_path, max_colors=4, method="median", dither="none", strip_height=256):
+    # Same result shape as quantize_image_to_max_colors, but the decoded RGBA frame is
+    # the only full-size buffer: strips are converted, quantized and pasted back in place.
+    # The palette comes from a nearest-neighbour sample (exact colors, no blending) of at
+    # most STRIP_SAMPLE_PIXELS; Floyd-Steinberg error does not carry across strips.
+    q_method, q_dither = quantize_settings(method, dither)
+    with Image.open(img_path) as src:
+        im = src.convert("RGBA") if src.mode != "RGBA" else src
+        im.load()
+        width, height = im.size
+        boxes = [(0, y, width, min(height, y + strip_height)) for y in range(0, height, strip_height)]
+
+        # Count colors strip by strip, stopping as soon as the limit is exceeded
+        colors = set()
+        for box in boxes:
+            found = im.crop(box).convert("RGB").getcolors(max_colors)
+            if found is None:
+                colors = None
+                break
+            colors.update(color for _, color in found)
+            if len(colors) > max_colors:
+                colors = None
+                break
+
+        if colors is None:
+            scale = (width * height / STRIP_SAMPLE_PIXELS) ** 0.5
+            if scale > 1:
+                sample = im.resize((max(1, int(width / scale)), max(1, int(height / scale))), Image.NEAREST)
+            else:
+                sample = im
+            if method == "kmeans":
+                from kmeans_quantize import apply_palette, kmeans_palette
+
+                centroids = kmeans_palette(sample, max_colors)
+            else:
+                palette = sample.convert("RGB").quantize(colors=max_colors, method=q_method, dither=Image.Dither.NONE)
+            del sample
+            for box in boxes:
+                strip = im.crop(box)
+                if method == "kmeans":
+                    reduced = apply_palette(strip.convert("RGB"), centroids, dither).convert("RGBA")
+                else:
+                    reduced = strip.convert("RGB").quantize(palette=palette, dither=q_dither).convert("RGBA")
+                reduced.putalpha(strip.getchannel("A"))
+                im.paste(reduced, box)
+
+        ensure_dir(Path(out_path).parent)
+        im.save(out_path, format="PNG", optimize=True)
+
+
 def collect_images(input_path):
     # Yield image file paths under input_path (file or directory)
     exts = {".png", ".jpg", ".jpeg", ".webp", ".bmp"}
@@ -84,16 +152,17 @@ def collect_images(input_path):
 
 
 def main():
-    # Simple CLI: reduce_colors.py <input> [--out OUT_DIR] [--max 4] [--method median|fast|lib] [--dither none|floyd] [--skip-existing]
+    # Simple CLI: reduce_colors.py <input> [--out OUT_DIR] [--max 4] [--method median|fast|lib|kmeans] [--dither none|floyd] [--skip-existing] [--strip-height N]
     import argparse
 
     parser = argparse.ArgumentParser(add_help=True)
     parser.add_argument("input", nargs="?", default=str(Path("HelloGoodbye/app/src/main/assets/travel_icons")), help="Input file or directory of images")
     parser.add_argument("--out", dest="out_dir", default=None, help="Output directory (default: <input>_reduced)")
     parser.add_argument("--max", dest="max_colors", type=int, default=4, help="Maximum number of colors")
-    parser.add_argument("--method", dest="method", choices=["median", "fast", "lib"], default="median", help="Quantization method")
+    parser.add_argument("--method", dest="method", choices=["median", "fast", "lib", "kmeans"], default="median", help="Quantization method (kmeans needs NumPy)")
     parser.add_argument("--dither", dest="dither", choices=["none", "floyd"], default="none", help="Dithering method")
     parser.add_argument("--skip-existing", dest="skip_existing", action="store_true", help="Skip files that already exist in output")
+    parser.add_argument("--strip-height", dest="strip_height", type=int, default=None, help="Process large images in strips of N rows to bound memory")
 
     args = parser.parse_args()
 
@@ -129,7 +198,8 @@ def main():
             print(f"⏭️  Skipping existing {dest}")
             continue
         try:
-            quantize_image_to_max_colors(src, dest, max_colors=args.max_colors, method=args.method, dither=args.dither)
+            quantize_image_to_max_colors(src, dest, max_colors=args.max_colors, method=args.method, dither=args.dither,
+                                         strip_height=args.strip_height)
             print(f"✅ {rel} → {dest.name}")
             processed += 1
         except Exception as e:
@@ -0,0 +1,753 @@
+#!/usr/bin/env python3
+"""
+Flatten an SVG document into a flat list of filled/stroked paths.
+
+Vector Drawables have no equivalent for SVG transforms on arbitrary elements,
+<use> references, basic shapes or CSS, so everything is resolved up front:
+- nested transform attributes are composed and baked into the path data
+- <rect>, <circle>, <ellipse>, <line>, <polyline> and <polygon> become paths
+- <use> instantiates its referenced element (with the x/y offset)
+- presentation attributes, <style> rules (tag, .class, #id) and inline style
+  are cascaded and inherited down the tree
+- gradient paints fall back to a representative solid stop color
+
+flatten_svg() yields (segments, style) pairs in document order, where
+segments are absolute svg_path_data segments in root user space.
+iter_flattened_shapes() does the same from a file with iterparse, clearing
+processed elements so large documents are never held in memory.
+"""
+
+import math
+import re
+import xml.etree.ElementTree as ET
+
+from svg_path_data import parse_path_data, to_absolute
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+# Properties that children inherit from their ancestors
+INHERITED_PROPERTIES = {
+    "fill", "fill-opacity", "fill-rule", "stroke", "stroke-opacity", "stroke-width",
+    "stroke-linecap", "stroke-linejoin", "stroke-miterlimit", "visibility",
+}
+STYLE_PROPERTIES = INHERITED_PROPERTIES | {"opacity", "display"}
+
+SHAPE_TAGS = {"path", "rect", "circle", "ellipse", "line", "polyline", "polygon"}
+CONTAINER_TAGS = {"svg", "g", "a", "switch"}
+# Subtrees that never render directly (referenced content is reached through <use>)
+SKIPPED_TAGS = {
+    "defs", "symbol", "clipPath", "mask", "marker", "pattern", "linearGradient",
+    "radialGradient", "filter", "style", "title", "desc", "metadata", "text",
+}
+
+_TRANSFORM_RE = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_CSS_RULE_RE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_URL_RE = re.compile(r"url\(\s*['\"]?#([^'\")]+)['\"]?\s*\)")
+
+
+def local_name(tag):
+    """Tag without its XML namespace ('{http://www.w3.org/2000/svg}path' -> 'path')"""
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+# --- Transforms ---
+def multiply(m1, m2):
+    """Affine product m1 * m2 (m2 is applied first)"""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (
+        a1 * a2 + c1 * b2,
+        b1 * a2 + d1 * b2,
+        a1 * c2 + c1 * d2,
+        b1 * c2 + d1 * d2,
+        a1 * e2 + c1 * f2 + e1,
+        b1 * e2 + d1 * f2 + f1,
+    )
+
+
+def parse_transform(value):
+    """Parse an SVG transform attribute into a 6-tuple matrix"""
+    matrix = IDENTITY
+    if not value:
+        return matrix
+    for name, raw_args in _TRANSFORM_RE.findall(value):
+        args = [float(n) for n in _NUMBER_RE.findall(raw_args)]
+        if name == "matrix":
+            step = tuple(args[:6])
+        elif name == "translate":
+            step = (1.0, 0.0, 0.0, 1.0, args[0], args[1] if len(args) > 1 else 0.0)
+        elif name == "scale":
+            sx = args[0]
+            sy = args[1] if len(args) > 1 else sx
+            step = (sx, 0.0, 0.0, sy, 0.0, 0.0)
+        elif name == "rotate":
+            angle = math.radians(args[0])
+            cos, sin = math.cos(angle), math.sin(angle)
+            step = (cos, sin, -sin, cos, 0.0, 0.0)
+            if len(args) >= 3:
+                cx, cy = args[1], args[2]
+                step = multiply(multiply((1.0, 0.0, 0.0, 1.0, cx, cy), step), (1.0, 0.0, 0.0, 1.0, -cx, -cy))
+        elif name == "skewX":
+            step = (1.0, 0.0, math.tan(math.radians(args[0])), 1.0, 0.0, 0.0)
+        else:
+            step = (1.0, math.tan(math.radians(args[0])), 0.0, 1.0, 0.0, 0.0)
+        matrix = multiply(matrix, step)
+    return matrix
+
+
+def matrix_scale(matrix):
+    """Uniform scale factor of a matrix (used for stroke widths)"""
+    a, b, c, d, _, _ = matrix
+    return math.sqrt(abs(a * d - b * c))
+
+
+def _apply(matrix, x, y):
+    a, b, c, d, e, f = matrix
+    return a * x + c * y + e, b * x + d * y + f
+
+
+# --- Path normalization ---
+def _arc_to_cubics(x1, y1, rx, ry, rotation, large, sweep, x2, y2):
+    # Endpoint-parameterized arc to cubic Bezier segments (SVG spec, appendix F.6)
+    if (x1, y1) == (x2, y2):
+        return []
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0:
+        return [(x1, y1, x2, y2, x2, y2)]
+
+    phi = math.radians(rotation)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    x1p = cos_phi * dx + sin_phi * dy
+    y1p = -sin_phi * dx + cos_phi * dy
+
+    # Scale up radii that are too small to span the endpoints
+    lam = (x1p * x1p) / (rx * rx) + (y1p * y1p) / (ry * ry)
+    if lam > 1:
+        rx *= math.sqrt(lam)
+        ry *= math.sqrt(lam)
+
+    num = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+    den = rx * rx * y1p * y1p + ry * ry * x1p * x1p
+    coef = math.sqrt(max(0.0, num / den))
+    if large == sweep:
+        coef = -coef
+    cxp = coef * rx * y1p / ry
+    cyp = -coef * ry * x1p / rx
+    cx = cos_phi * cxp - sin_phi * cyp + (x1 + x2) / 2
+    cy = sin_phi * cxp + cos_phi * cyp + (y1 + y2) / 2
+
+    def angle(ux, uy, vx, vy):
+        return math.atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+
+    theta1 = angle(1, 0, (x1p - cxp) / rx, (y1p - cyp) / ry)
+    delta = angle((x1p - cxp) / rx, (y1p - cyp) / ry, (-x1p - cxp) / rx, (-y1p - cyp) / ry)
+    if not sweep and delta > 0:
+        delta -= 2 * math.pi
+    elif sweep and delta < 0:
+        delta += 2 * math.pi
+
+    count = max(1, math.ceil(abs(delta) / (math.pi / 2) - 1e-9))
+    step = delta / count
+    k = 4 / 3 * math.tan(step / 4)
+
+    def point(t):
+        cos_t, sin_t = math.cos(t), math.sin(t)
+        return (cx + rx * cos_phi * cos_t - ry * sin_phi * sin_t,
+                cy + rx * sin_phi * cos_t + ry * cos_phi * sin_t)
+
+    def derivative(t):
+        cos_t, sin_t = math.cos(t), math.sin(t)
+        return (-rx * cos_phi * sin_t - ry * sin_phi * cos_t,
+                -rx * sin_phi * sin_t + ry * cos_phi * cos_t)
+
+    cubics = []
+    t = theta1
+    for _ in range(count):
+        p0, p3 = point(t), point(t + step)
+        d0, d3 = derivative(t), derivative(t + step)
+        cubics.append((p0[0] + k * d0[0], p0[1] + k * d0[1],
+                       p3[0] - k * d3[0], p3[1] - k * d3[1],
+                       p3[0], p3[1]))
+        t += step
+    # Land exactly on the requested endpoint
+    last = cubics[-1]
+    cubics[-1] = (last[0], last[1], last[2], last[3], x2, y2)
+    return cubics
+
+
+def normalize_segments(segments):
+    """Rewrite absolute segments using only M, L, C, Q and Z (arcs become cubics)"""
+    result = []
+    cx = cy = sx = sy = 0.0
+    last_control = None  # (command, x, y) of the previous curve's second control point
+    for command, args in segments:
+        control = None
+        if command == "M":
+            result.append(("M", list(args)))
+            cx, cy = sx, sy = args
+        elif command == "L":
+            result.append(("L", list(args)))
+            cx, cy = args
+        elif command == "H":
+            result.append(("L", [args[0], cy]))
+            cx = args[0]
+        elif command == "V":
+            result.append(("L", [cx, args[0]]))
+            cy = args[0]
+        elif command == "C":
+            result.append(("C", list(args)))
+            control = ("C", args[2], args[3])
+            cx, cy = args[4], args[5]
+        elif command == "S":
+            if last_control and last_control[0] == "C":
+                x1, y1 = 2 * cx - last_control[1], 2 * cy - last_control[2]
+            else:
+                x1, y1 = cx, cy
+            result.append(("C", [x1, y1] + list(args)))
+            control = ("C", args[0], args[1])
+            cx, cy = args[2], args[3]
+        elif command == "Q":
+            result.append(("Q", list(args)))
+            control = ("Q", args[0], args[1])
+            cx, cy = args[2], args[3]
+        elif command == "T":
+            if last_control and last_control[0] == "Q":
+                x1, y1 = 2 * cx - last_control[1], 2 * cy - last_control[2]
+            else:
+                x1, y1 = cx, cy
+            result.append(("Q", [x1, y1] + list(args)))
+            control = ("Q", x1, y1)
+            cx, cy = args
+        elif command == "A":
+            for cubic in _arc_to_cubics(cx, cy, *args):
+                result.append(("C", list(cubic)))
+            cx, cy = args[5], args[6]
+        else:
+            result.append(("Z", []))
+            cx, cy = sx, sy
+        last_control = control
+    return result
+
+
+def transform_segments(segments, matrix):
+    """Apply matrix to absolute segments; identity leaves them untouched"""
+    if matrix == IDENTITY:
+        return segments
+    result = []
+    for command, args in normalize_segments(segments):
+        points = []
+        for i in range(0, len(args), 2):
+            points.extend(_apply(matrix, args[i], args[i + 1]))
+        result.append((command, points))
+    return result
+
+
+# --- Basic shapes ---
+def parse_length(value, reference=0.0, default=0.0):
+    """Parse an SVG length (plain, px or % of reference)"""
+    if value is None:
+        return default
+    value = value.strip()
+    if value.endswith("%"):
+        return float(value[:-1]) / 100 * reference
+    match = _NUMBER_RE.match(value)
+    return float(match.group()) if match else default
+
+
+def _ellipse_segments(cx, cy, rx, ry):
+    return [
+        ("M", [cx + rx, cy]),
+        ("A", [rx, ry, 0, 0, 1, cx, cy + ry]),
+        ("A", [rx, ry, 0, 0, 1, cx - rx, cy]),
+        ("A", [rx, ry, 0, 0, 1, cx, cy - ry]),
+        ("A", [rx, ry, 0, 0, 1, cx + rx, cy]),
+        ("Z", []),
+    ]
+
+
+def shape_segments(element, viewport=(0.0, 0.0)):
+    """Absolute path segments for a shape element in its own user space (empty if nothing renders)"""
+    tag = local_name(element.tag)
+    attrib = element.attrib
+    vw, vh = viewport
+    diagonal = math.sqrt((vw * vw + vh * vh) / 2)
+
+    if tag == "path":
+        d = attrib.get("d")
+        return to_absolute(parse_path_data(d)) if d else []
+
+    if tag == "rect":
+        x = parse_length(attrib.get("x"), vw)
+        y = parse_length(attrib.get("y"), vh)
+        w = parse_length(attrib.get("width"), vw)
+        h = parse_length(attrib.get("height"), vh)
+        if w <= 0 or h <= 0:
+            return []
+        rx_attr, ry_attr = attrib.get("rx"), attrib.get("ry")
+        rx = parse_length(rx_attr if rx_attr is not None else ry_attr, vw)
+        ry = parse_length(ry_attr if ry_attr is not None else rx_attr, vh)
+        rx, ry = min(rx, w / 2), min(ry, h / 2)
+        if rx <= 0 or ry <= 0:
+            return [("M", [x, y]), ("H", [x + w]), ("V", [y + h]), ("H", [x]), ("Z", [])]
+        return [
+            ("M", [x + rx, y]),
+            ("H", [x + w - rx]),
+            ("A", [rx, ry, 0, 0, 1, x + w, y + ry]),
+            ("V", [y + h - ry]),
+            ("A", [rx, ry, 0, 0, 1, x + w - rx, y + h]),
+            ("H", [x + rx]),
+            ("A", [rx, ry, 0, 0, 1, x, y + h - ry]),
+            ("V", [y + ry]),
+            ("A", [rx, ry, 0, 0, 1, x + rx, y]),
+            ("Z", []),
+        ]
+
+    if tag == "circle":
+        r = parse_length(attrib.get("r"), diagonal)
+        if r <= 0:
+            return []
+        return _ellipse_segments(parse_length(attrib.get("cx"), vw), parse_length(attrib.get("cy"), vh), r, r)
+
+    if tag == "ellipse":
+        rx = parse_length(attrib.get("rx"), vw)
+        ry = parse_length(attrib.get("ry"), vh)
+        if rx <= 0 or ry <= 0:
+            return []
+        return _ellipse_segments(parse_length(attrib.get("cx"), vw), parse_length(attrib.get("cy"), vh), rx, ry)
+
+    if tag == "line":
+        return [
+            ("M", [parse_length(attrib.get("x1"), vw), parse_length(attrib.get("y1"), vh)]),
+            ("L", [parse_length(attrib.get("x2"), vw), parse_length(attrib.get("y2"), vh)]),
+        ]
+
+    if tag in ("polyline", "polygon"):
+        numbers = [float(n) for n in _NUMBER_RE.findall(attrib.get("points", ""))]
+        if len(numbers) < 4:
+            return []
+        segments = [("M", numbers[0:2])]
+        segments.extend(("L", numbers[i:i + 2]) for i in range(2, len(numbers) - 1, 2))
+        if tag == "polygon":
+            segments.append(("Z", []))
+        return segments
+
+    return []
+
+
+# --- Styles ---
+def parse_style_declarations(text):
+    """'fill: red; stroke: none' -> {'fill': 'red', 'stroke': 'none'}"""
+    declarations = {}
+    for part in text.split(";"):
+        if ":" in part:
+            key, value = part.split(":", 1)
+            declarations[key.strip()] = value.strip()
+    return declarations
+
+
+def parse_css(text):
+    """Parse simple stylesheet rules into [(specificity, order, selector, declarations)]"""
+    rules = []
+    text = _CSS_COMMENT_RE.sub("", text)
+    for order, (selectors, body) in enumerate(_CSS_RULE_RE.findall(text)):
+        declarations = parse_style_declarations(body)
+        for selector in selectors.split(","):
+            selector = selector.strip()
+            # Only compound selectors on a single element are supported (tag, .class, #id)
+            if not selector or re.search(r"[\s>+~:\[]", selector):
+                continue
+            ids = selector.count("#")
+            classes = selector.count(".")
+            tag = 0 if selector[0] in ".#" else 1
+            rules.append(((ids, classes, tag), order, selector, declarations))
+    rules.sort(key=lambda rule: (rule[0], rule[1]))
+    return rules
+
+
+def _selector_matches(selector, tag, element_id, classes):
+    parts = re.findall(r"[.#]?[^.#]+", selector)
+    for part in parts:
+        if part.startswith("."):
+            if part[1:] not in classes:
+                return False
+        elif part.startswith("#"):
+            if part[1:] != element_id:
+                return False
+        elif part != "*" and part != tag:
+            return False
+    return True
+
+
+def element_declarations(element, css_rules):
+    """Cascade presentation attributes, stylesheet rules and inline style for one element"""
+    declared = {}
+    for name in STYLE_PROPERTIES:
+        if name in element.attrib:
+            declared[name] = element.attrib[name].strip()
+    if css_rules:
+        tag = local_name(element.tag)
+        classes = set(element.attrib.get("class", "").split())
+        element_id = element.attrib.get("id")
+        for _, _, selector, declarations in css_rules:
+            if _selector_matches(selector, tag, element_id, classes):
+                declared.update({k: v for k, v in declarations.items() if k in STYLE_PROPERTIES})
+    style = element.attrib.get("style")
+    if style:
+        declared.update({k: v for k, v in parse_style_declarations(style).items() if k in STYLE_PROPERTIES})
+    return declared
+
+
+def child_context(element, parent, css_rules):
+    """
+    Compute (matrix, style) for element given the parent's (matrix, style).
+
+    Returns None when the element (and its subtree) is hidden.
+    """
+    parent_matrix, parent_style = parent
+    declared = element_declarations(element, css_rules)
+    if declared.get("display") == "none":
+        return None
+
+    style = {k: v for k, v in parent_style.items() if k in INHERITED_PROPERTIES or k == "group-opacity"}
+    for name, value in declared.items():
+        if value == "inherit":
+            continue
+        style[name] = value
+
+    # Group/element opacity multiplies down the tree
+    if "opacity" in declared:
+        style["group-opacity"] = str(float(parent_style.get("group-opacity", "1")) * float(declared["opacity"]))
+    style.pop("opacity", None)
+
+    matrix = multiply(parent_matrix, parse_transform(element.attrib.get("transform")))
+    return matrix, style
+
+
+def gradient_fallback_color(gradient):
+    """Representative solid color for a gradient element: its stop nearest the middle"""
+    best = None
+    for stop in gradient:
+        if local_name(stop.tag) != "stop":
+            continue
+        declared = parse_style_declarations(stop.attrib.get("style", ""))
+        color = declared.get("stop-color", stop.attrib.get("stop-color"))
+        if color is None:
+            continue
+        offset = stop.attrib.get("offset", "0").strip()
+        offset = float(offset[:-1]) / 100 if offset.endswith("%") else float(offset)
+        opacity = declared.get("stop-opacity", stop.attrib.get("stop-opacity"))
+        distance = abs(offset - 0.5)
+        if best is None or distance < best[0]:
+            best = (distance, color, opacity)
+    if best is None:
+        return None
+    return best[1], best[2]
+
+
+def resolve_paint(style, gradients):
+    """Replace url(#gradient) fill/stroke paints with their fallback solid color"""
+    for paint in ("fill", "stroke"):
+        value = style.get(paint)
+        if not value:
+            continue
+        match = _URL_RE.match(value)
+        if not match:
+            continue
+        fallback = gradients.get(match.group(1))
+        if fallback is None:
+            style[paint] = "none"
+            continue
+        color, stop_opacity = fallback
+        style[paint] = color
+        if stop_opacity is not None:
+            opacity = float(style.get(f"{paint}-opacity", "1")) * float(stop_opacity)
+            style[f"{paint}-opacity"] = str(opacity)
+    return style
+
+
+def encloses_area(segments):
+    """False when every subpath is a single straight segment (nothing to fill, e.g. <line>)"""
+    points = 0
+    for command, _ in segments:
+        if command == "M":
+            points = 1
+        elif command in ("L", "H", "V") and points < 2:
+            points += 1
+        else:
+            return True
+    return False
+
+
+def finalize_style(style, matrix, gradients, fillable=True):
+    """
+    Resolve paints, fold group opacity into fill/stroke opacity and scale stroke width.
+
+    SVG strokes default to a width of 1 while Vector Drawables default to 0, so a
+    stroked shape always gets an explicit stroke-width. Stroked shapes with no
+    area (fillable=False) and no fill of their own get fill "none" rather than
+    the default black.
+    """
+    style = resolve_paint(dict(style), gradients)
+    group_opacity = float(style.pop("group-opacity", "1"))
+    if group_opacity != 1:
+        for paint in ("fill", "stroke"):
+            key = f"{paint}-opacity"
+            style[key] = str(float(style.get(key, "1")) * group_opacity)
+    if style.get("stroke", "none") != "none":
+        style.setdefault("stroke-width", "1")
+        if not fillable and "fill" not in style:
+            style["fill"] = "none"
+    if "stroke-width" in style and matrix != IDENTITY:
+        style["stroke-width"] = f"{parse_length(style['stroke-width']) * matrix_scale(matrix):g}"
+    return style
+
+
+# --- Document walk ---
+def _href(element):
+    for key, value in element.attrib.items():
+        if local_name(key) == "href" and value.startswith("#"):
+            return value[1:]
+    return None
+
+
+def collect_defs(root):
+    """Index elements by id and collect gradient fallbacks and stylesheet rules"""
+    by_id = {}
+    gradients = {}
+    css_text = []
+    for element in root.iter():
+        tag = local_name(element.tag)
+        element_id = element.attrib.get("id")
+        if element_id:
+            by_id[element_id] = element
+        if tag == "style" and element.text:
+            css_text.append(element.text)
+    for element_id, element in by_id.items():
+        if local_name(element.tag) in ("linearGradient", "radialGradient"):
+            # Gradients may inherit their stops from another gradient via href
+            source = element
+            seen = set()
+            while not any(local_name(child.tag) == "stop" for child in source) and _href(source) in by_id:
+                if _href(source) in seen:
+                    break
+                seen.add(_href(source))
+                source = by_id[_href(source)]
+            gradients[element_id] = gradient_fallback_color(source)
+    return by_id, gradients, parse_css("\n".join(css_text))
+
+
+def viewport_size(root):
+    """(width, height) of the root viewport in user units"""
+    view_box = root.attrib.get("viewBox")
+    if view_box:
+        parts = [float(p) for p in view_box.replace(",", " ").split() if p]
+        if len(parts) == 4:
+            return parts[2], parts[3]
+    return parse_length(root.attrib.get("width"), default=0.0), parse_length(root.attrib.get("height"), default=0.0)
+
+
+def _root_context(root, css_rules):
+    # Context for the root <svg>, offset by the viewBox origin
+    context = child_context(root, (IDENTITY, {}), css_rules)
+    if context is None:
+        return None
+    view_box = root.attrib.get("viewBox")
+    if view_box:
+        parts = [float(p) for p in view_box.replace(",", " ").split() if p]
+        if len(parts) == 4 and (parts[0] or parts[1]):
+            context = (multiply((1.0, 0.0, 0.0, 1.0, -parts[0], -parts[1]), context[0]), context[1])
+    return context
+
+
+def _is_rendered_tag(tag):
+    return tag not in SKIPPED_TAGS and (tag in SHAPE_TAGS or tag in CONTAINER_TAGS or tag == "use")
+
+
+def _walk(items, by_id, gradients, css_rules, viewport):
+    # Depth-first render of (element, parent context, use chain) items in document order
+    stack = list(reversed(items))
+    while stack:
+        element, parent, use_chain = stack.pop()
+        tag = local_name(element.tag)
+        if not _is_rendered_tag(tag):
+            continue
+        context = child_context(element, parent, css_rules)
+        if context is None:
+            continue
+        matrix, style = context
+
+        if tag in CONTAINER_TAGS:
+            stack.extend((child, context, use_chain) for child in reversed(list(element)))
+        elif tag == "use":
+            target_id = _href(element)
+            target = by_id.get(target_id)
+            # Guard against self-referencing <use> cycles
+            if target is None or target_id in use_chain:
+                continue
+            offset = (1.0, 0.0, 0.0, 1.0, parse_length(element.attrib.get("x")), parse_length(element.attrib.get("y")))
+            use_context = (multiply(matrix, offset), style)
+            if local_name(target.tag) == "symbol":
+                stack.extend((child, use_context, use_chain + (target_id,)) for child in reversed(list(target)))
+            else:
+                stack.append((target, use_context, use_chain + (target_id,)))
+        else:
+            if style.get("visibility") in ("hidden", "collapse"):
+                continue
+            segments = shape_segments(element, viewport)
+            if segments:
+                yield transform_segments(segments, matrix), finalize_style(style, matrix, gradients, encloses_area(segments))
+
+
+def flatten_svg(root):
+    """Yield (segments, style) for every rendered shape of the document rooted at root"""
+    by_id, gradients, css_rules = collect_defs(root)
+    root_context = _root_context(root, css_rules)
+    if root_context is None:
+        return
+    yield from _walk([(child, root_context, ()) for child in root], by_id, gradients, css_rules, viewport_size(root))
+
+
+# --- Streaming ---
+def _detach(stack, element):
+    # Drop a finished element from its parent so processed nodes can be freed.
+    # iterparse builds ahead of the events it reports, so the element is not
+    # necessarily the last child; siblings are removed as they finish, which
+    # keeps the parent's child list (and this scan) short.
+    if stack:
+        stack[-1][0].remove(element)
+
+
+def _scan_references(source):
+    """
+    First streaming pass over source.
+
+    Collects stylesheet text, gradient fallbacks and the ids referenced by
+    <use>. Everything except gradients and <style> is cleared as soon as it ends.
+    """
+    css_text = []
+    gradients = {}
+    gradient_hrefs = {}
+    referenced = set()
+    stack = []  # (element, keep subtree intact)
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        tag = local_name(element.tag)
+        if event == "start":
+            if tag == "use" and _href(element):
+                referenced.add(_href(element))
+            keep = (stack and stack[-1][1]) or tag in ("linearGradient", "radialGradient", "style")
+            stack.append((element, bool(keep)))
+            continue
+
+        _, keep = stack.pop()
+        element_id = element.attrib.get("id")
+        if tag == "style" and element.text:
+            css_text.append(element.text)
+        if tag in ("linearGradient", "radialGradient") and element_id:
+            gradients[element_id] = gradient_fallback_color(element)
+            gradient_hrefs[element_id] = _href(element)
+        if not keep:
+            element.clear()
+        if not (stack and stack[-1][1]):
+            _detach(stack, element)
+
+    # Gradients without their own stops inherit them through href chains
+    for element_id in gradients:
+        seen = {element_id}
+        current = element_id
+        while gradients[element_id] is None and gradient_hrefs.get(current) in gradients:
+            current = gradient_hrefs[current]
+            if current in seen:
+                break
+            seen.add(current)
+            gradients[element_id] = gradients[current]
+    return parse_css("\n".join(css_text)), gradients, referenced
+
+
+def _capture_forward_targets(source, referenced):
+    """
+    Second streaming pass, only needed when the document has <use> elements.
+
+    Returns {id: element} for targets that appear after a <use> pointing at
+    them, kept whole so the render pass can instantiate them on the spot.
+    Only referenced ids are tracked, so memory does not grow with id count.
+    """
+    seen = set()
+    forward_ids = set()
+    forward = {}
+    stack = []  # (element, keep subtree intact)
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            element_id = element.attrib.get("id")
+            target_id = _href(element) if local_name(element.tag) == "use" else None
+            if target_id and target_id not in seen:
+                forward_ids.add(target_id)
+            if element_id in referenced:
+                seen.add(element_id)
+            keep = (stack and stack[-1][1]) or element_id in forward_ids
+            stack.append((element, bool(keep)))
+            continue
+
+        _, keep = stack.pop()
+        element_id = element.attrib.get("id")
+        if element_id in forward_ids:
+            forward[element_id] = element
+        elif not keep:
+            element.clear()
+        if not (stack and stack[-1][1]):
+            _detach(stack, element)
+    return forward
+
+
+def read_root(source):
+    """Return the root <svg> element with its attributes only (children are not parsed)"""
+    for _, element in ET.iterparse(source, events=("start",)):
+        return element
+    raise ValueError(f"No root element in {source}")
+
+
+def iter_flattened_shapes(source):
+    """
+    Streaming equivalent of flatten_svg for an SVG file path.
+
+    Uses iterparse passes: the first collects CSS, gradients and <use>
+    targets (plus a second one capturing forward-referenced targets when
+    there are any); the last renders shapes as their start tags arrive and
+    clears every finished element that no <use> refers to, so memory stays
+    bounded by the referenced content rather than the document size.
+    """
+    css_rules, gradients, referenced = _scan_references(source)
+    by_id = _capture_forward_targets(source, referenced) if referenced else {}
+    viewport = None
+    stack = []  # (element, context for children or None, inside a retained subtree)
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            tag = local_name(element.tag)
+            if not stack:
+                viewport = viewport_size(element)
+                stack.append((element, _root_context(element, css_rules), False))
+                continue
+
+            _, parent_context, parent_kept = stack[-1]
+            element_id = element.attrib.get("id")
+            kept = parent_kept or (element_id in referenced and element_id not in by_id)
+            child_ctx = None
+            if parent_context is not None and _is_rendered_tag(tag):
+                if tag in CONTAINER_TAGS:
+                    child_ctx = child_context(element, parent_context, css_rules)
+                else:
+                    # Shapes and <use> are complete at their start tag (geometry lives in attributes)
+                    yield from _walk([(element, parent_context, ())], by_id, gradients, css_rules, viewport)
+            stack.append((element, child_ctx, kept))
+            continue
+
+        _, _, kept = stack.pop()
+        element_id = element.attrib.get("id")
+        if element_id in referenced and element_id not in by_id:
+            by_id[element_id] = element
+        elif not kept:
+            element.clear()
+        if not (stack and stack[-1][2]):
+            _detach(stack, element)
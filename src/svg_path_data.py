@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+SVG path data helpers shared by the Vector Drawable converters.
+
+Path data is handled as a list of absolute segments: (command, [args]) with
+uppercase commands M, L, H, V, C, S, Q, T, A and Z. format_path_data() turns
+that back into the shortest string it can find per segment (absolute or
+relative, reduced precision, no redundant separators or command letters).
+"""
+
+import re
+
+# Number of arguments consumed by one repetition of each command
+ARG_COUNTS = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_FLAG_RE = re.compile(r"[01]")
+_SEPARATOR_RE = re.compile(r"[\s,]*")
+_LAST_NUMBER_RE = re.compile(r"(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$")
+
+
+def parse_path_data(d):
+    """Parse a path d string into [(command, [args]), ...] as written (mixed case)"""
+    segments = []
+    pos = 0
+    length = len(d)
+    command = None
+    while True:
+        pos = _SEPARATOR_RE.match(d, pos).end()
+        if pos >= length:
+            break
+        char = d[pos]
+        if char.upper() in ARG_COUNTS:
+            command = char
+            pos += 1
+            if command.upper() == "Z":
+                segments.append((command, []))
+                continue
+        elif command is None or command.upper() == "Z":
+            raise ValueError(f"Unexpected path data at {pos}: {d[pos:pos + 20]!r}")
+
+        count = ARG_COUNTS[command.upper()]
+        args = []
+        for index in range(count):
+            pos = _SEPARATOR_RE.match(d, pos).end()
+            # Arc flags may be written without separators ("a1 1 0 00 1 1")
+            pattern = _FLAG_RE if command.upper() == "A" and index in (3, 4) else _NUMBER_RE
+            match = pattern.match(d, pos)
+            if match is None:
+                raise ValueError(f"Malformed arguments for '{command}' at {pos}: {d[pos:pos + 20]!r}")
+            args.append(float(match.group()))
+            pos = match.end()
+        segments.append((command, args))
+
+        # Extra coordinate pairs after a moveto are implicit linetos
+        if command == "M":
+            command = "L"
+        elif command == "m":
+            command = "l"
+    return segments
+
+
+def to_absolute(segments):
+    """Convert parsed segments to absolute uppercase commands"""
+    result = []
+    cx = cy = 0.0
+    sx = sy = 0.0
+    for command, args in segments:
+        upper = command.upper()
+        relative = command != upper
+        if upper == "Z":
+            result.append(("Z", []))
+            cx, cy = sx, sy
+            continue
+        if upper == "H":
+            x = args[0] + (cx if relative else 0)
+            result.append(("H", [x]))
+            cx = x
+            continue
+        if upper == "V":
+            y = args[0] + (cy if relative else 0)
+            result.append(("V", [y]))
+            cy = y
+            continue
+        if upper == "A":
+            x = args[5] + (cx if relative else 0)
+            y = args[6] + (cy if relative else 0)
+            result.append(("A", args[:5] + [x, y]))
+            cx, cy = x, y
+            continue
+
+        absolute = []
+        for i in range(0, len(args), 2):
+            absolute.append(args[i] + (cx if relative else 0))
+            absolute.append(args[i + 1] + (cy if relative else 0))
+        result.append((upper, absolute))
+        cx, cy = absolute[-2], absolute[-1]
+        if upper == "M":
+            sx, sy = cx, cy
+    return result
+
+
+def format_number(value, precision):
+    """Shortest decimal form of value rounded to precision places"""
+    text = f"{round(value, precision):.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    if text in ("-0", ""):
+        text = "0"
+    if text.startswith("0."):
+        text = text[1:]
+    elif text.startswith("-0."):
+        text = "-" + text[2:]
+    return text
+
+
+def _needs_space(previous, text):
+    # A separator is needed unless the parser can split previous|text unambiguously
+    if not previous or not previous[-1].isdigit() and previous[-1] != ".":
+        return False
+    if text.startswith("-"):
+        return False
+    if text.startswith("."):
+        last = _LAST_NUMBER_RE.search(previous).group()
+        return "." not in last or "e" in last.lower()
+    return True
+
+
+def _join_numbers(numbers):
+    # Concatenate numbers, dropping separators where the parser can still split them
+    out = ""
+    for text in numbers:
+        if _needs_space(out, text):
+            out += " "
+        out += text
+    return out
+
+
+def _rounded(value, precision):
+    return float(format_number(value, precision))
+
+
+def _emit(command, args, cx, cy, relative, precision):
+    # Return (text args, new emitted current point) for one segment
+    upper = command
+    if upper == "H":
+        target = args[0] - cx if relative else args[0]
+        value = _rounded(target, precision)
+        return [format_number(value, precision)], ((cx + value) if relative else value, cy)
+    if upper == "V":
+        target = args[0] - cy if relative else args[0]
+        value = _rounded(target, precision)
+        return [format_number(value, precision)], (cx, (cy + value) if relative else value)
+    if upper == "A":
+        rx, ry, rotation, large, sweep, x, y = args
+        dx = _rounded(x - cx if relative else x, precision)
+        dy = _rounded(y - cy if relative else y, precision)
+        texts = [format_number(rx, precision), format_number(ry, precision), format_number(rotation, precision),
+                 str(int(large)), str(int(sweep)), format_number(dx, precision), format_number(dy, precision)]
+        return texts, ((cx + dx, cy + dy) if relative else (dx, dy))
+
+    texts = []
+    last = (cx, cy)
+    for i in range(0, len(args), 2):
+        x = _rounded(args[i] - cx if relative else args[i], precision)
+        y = _rounded(args[i + 1] - cy if relative else args[i + 1], precision)
+        texts.append(format_number(x, precision))
+        texts.append(format_number(y, precision))
+        last = (cx + x, cy + y) if relative else (x, y)
+    return texts, last
+
+
+def format_path_data(segments, precision=3):
+    """Serialize absolute segments, choosing the shorter of absolute/relative per segment"""
+    parts = []
+    previous_letter = None
+    cx = cy = 0.0
+    sx = sy = 0.0
+    for index, (command, args) in enumerate(segments):
+        if command == "Z":
+            parts.append("z")
+            previous_letter = "z"
+            cx, cy = sx, sy
+            continue
+
+        abs_texts, abs_point = _emit(command, args, cx, cy, False, precision)
+        options = [(command, abs_texts, abs_point)]
+        # The first moveto must stay absolute so paths can be concatenated safely
+        if index > 0:
+            rel_texts, rel_point = _emit(command, args, cx, cy, True, precision)
+            options.append((command.lower(), rel_texts, rel_point))
+
+        best = None
+        for letter, texts, point in options:
+            # After a moveto, repeated pairs are implicit linetos, so never elide M/m
+            implicit = previous_letter == letter and letter not in "Mm"
+            body = _join_numbers(texts)
+            if implicit:
+                text = (" " + body) if _needs_space(parts[-1], body) else body
+            else:
+                text = letter + body
+            if best is None or len(text) < len(best[1]):
+                best = (letter, text, point)
+
+        letter, text, point = best
+        parts.append(text)
+        previous_letter = letter
+        cx, cy = point
+        if command == "M":
+            sx, sy = cx, cy
+    return "".join(parts)
+
+
+def optimize_path_data(d, precision=3):
+    """Parse d and re-serialize it in its most compact form"""
+    return format_path_data(to_absolute(parse_path_data(d)), precision)
+
+
+def path_bounds(segments):
+    """Conservative (min_x, min_y, max_x, max_y) of absolute segments, control points included"""
+    xs, ys = [], []
+    cx = cy = 0.0
+    for command, args in segments:
+        if command == "Z":
+            continue
+        if command == "H":
+            cx = args[0]
+        elif command == "V":
+            cy = args[0]
+        elif command == "A":
+            rx, ry, _, _, _, x, y = args
+            # Every point of the arc lies within one ellipse diameter (or the chord) of its endpoints
+            reach = max(2 * max(abs(rx), abs(ry)), abs(x - cx) + abs(y - cy))
+            xs.extend([cx - reach, cx + reach])
+            ys.extend([cy - reach, cy + reach])
+            cx, cy = x, y
+        else:
+            xs.extend(args[0::2])
+            ys.extend(args[1::2])
+            cx, cy = args[-2], args[-1]
+        xs.append(cx)
+        ys.append(cy)
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def bounds_overlap(a, b):
+    """True if two bounds tuples intersect (touching counts as overlapping)"""
+    return not (a[2] < b[0] or b[2] < a[0] or a[3] < b[1] or b[3] < a[1])
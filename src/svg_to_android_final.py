@@ -8,20 +8,50 @@ located in the HelloGoodbye/app/src/main/res/drawable directory.
 
 It handles paths, colors, and scaling to ensure the icon is correctly
 formatted for Android, using a <group> for safe area scaling.
+
+With --batch it converts every SVG under the given files/directories
+(default: SVGs/, the flag set and the cup icons) on a process pool.
+Groups, transforms, <use>, basic shapes and CSS classes are flattened into
+plain paths (see svg_flatten). Files up to STREAM_THRESHOLD_BYTES are parsed
+into a tree in one pass, which is fastest for the usual icon-sized inputs;
+larger ones are read with iterparse (2-3 passes, so slower per byte) and the
+XML is written as paths arrive, so their memory stays bounded by the
+referenced content instead of the document size. Path data is re-serialized
+compactly (reduced precision, relative commands) and adjacent, non-overlapping
+fill-only paths with identical paint are merged into one <path>.
 """
 
 import xml.etree.ElementTree as ET
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from xml.sax.saxutils import quoteattr
+
+from svg_flatten import flatten_svg, iter_flattened_shapes, parse_length, read_root
+from svg_path_data import bounds_overlap, format_path_data, path_bounds
 
 # --- Hardcoded Paths and Constants ---
-APP_ROOT = Path(__file__).resolve().parent
+APP_ROOT = Path(__file__).resolve().parent.parent
 SVG_INPUT_PATH = APP_ROOT / "app_icon/app_icon.svg"
 DRAWABLE_OUTPUT_DIR = APP_ROOT / "HelloGoodbye/app/src/main/res/drawable"
 DRAWABLE_NAME = "ic_launcher_foreground" # This will be ic_launcher_foreground.xml
 ANDROID_ICON_SIZE_DP = 108
 SAFE_AREA_SCALE = 0.65 # Scale factor for artwork content to fit within adaptive icon's safe zone
+PATH_PRECISION = 3 # Decimal places kept in optimized pathData
+# SVGs larger than this are streamed (bounded memory) instead of parsed into a tree (faster)
+STREAM_THRESHOLD_BYTES = 1 << 20
+
+# Default inputs for --batch
+ASSETS_DIR = APP_ROOT / "HelloGoodbye/app/src/main/assets"
+BATCH_INPUTS = [
+    APP_ROOT / "SVGs",
+    ASSETS_DIR / "flags/4x3",
+    ASSETS_DIR / "cup_bronze.svg",
+    ASSETS_DIR / "cup_silver.svg",
+    ASSETS_DIR / "cup_gold.svg",
+    ASSETS_DIR / "cup_platinum.svg",
+]
 
 # Android XML Namespace
 ANDROID_NS = "http://schemas.android.com/apk/res/android"
@@ -111,112 +141,232 @@ def get_svg_viewport(root_element):
     except ValueError:
         return float(ANDROID_ICON_SIZE_DP), float(ANDROID_ICON_SIZE_DP)
 
-def convert_svg_to_vector_drawable():
+def build_path_attribs(style):
+    """Android <path> paint attributes (everything but pathData) for a resolved SVG style"""
+    fill_value = style.get("fill", "#000000")
+    fill_opacity = style.get("fill-opacity")
+    stroke_value = style.get("stroke")
+    stroke_opacity = style.get("stroke-opacity")
+    stroke_width = style.get("stroke-width")
+    stroke_linecap = style.get("stroke-linecap")
+    stroke_linejoin = style.get("stroke-linejoin")
+
+    path_attribs = {}
+
+    # Normalize and apply fill color
+    final_fill_color = normalize_color(fill_value, fill_opacity)
+    if final_fill_color:
+        path_attribs[f"{{{ANDROID_NS}}}fillColor"] = final_fill_color
+    if style.get("fill-rule") == "evenodd":
+        path_attribs[f"{{{ANDROID_NS}}}fillType"] = "evenOdd"
+
+    # Normalize and apply stroke color
+    final_stroke_color = normalize_color(stroke_value, stroke_opacity)
+    if final_stroke_color:
+        path_attribs[f"{{{ANDROID_NS}}}strokeColor"] = final_stroke_color
+
+    # Apply stroke width (this will be scaled by the group transformation)
+    if stroke_width and parse_length(stroke_width) > 0:
+        path_attribs[f"{{{ANDROID_NS}}}strokeWidth"] = f"{parse_length(stroke_width):g}"
+
+    # Apply line cap/join
+    if stroke_linecap:
+        path_attribs[f"{{{ANDROID_NS}}}strokeLineCap"] = stroke_linecap
+    if stroke_linejoin:
+        path_attribs[f"{{{ANDROID_NS}}}strokeLineJoin"] = stroke_linejoin
+
+    return path_attribs
+
+
+def merge_paths(shapes, precision=PATH_PRECISION, merge=True):
     """
-    Converts the hardcoded SVG_INPUT_PATH to an Android Vector Drawable
-    at the hardcoded DRAWABLE_OUTPUT_DIR/DRAWABLE_NAME.xml.
+    Serialize (segments, paint attribs) pairs and merge runs of adjacent paths that share paint.
+
+    Only fill-only paths whose bounds do not overlap anything already in the
+    run are merged, so winding/fill-rule interactions cannot change the result.
+    Yields each finished path's attributes, holding at most one path back.
     """
-    try:
-        if not SVG_INPUT_PATH.exists():
-            print(f"❌ Error: Input SVG not found at {SVG_INPUT_PATH}", file=sys.stderr)
-            sys.exit(1)
+    path_key = f"{{{ANDROID_NS}}}pathData"
+    stroke_key = f"{{{ANDROID_NS}}}strokeColor"
+    previous = None
+    run_bounds = []
+    for segments, paint in shapes:
+        bounds = path_bounds(segments)
+        path_data = format_path_data(segments, precision)
 
-        tree = ET.parse(SVG_INPUT_PATH)
-        root = tree.getroot()
+        can_merge = (
+            merge
+            and previous is not None
+            and bounds is not None
+            and stroke_key not in paint
+            and paint == {k: v for k, v in previous.items() if k != path_key}
+            and not any(bounds_overlap(bounds, b) for b in run_bounds)
+        )
+        if can_merge:
+            # Each serialized path starts with an absolute moveto, so plain concatenation is safe
+            previous[path_key] += path_data
+            run_bounds.append(bounds)
+        else:
+            if previous is not None:
+                yield previous
+            previous = {path_key: path_data, **paint}
+            run_bounds = [bounds] if bounds is not None else []
+    if previous is not None:
+        yield previous
 
-        # Get original SVG viewport dimensions
-        viewport_width, viewport_height = get_svg_viewport(root)
-        print(f"SVG Viewport: {viewport_width}x{viewport_height}")
 
-        # Create the root <vector> element
-        vector_attribs = {
-            f"{{{ANDROID_NS}}}width": f"{ANDROID_ICON_SIZE_DP}dp",
-            f"{{{ANDROID_NS}}}height": f"{ANDROID_ICON_SIZE_DP}dp",
-            f"{{{ANDROID_NS}}}viewportWidth": str(viewport_width),
-            f"{{{ANDROID_NS}}}viewportHeight": str(viewport_height),
-        }
-        vector_element = ET.Element("vector", vector_attribs)
+def _start_tag(tag, attribs, close=False):
+    # Serialize a tag with android:-prefixed attributes (output is written incrementally)
+    parts = [tag]
+    for key, value in attribs.items():
+        parts.append(f"{key.replace(f'{{{ANDROID_NS}}}', 'android:')}={quoteattr(str(value))}")
+    return "<" + " ".join(parts) + (" />" if close else ">")
+
+
+def svg_file_to_vector_drawable(svg_path, output_path, size_dp=ANDROID_ICON_SIZE_DP,
+                                safe_area_scale=SAFE_AREA_SCALE, optimize=True, precision=PATH_PRECISION):
+    """
+    Convert one SVG file into an Android Vector Drawable XML file.
+
+    The drawable is size_dp wide and keeps the SVG aspect ratio. A safe_area_scale
+    other than 1 wraps the paths in a centered, scaled <group> (launcher icons).
+    Returns the number of <path> elements written.
+    """
+    # Small files: one ET.parse pass. Large files: only the root start tag up front,
+    # shapes are streamed afterwards
+    streaming = Path(svg_path).stat().st_size > STREAM_THRESHOLD_BYTES
+    root = read_root(svg_path) if streaming else ET.parse(svg_path).getroot()
+
+    # Get original SVG viewport dimensions
+    viewport_width, viewport_height = get_svg_viewport(root)
 
+    # Attributes of the root <vector> element
+    vector_attribs = {
+        "xmlns:android": ANDROID_NS,
+        f"{{{ANDROID_NS}}}width": f"{size_dp}dp",
+        f"{{{ANDROID_NS}}}height": f"{round(size_dp * viewport_height / viewport_width, 2):g}dp",
+        f"{{{ANDROID_NS}}}viewportWidth": str(viewport_width),
+        f"{{{ANDROID_NS}}}viewportHeight": str(viewport_height),
+    }
+
+    group_attribs = None
+    if safe_area_scale != 1:
         # --- Create a <group> for scaling and translation ---
         # Calculate translation to center the scaled artwork
-        translate_x = (viewport_width - (viewport_width * SAFE_AREA_SCALE)) / 2
-        translate_y = (viewport_height - (viewport_height * SAFE_AREA_SCALE)) / 2
+        translate_x = (viewport_width - (viewport_width * safe_area_scale)) / 2
+        translate_y = (viewport_height - (viewport_height * safe_area_scale)) / 2
 
         group_attribs = {
-            f"{{{ANDROID_NS}}}scaleX": str(SAFE_AREA_SCALE),
-            f"{{{ANDROID_NS}}}scaleY": str(SAFE_AREA_SCALE),
+            f"{{{ANDROID_NS}}}scaleX": str(safe_area_scale),
+            f"{{{ANDROID_NS}}}scaleY": str(safe_area_scale),
             f"{{{ANDROID_NS}}}translateX": str(translate_x),
             f"{{{ANDROID_NS}}}translateY": str(translate_y),
         }
-        group_element = ET.Element("group", group_attribs)
-
-        # Iterate through all elements to find paths and append to the <group>
-        for element in root.iter():
-            if "path" in element.tag.lower(): # Handles elements like {http://www.w3.org/2000/svg}path
-                path_data = element.attrib.get("d")
-                if not path_data:
-                    continue
-
-                # Get attributes from element directly or from style attribute
-                style_attrs = {}
-                style_string = element.attrib.get("style")
-                if style_string:
-                    for part in style_string.split(';'):
-                        if ':' in part:
-                            key, value = part.split(':', 1)
-                            style_attrs[key.strip()] = value.strip()
-
-                fill_value = element.attrib.get("fill", style_attrs.get("fill", "#000000"))
-                fill_opacity = element.attrib.get("fill-opacity", style_attrs.get("fill-opacity"))
-                stroke_value = element.attrib.get("stroke", style_attrs.get("stroke"))
-                stroke_opacity = element.attrib.get("stroke-opacity", style_attrs.get("stroke-opacity"))
-                stroke_width = element.attrib.get("stroke-width", style_attrs.get("stroke-width"))
-                stroke_linecap = element.attrib.get("stroke-linecap", style_attrs.get("stroke-linecap"))
-                stroke_linejoin = element.attrib.get("stroke-linejoin", style_attrs.get("stroke-linejoin"))
-                
-                path_attribs = {f"{{{ANDROID_NS}}}pathData": path_data}
-
-                # Normalize and apply fill color
-                final_fill_color = normalize_color(fill_value, fill_opacity)
-                if final_fill_color:
-                    path_attribs[f"{{{ANDROID_NS}}}fillColor"] = final_fill_color
-                
-                # Normalize and apply stroke color
-                final_stroke_color = normalize_color(stroke_value, stroke_opacity)
-                if final_stroke_color:
-                    path_attribs[f"{{{ANDROID_NS}}}strokeColor"] = final_stroke_color
-                
-                # Apply stroke width (this will be scaled by the group transformation)
-                if stroke_width and float(stroke_width) > 0:
-                    path_attribs[f"{{{ANDROID_NS}}}strokeWidth"] = stroke_width
-                
-                # Apply line cap/join
-                if stroke_linecap:
-                    path_attribs[f"{{{ANDROID_NS}}}strokeLineCap"] = stroke_linecap
-                if stroke_linejoin:
-                    path_attribs[f"{{{ANDROID_NS}}}strokeLineJoin"] = stroke_linejoin
-
-                path_element = ET.Element("path", path_attribs)
-                group_element.append(path_element) # Append to group instead of vector_element
-        
-        vector_element.append(group_element) # Add the group to the vector element
-
-        # Ensure the output directory exists
-        DRAWABLE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        output_filepath = DRAWABLE_OUTPUT_DIR / f"{DRAWABLE_NAME}.xml"
 
-        # Write the final XML file
-        xml_string = ET.tostring(vector_element, encoding='utf-8').decode('utf-8')
-        with open(output_filepath, "w", encoding="utf-8") as f:
-            f.write('<?xml version="1.0" encoding="utf-8"?>\n')
-            f.write(xml_string)
+    # Ensure the output directory exists
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Flatten groups, transforms, <use> and basic shapes into root-space paths
+    flattened = iter_flattened_shapes(svg_path) if streaming else flatten_svg(root)
+    shapes = ((segments, build_path_attribs(style)) for segments, style in flattened)
+
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        f.write(_start_tag("vector", vector_attribs))
+        if group_attribs:
+            f.write(_start_tag("group", group_attribs))
+        for path_attribs in merge_paths(shapes, precision, merge=optimize):
+            f.write(_start_tag("path", path_attribs, close=True))
+            count += 1
+        if group_attribs:
+            f.write("</group>")
+        f.write("</vector>")
+    return count
+
+
+def drawable_name(svg_path, prefix=""):
+    """Android resource name for an SVG file: lowercase letters, digits and underscores"""
+    name = re.sub(r"[^a-z0-9_]", "_", f"{prefix}{Path(svg_path).stem}".lower())
+    if not name[0].isalpha():
+        name = f"ic_{name}"
+    return name
+
+
+def _convert_job(job):
+    svg_path, output_path, size_dp, optimize, precision = job
+    count = svg_file_to_vector_drawable(svg_path, output_path, size_dp=size_dp, safe_area_scale=1,
+                                        optimize=optimize, precision=precision)
+    return svg_path, output_path, count
+
+
+def batch_convert(inputs, output_dir, prefix="", size_dp=24, optimize=True, precision=PATH_PRECISION, max_workers=None):
+    """Convert every SVG under inputs (files or directories) on a process pool"""
+    svgs = []
+    for item in inputs:
+        item = Path(item)
+        svgs.extend([item] if item.is_file() else sorted(item.rglob("*.svg")))
+
+    jobs = []
+    seen = {}
+    for svg in svgs:
+        name = drawable_name(svg, prefix)
+        if name in seen:
+            raise ValueError(f"Drawable name clash: {seen[name]} and {svg} both map to {name}")
+        seen[name] = svg
+        jobs.append((str(svg), str(Path(output_dir) / f"{name}.xml"), size_dp, optimize, precision))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_convert_job, jobs))
+
+
+def convert_svg_to_vector_drawable():
+    """
+    Converts the hardcoded SVG_INPUT_PATH to an Android Vector Drawable
+    at the hardcoded DRAWABLE_OUTPUT_DIR/DRAWABLE_NAME.xml.
+    """
+    try:
+        if not SVG_INPUT_PATH.exists():
+            print(f"❌ Error: Input SVG not found at {SVG_INPUT_PATH}", file=sys.stderr)
+            sys.exit(1)
+
+        output_filepath = DRAWABLE_OUTPUT_DIR / f"{DRAWABLE_NAME}.xml"
+        count = svg_file_to_vector_drawable(SVG_INPUT_PATH, output_filepath)
 
         print(f"✅ Successfully created Vector Drawable: {output_filepath.relative_to(APP_ROOT)}")
-        print(f"Found {len(group_element)} path elements within the group.")
+        print(f"Found {count} path elements within the group.")
 
     except Exception as e:
         print(f"❌ An error occurred during conversion: {e}", file=sys.stderr)
         sys.exit(1)
 
+
+def main():
+    # CLI: svg_to_android_final.py [--batch [INPUT ...]] [--out DIR] [--prefix P] [--size-dp 24] [--precision 3] [--no-optimize] [--workers N]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--batch", dest="batch", nargs="*", default=None, help="SVG files/directories to convert (default: SVGs/, flags, cups)")
+    parser.add_argument("--out", dest="out_dir", default=str(DRAWABLE_OUTPUT_DIR), help="Output directory for drawable XML files")
+    parser.add_argument("--prefix", dest="prefix", default="", help="Prefix for generated drawable names")
+    parser.add_argument("--size-dp", dest="size_dp", type=int, default=24, help="Drawable width in dp for batch output")
+    parser.add_argument("--precision", dest="precision", type=int, default=PATH_PRECISION, help="Decimal places kept in pathData")
+    parser.add_argument("--no-optimize", dest="optimize", action="store_false", help="Do not merge adjacent paths with identical paint")
+    parser.add_argument("--workers", dest="workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.batch is None:
+        convert_svg_to_vector_drawable()
+        return
+
+    inputs = args.batch or BATCH_INPUTS
+    results = batch_convert(inputs, args.out_dir, prefix=args.prefix, size_dp=args.size_dp,
+                            optimize=args.optimize, precision=args.precision, max_workers=args.workers)
+    for svg_path, output_path, count in results:
+        print(f"✅ {svg_path} → {output_path} ({count} paths)")
+    print(f"\nDone. Converted {len(results)} SVG file(s).")
+
+
 if __name__ == "__main__":
-    convert_svg_to_vector_drawable()
+    main()
@@ -0,0 +1,51 @@
+"""
+Latency statistics for the remote APIs used by corpus builds.
+
+google_api wraps each request in timed(api). create_corpus.py saves the
+samples after a build (save_latency_stats), and --plan reads the running
+means back (load_latency_stats) to project the wall time of the next build.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+LATENCY_FILE = Path(__file__).resolve().parent.parent.parent / ".api_latency_stats.json"
+
+_samples = {}
+_lock = threading.Lock()
+
+
+@contextmanager
+def timed(api):
+    """Record the duration of the wrapped request under api (failed requests are not recorded)"""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    with _lock:
+        _samples.setdefault(api, []).append(elapsed)
+
+
+def save_latency_stats(path=LATENCY_FILE):
+    """Merge this process's samples into the stats file; returns the merged stats"""
+    path = Path(path)
+    stats = json.loads(path.read_text()) if path.exists() else {}
+    with _lock:
+        for api, samples in _samples.items():
+            entry = stats.setdefault(api, {"count": 0, "total_seconds": 0.0})
+            entry["count"] += len(samples)
+            entry["total_seconds"] += sum(samples)
+            entry["mean_seconds"] = entry["total_seconds"] / entry["count"]
+        _samples.clear()
+    path.write_text(json.dumps(stats, indent=1, sort_keys=True))
+    return stats
+
+
+def load_latency_stats(path=LATENCY_FILE):
+    """{api: mean seconds per request} from the stats file ({} if none was recorded yet)"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return {api: entry["mean_seconds"] for api, entry in json.loads(path.read_text()).items()}
@@ -0,0 +1,89 @@
+"""
+MP3 helpers that work on the frame level, without decoding audio.
+
+An MP3 stream is a sequence of self-delimiting frames, each holding a fixed
+number of samples, so durations and cuts at frame boundaries only need the
+4-byte frame headers.
+"""
+
+# MPEG audio frame header tables: bitrate kbps by (version 1 or 2/2.5, layer), sample rates by version
+_MPEG_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MPEG_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 2.5: [11025, 12000, 8000]}
+
+
+def iter_mp3_frames(data):
+    """
+    Yield (offset, length, start_seconds, seconds, sample_rate) for every MPEG audio frame in data.
+
+    Raises ValueError if there are no frames, a frame header is corrupt or
+    the last frame is truncated.
+    """
+    pos = 0
+    if data[:3] == b"ID3":
+        # ID3v2 size is a 28-bit syncsafe integer
+        size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+        pos = 10 + size
+    frames = 0
+    elapsed = 0.0
+    while pos + 4 <= len(data):
+        if data[pos:pos + 3] == b"TAG":
+            break  # ID3v1 trailer
+        header = int.from_bytes(data[pos:pos + 4], "big")
+        if header >> 21 != 0x7FF:
+            raise ValueError(f"lost frame sync at byte {pos}")
+        version = {3: 1, 2: 2, 0: 2.5}.get((header >> 19) & 3)
+        layer = {3: 1, 2: 2, 1: 3}.get((header >> 17) & 3)
+        bitrate_index = (header >> 12) & 0xF
+        rate_index = (header >> 10) & 3
+        if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+            raise ValueError(f"invalid frame header at byte {pos}")
+        bitrate = _MPEG_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+        sample_rate = _MPEG_SAMPLE_RATES[version][rate_index]
+        padding = (header >> 9) & 1
+        if layer == 1:
+            samples = 384
+            length = (12 * bitrate // sample_rate + padding) * 4
+        else:
+            samples = 1152 if layer == 2 or version == 1 else 576
+            length = samples // 8 * bitrate // sample_rate + padding
+        if pos + length > len(data):
+            raise ValueError(f"last frame truncated by {pos + length - len(data)} bytes")
+        seconds = samples / sample_rate
+        yield pos, length, elapsed, seconds, sample_rate
+        frames += 1
+        elapsed += seconds
+        pos += length
+    if frames == 0:
+        raise ValueError("no audio frames")
+
+
+def mp3_duration(data):
+    """Duration in seconds of an MP3 byte string"""
+    return sum(frame[3] for frame in iter_mp3_frames(data))
+
+
+def mp3_sample_rate(data):
+    """Sample rate in Hz of the first frame of an MP3 byte string"""
+    return next(iter_mp3_frames(data))[4]
+
+
+def split_mp3(data, spans):
+    """
+    Cut data into one MP3 per (start_seconds, end_seconds) span.
+
+    A frame goes to a span if its start time lies within [start, end); cuts
+    therefore land on frame boundaries (about 26 ms at 44.1 kHz).
+    """
+    frames = list(iter_mp3_frames(data))
+    clips = []
+    for start, end in spans:
+        clips.append(b"".join(data[offset:offset + length]
+                              for offset, length, at, _, _ in frames if start <= at < end))
+    return clips
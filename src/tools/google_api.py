@@ -8,7 +8,11 @@ here = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.join(here, ".."))
 
 from tools.llms import chat
+from tools.audio_tools import mp3_duration, split_mp3
+from tools.respelling import rule_respelling
+from tools.api_stats import timed
 import json
+from xml.sax.saxutils import escape as xml_escape
 
 
 
@@ -19,6 +23,9 @@ PROJECT_ID = "my-free-personal-instance"
 LOCATION = "global"
 # ------------------------------------------
 
+# Rule-based respellings below this confidence go to the LLM instead
+RULE_MIN_CONFIDENCE = 0.8
+
 # Voice mapping for optimal TTS quality
 # Maps language codes to (BCP-47 code, voice_name) tuples
 VOICE_MAPPING = {
@@ -111,8 +118,8 @@ VOICE_MAPPING = {
 }
 
 
-def generate_respelling(text: str, target_language_code: str):
-    
+def respelling_messages(text: str, target_language_code: str):
+    """Chat messages asking the LLM for a respelling of text"""
     system_prompt = """
     You are a multilingual phonetics specialist who rewrites foreign words so English speakers can pronounce them naturally.
     - Always confirm the source language if it is provided; otherwise infer it from the context.
@@ -130,99 +137,127 @@ def generate_respelling(text: str, target_language_code: str):
     Word language code: {target_language_code}
     """
 
-    messages = [
+    return [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt}
     ]
-    response = chat(messages, response_format={"type": "json_object"})
-    return json.loads(response)["respelling"]
 
 
+def generate_respelling(text: str, target_language_code: str, min_confidence: float = RULE_MIN_CONFIDENCE):
+    # Scripts with a standard romanization are respelled locally; the LLM handles
+    # the rest and any word the rules are unsure about (kanji, unmarked stress, ...)
+    respelling, confidence = rule_respelling(text, target_language_code)
+    if respelling and confidence >= min_confidence:
+        return respelling
 
-def process_word_and_generate_audio(project_id: str, text: str, target_language_code: str):
-    """
-    Performs translation and generates pronunciation audio in a single call.
+    with timed("llm"):
+        response = chat(respelling_messages(text, target_language_code), response_format={"type": "json_object"})
+    return json.loads(response)["respelling"]
 
-    Note: As requested, this function contains no internal error handling (try/except)
-    for the API calls. It will raise a Google Cloud Python SDK exception if any 
-    required API is unavailable or returns an error.
-    
-    Args:
-        project_id: Your Google Cloud project ID.
-        text: The English word or phrase to process.
-        target_language_code: The target language's ISO 639-1 code (e.g., 'zh').
-    
-    Returns:
-        A dictionary containing the results and the filename of the generated audio.
-    """
-    # Initialize Clients
-    translation_client = translate.TranslationServiceClient()
-    tts_client = texttospeech.TextToSpeechClient()
-    
+
+def translate_word(project_id: str, text: str, target_language_code: str, translation_client=None):
+    """Translate English text to target_language_code (raises on API errors)"""
+    translation_client = translation_client or translate.TranslationServiceClient()
     parent = f"projects/{project_id}/locations/{LOCATION}"
-    
-    print(f"--- Processing '{text}' to {target_language_code}...")
 
-    # 1. Perform Translation (Fails if API call encounters an error)
-    translation_response = translation_client.translate_text(
-        parent=parent,
-        contents=[text],
-        target_language_code=target_language_code,
-        source_language_code="en"
-    )
+    with timed("translate"):
+        translation_response = translation_client.translate_text(
+            parent=parent,
+            contents=[text],
+            target_language_code=target_language_code,
+            source_language_code="en"
+        )
 
     if not translation_response.translations:
         raise ValueError("Translation response was empty.")
 
-    translated_text = translation_response.translations[0].translated_text
-    print(f"Translation: {translated_text}")
-
-    # 2. Romanization step removed; continuing with translation output only.
+    return translation_response.translations[0].translated_text
 
 
-    # 3. Synthesize Audio (Fails if API call encounters an error)
-    # Create audio_files directory if it doesn't exist
-    audio_dir = "audio_files"
+def audio_output_path(text: str, target_language_code: str, audio_dir: str = "audio_files", extension: str = ".mp3"):
+    """Path of the clip for an English word in a language (creates audio_dir)"""
     os.makedirs(audio_dir, exist_ok=True)
-    
-    output_file = os.path.join(audio_dir, f"{target_language_code}_{text.replace(' ', '_')}_audio.mp3")
-    
-    synthesis_input = texttospeech.SynthesisInput(text=translated_text)
-    
-    # Check if the language is supported for TTS
+    return os.path.join(audio_dir, f"{target_language_code}_{text.replace(' ', '_')}_audio{extension}")
+
+
+def voice_selection(target_language_code: str, tts_module=texttospeech):
+    """VoiceSelectionParams for a language from VOICE_MAPPING (tts_module: texttospeech or a beta module)"""
     voice_info = VOICE_MAPPING.get(target_language_code)
     if voice_info is None:
         raise ValueError(f"Language '{target_language_code}' is not supported by Google Text-to-Speech API")
-    
+
     # Handle both tuple (BCP-47, voice_name) and string (BCP-47 only) formats
     if isinstance(voice_info, tuple):
         bcp47_code, voice_name = voice_info
-        voice = texttospeech.VoiceSelectionParams(
+        return tts_module.VoiceSelectionParams(
             language_code=bcp47_code,
             name=voice_name,
-            ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL
-        )
-    else:
-        # Fallback for languages that only have BCP-47 code
-        voice = texttospeech.VoiceSelectionParams(
-            language_code=voice_info,
-            ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL
+            ssml_gender=tts_module.SsmlVoiceGender.NEUTRAL
         )
+    # Fallback for languages that only have BCP-47 code
+    return tts_module.VoiceSelectionParams(
+        language_code=voice_info,
+        ssml_gender=tts_module.SsmlVoiceGender.NEUTRAL
+    )
+
 
+def synthesize_to_file(text: str, target_language_code: str, output_file: str, tts_client=None):
+    """Synthesize one clip as MP3 into output_file (raises on API errors)"""
+    tts_client = tts_client or texttospeech.TextToSpeechClient()
+    synthesis_input = texttospeech.SynthesisInput(text=text)
     audio_config = texttospeech.AudioConfig(
         audio_encoding=texttospeech.AudioEncoding.MP3
     )
 
-    response = tts_client.synthesize_speech(
-        input=synthesis_input, voice=voice, audio_config=audio_config
-    )
+    with timed("tts"):
+        response = tts_client.synthesize_speech(
+            input=synthesis_input, voice=voice_selection(target_language_code), audio_config=audio_config
+        )
 
-    # Save the audio file
     with open(output_file, "wb") as out:
         out.write(response.audio_content)
         print(f"Audio content successfully saved to {output_file}")
+    return output_file
 
 
+def translate_and_respell(project_id: str, text: str, target_language_code: str):
+    """Translation and respelling without audio (audio is synthesized separately in batch mode)"""
+    print(f"--- Processing '{text}' to {target_language_code}...")
+    translated_text = translate_word(project_id, text, target_language_code)
+    print(f"Translation: {translated_text}")
+    return {
+        "translated_text": translated_text,
+        "respelling": generate_respelling(translated_text, target_language_code),
+    }
+
+
+def process_word_and_generate_audio(project_id: str, text: str, target_language_code: str):
+    """
+    Performs translation and generates pronunciation audio in a single call.
+
+    Note: As requested, this function contains no internal error handling (try/except)
+    for the API calls. It will raise a Google Cloud Python SDK exception if any 
+    required API is unavailable or returns an error.
+    
+    Args:
+        project_id: Your Google Cloud project ID.
+        text: The English word or phrase to process.
+        target_language_code: The target language's ISO 639-1 code (e.g., 'zh').
+    
+    Returns:
+        A dictionary containing the results and the filename of the generated audio.
+    """
+    print(f"--- Processing '{text}' to {target_language_code}...")
+
+    # 1. Perform Translation (Fails if API call encounters an error)
+    translated_text = translate_word(project_id, text, target_language_code)
+    print(f"Translation: {translated_text}")
+
+    # 2. Romanization step removed; continuing with translation output only.
+
+    # 3. Synthesize Audio (Fails if API call encounters an error)
+    output_file = audio_output_path(text, target_language_code)
+    synthesize_to_file(translated_text, target_language_code, output_file)
 
     respelling = generate_respelling(translated_text, target_language_code)
     return {
@@ -232,6 +267,82 @@ def process_word_and_generate_audio(project_id: str, text: str, target_language_
     }
 
 
+# --- Batched synthesis ---
+# One SSML document per language holds many phrases, each preceded by a <mark>.
+# The API reports when each mark is reached, and the returned MP3 is cut locally
+# at those times, so a whole language costs one request per MAX_SSML_BYTES.
+MAX_SSML_BYTES = 5000  # API limit on the input size of one request
+PHRASE_BREAK_MS = 600
+
+
+def build_ssml_batches(texts, max_bytes=MAX_SSML_BYTES, break_ms=PHRASE_BREAK_MS):
+    """
+    Group texts into SSML documents: returns [(indices, ssml), ...].
+
+    Phrase i is written as <mark name="p{i}"/>text<break/>, and every document
+    ends with <mark name="end"/> so the last phrase has an end time too.
+    """
+    batches = []
+    indices, parts = [], []
+
+    def document(items):
+        return "<speak>" + "".join(items) + '<mark name="end"/></speak>'
+
+    for i, text in enumerate(texts):
+        part = f'<mark name="p{i}"/>{xml_escape(text)}<break time="{break_ms}ms"/>'
+        if len(document([part]).encode("utf-8")) > max_bytes:
+            raise ValueError(f"Phrase {i} alone exceeds {max_bytes} bytes of SSML")
+        if parts and len(document(parts + [part]).encode("utf-8")) > max_bytes:
+            batches.append((indices, document(parts)))
+            indices, parts = [], []
+        indices.append(i)
+        parts.append(part)
+    if parts:
+        batches.append((indices, document(parts)))
+    return batches
+
+
+def synthesize_batch(texts, target_language_code: str, output_files, tts_client=None, break_ms=PHRASE_BREAK_MS):
+    """
+    Synthesize texts[i] into output_files[i] with one request per SSML batch.
+
+    Timepoints need the v1beta1 API. Each clip runs from the middle of the break
+    before its mark (the start of the audio for the first one) to the middle of
+    the break after it, so it has a short silent lead-in; cuts fall on MP3 frame
+    boundaries.
+    """
+    from google.cloud import texttospeech_v1beta1 as tts_beta
+
+    tts_client = tts_client or tts_beta.TextToSpeechClient()
+    voice = voice_selection(target_language_code, tts_beta)
+    audio_config = tts_beta.AudioConfig(audio_encoding=tts_beta.AudioEncoding.MP3)
+    for indices, ssml in build_ssml_batches(texts, break_ms=break_ms):
+        request = tts_beta.SynthesizeSpeechRequest(
+            input=tts_beta.SynthesisInput(ssml=ssml),
+            voice=voice,
+            audio_config=audio_config,
+            enable_time_pointing=[tts_beta.SynthesizeSpeechRequest.TimepointType.SSML_MARK],
+        )
+        with timed("tts_batch"):
+            response = tts_client.synthesize_speech(request=request)
+        marks = {point.mark_name: point.time_seconds for point in response.timepoints}
+        missing = [f"p{i}" for i in indices if f"p{i}" not in marks]
+        if missing:
+            raise ValueError(f"Timepoints missing for marks {missing} ({target_language_code})")
+
+        ends = [marks[f"p{i}"] for i in indices[1:]] + [marks.get("end", mp3_duration(response.audio_content))]
+        # Clips start in the middle of the previous break, not at the mark: the frame holding
+        # the word onset begins before the mark, and a frame's bit reservoir reaches into
+        # earlier frames, so decoders may drop the first frame or two (now silence)
+        starts = [0.0] + [marks[f"p{i}"] - break_ms / 2000 for i in indices[1:]]
+        spans = [(start, end - break_ms / 2000) for start, end in zip(starts, ends)]
+        for i, clip in zip(indices, split_mp3(response.audio_content, spans)):
+            with open(output_files[i], "wb") as out:
+                out.write(clip)
+        print(f"Synthesized {len(indices)} clip(s) for {target_language_code} in one request")
+    return output_files
+
+
 def list_supported_translation_languages(project_id: str):
     """Lists supported languages for the Translation API."""
     client = translate.TranslationServiceClient()
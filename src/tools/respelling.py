@@ -0,0 +1,426 @@
+"""
+Rule-based English-style respellings for scripts with standard romanizations.
+
+  zh-cn, zh-tw    pinyin from pypinyin, respelled per syllable (nǐmen -> NEE-mun)
+  ja              kana -> Hepburn -> respelling (kanji readings are not guessed)
+  ko              Hangul -> Revised Romanization with the main sound changes
+                  (liaison, nasalization, liquidization, h-aspiration)
+  ru, uk, bg, be  Cyrillic transliteration, with Russian vowel reduction when
+                  the stressed vowel is known
+
+Output follows the format of the LLM respellings: syllables joined by "-",
+the stressed syllable of a multi-syllable word in capitals. Languages without
+lexical stress (Japanese, Korean, Mandarin apart from neutral tones) stay in
+lowercase.
+
+rule_respelling() returns (respelling, confidence). Confidence is low when
+the rules cannot know the answer (kanji, Russian stress without a stress mark,
+ambiguous Chinese characters, letters outside the script), and callers should
+then ask the LLM instead.
+"""
+
+import unicodedata
+
+STRESS_MARK = "́"  # combining acute accent, as in приве́т
+
+
+def format_respelling(words):
+    """[(syllables, stressed index or None), ...] -> "doh svee-DAH-nee-yah" """
+    out = []
+    for syllables, stressed in words:
+        if stressed is not None and len(syllables) > 1:
+            syllables = [s.upper() if i == stressed else s for i, s in enumerate(syllables)]
+        out.append("-".join(syllables))
+    return " ".join(out)
+
+
+def _split_words(text):
+    # Words are runs of letters/marks; anything else (spaces, punctuation) separates them
+    words, current = [], ""
+    for char in text:
+        if char.isalpha() or unicodedata.category(char).startswith("M") or char in "ー々":
+            current += char
+        elif current:
+            words.append(current)
+            current = ""
+    if current:
+        words.append(current)
+    return words
+
+
+# --- Mandarin (pinyin) ---
+PINYIN_INITIALS = {
+    "b": "b", "p": "p", "m": "m", "f": "f", "d": "d", "t": "t", "n": "n", "l": "l",
+    "g": "g", "k": "k", "h": "h", "j": "j", "q": "ch", "x": "sh",
+    "zh": "j", "ch": "ch", "sh": "sh", "r": "r", "z": "dz", "c": "ts", "s": "s", "": "",
+}
+# Finals as pypinyin writes them in strict mode (v = ü, uei/iou/uen unabbreviated)
+PINYIN_FINALS = {
+    "a": "ah", "o": "aw", "e": "uh", "ai": "igh", "ei": "ay", "ao": "ow", "ou": "oh",
+    "an": "ahn", "en": "un", "ang": "ahng", "eng": "ung", "ong": "ong", "er": "ar",
+    "i": "ee", "ia": "yah", "ie": "yeh", "iao": "yow", "iou": "yoh", "ian": "yen", "in": "een",
+    "iang": "yahng", "ing": "ing", "iong": "yong",
+    "u": "oo", "ua": "wah", "uo": "waw", "uai": "why", "uei": "way", "uan": "wahn", "uen": "wun",
+    "uang": "wahng", "ueng": "wung",
+    "v": "yoo", "ve": "yweh", "van": "ywen", "vn": "yoon",
+}
+
+
+def _pinyin_syllable(initial, final):
+    if final == "i" and initial in ("z", "c", "s"):
+        vowel = "uh"  # zi, ci, si
+    elif final == "i" and initial in ("zh", "ch", "sh", "r"):
+        vowel = "ur"  # zhi, chi, shi, ri
+    else:
+        vowel = PINYIN_FINALS[final]
+    return PINYIN_INITIALS[initial] + vowel
+
+
+def respell_mandarin(text):
+    from pypinyin import Style, lazy_pinyin, pinyin
+    from pypinyin.constants import PHRASES_DICT
+
+    words, confidence = [], 1.0
+    for word in _split_words(text):
+        if not all(unicodedata.name(c, "").startswith("CJK") for c in word):
+            return None, 0.0
+        initials = lazy_pinyin(word, style=Style.INITIALS, strict=True)
+        finals = lazy_pinyin(word, style=Style.FINALS, strict=True)
+        tones = lazy_pinyin(word, style=Style.TONE3, neutral_tone_with_five=True)
+        if len(word) > 1 and word not in PHRASES_DICT and any(len(pinyin(c, heteronym=True)[0]) > 1 for c in word):
+            # No phrase entry to pick between a character's readings
+            confidence = min(confidence, 0.7)
+        elif len(word) == 1 and len(pinyin(word, heteronym=True)[0]) > 1:
+            confidence = min(confidence, 0.85)  # the most common reading is usually the right one
+        syllables = [_pinyin_syllable(i, f) for i, f in zip(initials, finals)]
+        # Neutral-tone syllables are unstressed, so the one before them carries the stress
+        stressed = len(syllables) - 2 if tones[-1].endswith("5") and len(syllables) > 1 else None
+        words.append((syllables, stressed))
+    return format_respelling(words), confidence
+
+
+# --- Japanese (kana) ---
+_KANA_ROWS = [
+    ("あいうえお", ["a", "i", "u", "e", "o"]),
+    ("かきくけこ", ["ka", "ki", "ku", "ke", "ko"]),
+    ("がぎぐげご", ["ga", "gi", "gu", "ge", "go"]),
+    ("さしすせそ", ["sa", "shi", "su", "se", "so"]),
+    ("ざじずぜぞ", ["za", "ji", "zu", "ze", "zo"]),
+    ("たちつてと", ["ta", "chi", "tsu", "te", "to"]),
+    ("だぢづでど", ["da", "ji", "zu", "de", "do"]),
+    ("なにぬねの", ["na", "ni", "nu", "ne", "no"]),
+    ("はひふへほ", ["ha", "hi", "fu", "he", "ho"]),
+    ("ばびぶべぼ", ["ba", "bi", "bu", "be", "bo"]),
+    ("ぱぴぷぺぽ", ["pa", "pi", "pu", "pe", "po"]),
+    ("まみむめも", ["ma", "mi", "mu", "me", "mo"]),
+    ("やゆよ", ["ya", "yu", "yo"]),
+    ("らりるれろ", ["ra", "ri", "ru", "re", "ro"]),
+    ("わを", ["wa", "o"]),
+    ("ぁぃぅぇぉ", ["a", "i", "u", "e", "o"]),
+    ("ゔ", ["vu"]),
+]
+KANA = {kana: roma for row, romaji in _KANA_ROWS for kana, roma in zip(row, romaji)}
+SMALL_YA = {"ゃ": "ya", "ゅ": "yu", "ょ": "yo"}
+# Greetings that end in the topic particle は, read "wa"
+KANA_PARTICLE_WORDS = ("こんにちは", "こんばんは")
+KANA_VOWELS = {"a": "ah", "i": "ee", "u": "oo", "e": "eh", "o": "oh"}
+KANA_CLOSED_VOWELS = {"a": "ah", "i": "ee", "u": "oo", "e": "e", "o": "o"}
+
+
+def _hiragana(char):
+    # Katakana block is the hiragana block shifted by 0x60
+    return chr(ord(char) - 0x60) if "ァ" <= char <= "ヶ" else char
+
+
+def _kana_moras(word):
+    moras = []
+    chars = [_hiragana(c) for c in word]
+    for index, char in enumerate(chars):
+        if char in SMALL_YA:
+            if not moras or not moras[-1].endswith("i") or len(moras[-1]) < 2:
+                return None
+            base = moras.pop()[:-1]
+            # shi + ya -> sha, chi + yu -> chu, ji + yo -> jo
+            moras.append(base + (SMALL_YA[char][1:] if base in ("sh", "ch", "j") else SMALL_YA[char]))
+        elif char == "ん":
+            moras.append("N")
+        elif char == "っ":
+            moras.append("Q")
+        elif char == "ー":
+            moras.append("-")
+        elif char == "は" and index == len(chars) - 1 and word in KANA_PARTICLE_WORDS:
+            moras.append("wa")
+        elif char in KANA:
+            moras.append(KANA[char])
+        else:
+            return None
+    return moras
+
+
+def respell_japanese(text):
+    words = []
+    for word in _split_words(text):
+        moras = _kana_moras(word)
+        if moras is None:
+            # Kanji (or other letters): the reading cannot be derived by rule
+            return None, 0.0
+        syllables = []  # [onset, vowel, coda]
+        for index, mora in enumerate(moras):
+            following = moras[index + 1] if index + 1 < len(moras) else ""
+            if mora == "N" and syllables:
+                syllables[-1][2] += "n"
+            elif mora == "Q" and syllables and following not in ("", "N", "Q", "-"):
+                # Geminate: the next consonant closes this syllable (tch for ch)
+                syllables[-1][2] += "t" if following.startswith("ch") else following[0]
+            elif mora == "-" or mora in ("N", "Q"):
+                continue
+            elif mora in KANA_VOWELS and syllables and not syllables[-1][2] and (
+                    syllables[-1][1] + mora in ("aa", "ii", "uu", "ee", "ei", "oo", "ou")):
+                continue  # long vowel
+            elif mora == "i" and syllables and not syllables[-1][2] and syllables[-1][1] == "a":
+                syllables[-1][1] = "ai"
+            elif mora == "su" and index == len(moras) - 1 and index > 0 and moras[index - 1] in ("ma", "de"):
+                syllables[-1][2] += "ss"  # desu, masu: the final u is devoiced
+            else:
+                syllables.append([mora[:-1], mora[-1], ""])
+
+        respelled = []
+        for onset, vowel, coda in syllables:
+            if vowel == "ai":
+                respelled.append(onset + ("igh" if onset else "eye") + coda)
+            else:
+                respelled.append(onset + (KANA_CLOSED_VOWELS if coda else KANA_VOWELS)[vowel] + coda)
+        words.append((respelled, None))
+    return format_respelling(words), 0.9
+
+
+# --- Korean (Hangul) ---
+HANGUL_INITIALS = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+HANGUL_MEDIALS = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo", "we", "wi", "yu", "eu", "ui", "i"]
+HANGUL_FINALS = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+                 "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+RR_INITIALS = {"ㄱ": "g", "ㄲ": "kk", "ㄴ": "n", "ㄷ": "d", "ㄸ": "tt", "ㄹ": "r", "ㅁ": "m", "ㅂ": "b", "ㅃ": "pp",
+               "ㅅ": "s", "ㅆ": "ss", "ㅇ": "", "ㅈ": "j", "ㅉ": "jj", "ㅊ": "ch", "ㅋ": "k", "ㅌ": "t", "ㅍ": "p", "ㅎ": "h"}
+RR_FINALS = {"": "", "ㄱ": "k", "ㄴ": "n", "ㄷ": "t", "ㄹ": "l", "ㅁ": "m", "ㅂ": "p", "ㅇ": "ng"}
+# Finals are pronounced as one of seven consonants; clusters keep the listed one
+HANGUL_NEUTRAL_FINALS = {
+    "ㄲ": "ㄱ", "ㅋ": "ㄱ", "ㄱㅅ": "ㄱ", "ㄹㄱ": "ㄱ", "ㅅ": "ㄷ", "ㅆ": "ㄷ", "ㅈ": "ㄷ", "ㅊ": "ㄷ", "ㅌ": "ㄷ",
+    "ㅎ": "ㄷ", "ㅍ": "ㅂ", "ㅂㅅ": "ㅂ", "ㄹㅍ": "ㅂ", "ㄴㅈ": "ㄴ", "ㄴㅎ": "ㄴ", "ㄹㅁ": "ㅁ", "ㄹㅂ": "ㄹ",
+    "ㄹㅅ": "ㄹ", "ㄹㅌ": "ㄹ", "ㄹㅎ": "ㄹ",
+}
+ASPIRATED = {"ㄱ": "ㅋ", "ㄷ": "ㅌ", "ㅂ": "ㅍ", "ㅈ": "ㅊ"}
+HANGUL_VOWELS = {
+    "a": "ah", "ae": "eh", "ya": "yah", "yae": "yeh", "eo": "uh", "e": "eh", "yeo": "yuh", "ye": "yeh",
+    "o": "oh", "wa": "wah", "wae": "weh", "oe": "weh", "yo": "yoh", "u": "oo", "wo": "wuh", "we": "weh",
+    "wi": "wee", "yu": "yoo", "eu": "uh", "ui": "ee", "i": "ee",
+}
+
+
+def _hangul_syllables(word):
+    syllables = []
+    for char in word:
+        code = ord(char) - 0xAC00
+        if not 0 <= code < 11172:
+            return None
+        syllables.append([HANGUL_INITIALS[code // 588], HANGUL_MEDIALS[code % 588 // 28], HANGUL_FINALS[code % 28]])
+    return syllables
+
+
+def _apply_hangul_sound_changes(syllables):
+    for current, following in zip(syllables, syllables[1:]):
+        final, initial = current[2], following[0]
+        if initial == "ㅇ" and final and final != "ㅇ":
+            # Liaison: the final moves onto the vowel-initial syllable (a final ㅎ is silent)
+            if final in ("ㅎ", "ㄴㅎ", "ㄹㅎ"):
+                current[2] = final[:-1]
+                if current[2]:
+                    current[2], following[0] = "", current[2]
+            elif len(final) == 2:
+                current[2], following[0] = final[0], "ㅆ" if final[1] == "ㅅ" else final[1]
+            else:
+                current[2], following[0] = "", final
+            continue
+        if initial == "ㅎ" and final[-1:] in ASPIRATED:
+            current[2], following[0] = final[:-1], ASPIRATED[final[-1]]
+        elif final[-1:] == "ㅎ" and initial in ASPIRATED:
+            current[2], following[0] = final[:-1], ASPIRATED[initial]
+        elif final[-1:] == "ㅎ" and initial == "ㅅ":
+            current[2], following[0] = final[:-1], "ㅆ"
+        current[2] = HANGUL_NEUTRAL_FINALS.get(current[2], current[2])
+        final, initial = current[2], following[0]
+        if (initial == "ㄹ" and final in ("ㄴ", "ㄹ")) or (initial == "ㄴ" and final == "ㄹ"):
+            current[2], following[0] = "ㄹ", "ㄹ"  # 실례 sil-lye, 신라 sil-la, 설날 seol-lal
+        elif initial == "ㄹ" and final in ("ㄱ", "ㄷ", "ㅂ", "ㅁ", "ㅇ"):
+            following[0] = "ㄴ"
+        final, initial = current[2], following[0]
+        if initial in ("ㄴ", "ㅁ") and final in ("ㄱ", "ㄷ", "ㅂ"):
+            # Nasalization: 합니다 ham-ni-da
+            current[2] = {"ㄱ": "ㅇ", "ㄷ": "ㄴ", "ㅂ": "ㅁ"}[final]
+    syllables[-1][2] = HANGUL_NEUTRAL_FINALS.get(syllables[-1][2], syllables[-1][2])
+    return syllables
+
+
+def respell_korean(text):
+    words = []
+    for word in _split_words(text):
+        syllables = _hangul_syllables(word)
+        if syllables is None:
+            return None, 0.0
+        respelled = []
+        previous_final = ""
+        for initial, medial, final in _apply_hangul_sound_changes(syllables):
+            onset = "l" if initial == "ㄹ" and previous_final == "ㄹ" else RR_INITIALS[initial]
+            if onset == "s" and (medial[0] in "iy" or medial == "wi"):
+                onset = "sh"  # 시 shi, 셔 shyeo
+            respelled.append(onset + HANGUL_VOWELS[medial] + RR_FINALS[final])
+            previous_final = final
+        words.append((respelled, None))
+    return format_respelling(words), 0.9
+
+
+# --- Cyrillic ---
+CYRILLIC_CONSONANTS = {
+    "б": "b", "в": "v", "г": "g", "ґ": "g", "д": "d", "ж": "zh", "з": "z", "й": "y", "к": "k", "л": "l",
+    "м": "m", "н": "n", "п": "p", "р": "r", "с": "s", "т": "t", "ф": "f", "х": "kh", "ц": "ts", "ч": "ch",
+    "ш": "sh", "щ": "shch", "ў": "w",
+}
+# Vowel letters -> (iotated, vowel); iotated vowels add a "y" glide
+CYRILLIC_VOWELS = {
+    "а": (False, "ah"), "о": (False, "oh"), "у": (False, "oo"), "ы": (False, "ih"), "э": (False, "eh"),
+    "и": (False, "ee"), "і": (False, "ee"), "е": (True, "eh"), "ё": (True, "oh"), "ю": (True, "oo"),
+    "я": (True, "ah"), "є": (True, "eh"), "ї": (True, "ee"), "ъ": (False, "uh"),
+}
+CYRILLIC_OVERRIDES = {
+    "uk": {"г": "h", "и": (False, "ih"), "е": (False, "eh")},
+    "be": {"г": "h", "е": (True, "eh")},
+    "bg": {"щ": "sht", "ъ": (False, "uh")},
+    "ru": {"щ": "sh"},
+}
+# After these consonants Russian е/ё/ю/я lose their glide (шест shest, not shyest)
+HARD_CONSONANTS = ("ж", "ш", "ц", "ч", "щ")
+# One-vowel Russian words that lean on a neighbouring word and are not stressed
+# (до свида́ния: duh, not doh); the last three follow their host word, the rest precede it
+RUSSIAN_PROCLITICS = frozenset(("без", "в", "во", "до", "за", "из", "к", "ко", "на", "над", "не", "ни", "о", "об",
+                                "обо", "от", "по", "под", "при", "про", "с", "со", "у", "и", "а", "но"))
+RUSSIAN_ENCLITICS = frozenset(("же", "ли", "бы"))
+
+
+def respell_cyrillic(text, lang):
+    overrides = CYRILLIC_OVERRIDES[lang]
+    vowels = {**CYRILLIC_VOWELS, **{k: v for k, v in overrides.items() if isinstance(v, tuple)}}
+    consonants = {**CYRILLIC_CONSONANTS, **{k: v for k, v in overrides.items() if isinstance(v, str)}}
+    if lang != "bg":
+        vowels.pop("ъ")  # a separator, not a vowel, outside Bulgarian
+
+    parsed, confidence = [], 0.9
+    split = _split_words(text.lower())
+    for word in split:
+        # Units: [letters, is_vowel]; soft/hard signs stay with the preceding consonant
+        units, stressed = [], None
+        for char in word:
+            if char == STRESS_MARK:
+                stressed = sum(1 for u in units if u[1]) - 1
+            elif char in vowels:
+                units.append([char, True])
+            elif char in ("ь", "ъ", "'", "’") and units:
+                units[-1][0] += char
+            elif char in consonants:
+                units.append([char, False])
+            else:
+                return None, 0.0
+        vowel_positions = [i for i, u in enumerate(units) if u[1]]
+        if not vowel_positions:
+            return None, 0.0
+        if stressed is None and "ё" in word:
+            stressed = [units[i][0] for i in vowel_positions].index("ё")
+        clitic = (lang == "ru" and stressed is None and len(vowel_positions) == 1 and len(split) > 1
+                  and word in RUSSIAN_PROCLITICS | RUSSIAN_ENCLITICS)
+        if stressed is None and len(vowel_positions) == 1 and not clitic:
+            stressed = 0
+        if stressed is None and not clitic:
+            confidence = 0.6  # Stress is lexical and not written: the rules cannot place it
+        parsed.append((word, units, vowel_positions, stressed, clitic))
+
+    words = []
+    for position, (word, units, vowel_positions, stressed, clitic) in enumerate(parsed):
+        # A proclitic right before a word-initial stress is pretonic ("ah"); otherwise it reduces fully
+        host_stress = parsed[position + 1][3] if position + 1 < len(parsed) else None
+        pretonic = clitic and word in RUSSIAN_PROCLITICS and host_stress == 0
+        # Syllable boundaries: one consonant starts the next syllable; in a cluster the first
+        # consonant closes the previous one (й always does)
+        starts = [0]
+        for left, right in zip(vowel_positions, vowel_positions[1:]):
+            cluster = right - left - 1
+            if cluster == 0 or (cluster == 1 and units[left + 1][0][0] == "й"):
+                starts.append(right)
+            elif cluster == 1:
+                starts.append(left + 1)
+            else:
+                starts.append(left + 2)
+        syllables = []
+        for number, (start, end) in enumerate(zip(starts, starts[1:] + [len(units)])):
+            out = ""
+            for index in range(start, end):
+                letters, is_vowel = units[index]
+                if not is_vowel:
+                    out += consonants[letters[0]]
+                    continue
+                iotated, sound = vowels[letters]
+                if clitic:
+                    if letters in ("а", "о"):
+                        sound = "ah" if pretonic or index == 0 else "uh"
+                    elif letters in ("е", "я"):
+                        sound = "ee"
+                elif lang == "ru" and stressed is not None and number != stressed:
+                    if letters in ("а", "о"):
+                        sound = "ah" if number == stressed - 1 or index == 0 else "uh"
+                    elif letters in ("е", "я"):
+                        sound = "uh" if letters == "я" and index == len(units) - 1 else "ee"
+                previous = units[index - 1][0] if index else ""
+                if iotated and not (previous[:1] in HARD_CONSONANTS and not previous.endswith(("ь", "ъ"))):
+                    sound = "y" + sound
+                if sound.endswith("eh") and index + 1 < end:
+                    sound = sound[:-1]  # closed syllable: nyet, not nyeht
+                out += sound
+            syllables.append(out)
+        words.append((syllables, stressed))
+    return format_respelling(words), confidence
+
+
+RESPELLERS = {
+    "zh-cn": respell_mandarin,
+    "zh-tw": respell_mandarin,
+    "zh": respell_mandarin,
+    "ja": respell_japanese,
+    "ko": respell_korean,
+    "ru": lambda text: respell_cyrillic(text, "ru"),
+    "uk": lambda text: respell_cyrillic(text, "uk"),
+    "bg": lambda text: respell_cyrillic(text, "bg"),
+    "be": lambda text: respell_cyrillic(text, "be"),
+}
+
+
+def rule_respelling(text, lang):
+    """(respelling, confidence in 0..1) from the rules, or (None, 0.0) if lang has none"""
+    respeller = RESPELLERS.get(lang)
+    if respeller is None or not text.strip():
+        return None, 0.0
+    # NFC composes decomposed й/ё and Hangul jamo; a combining stress mark stays separate
+    return respeller(unicodedata.normalize("NFC", text))
+
+
+def main():
+    # CLI: respelling.py TEXT LANG
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Respell a word with the local rules (no LLM).")
+    parser.add_argument("text", help="Word or phrase in the target language")
+    parser.add_argument("lang", help="Language code (zh-cn, zh-tw, ja, ko, ru, uk, bg, be)")
+    args = parser.parse_args()
+
+    respelling, confidence = rule_respelling(args.text, args.lang)
+    print(f"{respelling} (confidence {confidence:.2f})")
+
+
+if __name__ == "__main__":
+    main()
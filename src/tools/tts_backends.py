@@ -0,0 +1,199 @@
+"""
+Pluggable speech synthesis backends.
+
+Every backend turns (text, language code) into an audio file:
+  google  Google Cloud Text-to-Speech (MP3), optionally batched per language
+          with SSML marks (see google_api.synthesize_batch)
+  espeak  espeak-ng on the local CPU (WAV), covers many languages Google lacks
+  piper   Piper neural voices from local .onnx models (WAV)
+
+Network backends run on threads; local engines are CPU-bound and run on a
+process pool, one subprocess per clip. Use get_backend(name) to build one, and
+pick_backend() to fall back to a second backend for unsupported languages
+(e.g. "ha", which VOICE_MAPPING maps to None).
+"""
+
+import functools
+import os
+import re
+import shutil
+import subprocess
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+# espeak-ng voice names where they differ from our language codes
+ESPEAK_VOICES = {
+    "zh-cn": "cmn",
+    "zh-tw": "cmn",
+    "no": "nb",
+    "tl": "fil",
+}
+
+
+class TTSBackend(ABC):
+    """Base class: subclasses implement supports() and synthesize()"""
+
+    name = None
+    extension = ".wav"
+    # Batched backends synthesize all clips of a language in one synthesize_group() call
+    batched = False
+
+    @abstractmethod
+    def supports(self, lang):
+        """True if the backend can speak lang"""
+
+    @abstractmethod
+    def synthesize(self, text, lang, output_file):
+        """Write one clip for text to output_file and return the path"""
+
+    def synthesize_group(self, texts, lang, output_files):
+        for text, output_file in zip(texts, output_files):
+            self.synthesize(text, lang, output_file)
+        return output_files
+
+    def executor(self, max_workers=None):
+        """Pool suited to the engine: threads for network APIs"""
+        return ThreadPoolExecutor(max_workers=max_workers or 10)
+
+
+class GoogleBackend(TTSBackend):
+    name = "google"
+    extension = ".mp3"
+
+    def __init__(self, batch=False):
+        self.batched = batch
+
+    def supports(self, lang):
+        from tools.google_api import VOICE_MAPPING
+
+        return VOICE_MAPPING.get(lang) is not None
+
+    def synthesize(self, text, lang, output_file):
+        from tools.google_api import synthesize_to_file
+
+        return synthesize_to_file(text, lang, output_file)
+
+    def synthesize_group(self, texts, lang, output_files):
+        from tools.google_api import synthesize_batch
+
+        if not self.batched:
+            return super().synthesize_group(texts, lang, output_files)
+        return synthesize_batch(texts, lang, output_files)
+
+
+class LocalBackend(TTSBackend):
+    """A command-line engine run as one subprocess per clip"""
+
+    def executor(self, max_workers=None):
+        # Synthesis is CPU-bound, so clips run in parallel processes (the backend is pickled to each)
+        return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+
+    def _run(self, command, output_file, stdin=None):
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        subprocess.run(command, input=stdin, check=True, capture_output=True)
+        if not Path(output_file).is_file() or Path(output_file).stat().st_size == 0:
+            raise RuntimeError(f"{self.name} wrote no audio to {output_file}")
+        return output_file
+
+
+def _find_executable(*names):
+    for name in names:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise RuntimeError(f"{names[0]} was not found on PATH (install it, e.g. apt install {names[0]})")
+
+
+# "(en 2)" entries of the Other Languages column: a language code and its priority
+_OTHER_LANGUAGE_RE = re.compile(r"\(([^\s()]+)\s+\d+\)")
+
+
+def parse_espeak_voices(output):
+    """
+    Language codes in `espeak-ng --voices` output.
+
+    After the header each line reads: Pty Language Age/Gender VoiceName File Other Languages,
+    e.g. " 2  en-gb  --/M  English_(Great_Britain)  gmw/en  (en 2)". Some codes (en, fr, zh)
+    only appear in the trailing Other Languages column, so both columns are read.
+    """
+    codes = set()
+    for line in output.splitlines()[1:]:
+        if not line.strip():
+            continue
+        codes.add(line.split()[1].lower())
+        codes.update(code.lower() for code in _OTHER_LANGUAGE_RE.findall(line))
+    return frozenset(codes)
+
+
+@functools.lru_cache(maxsize=None)
+def _espeak_voices(executable):
+    output = subprocess.run([executable, "--voices"], check=True, capture_output=True, text=True).stdout
+    return parse_espeak_voices(output)
+
+
+class EspeakBackend(LocalBackend):
+    name = "espeak"
+
+    def __init__(self, speed=None, executable=None):
+        # speed in words per minute (espeak-ng default: 175)
+        self.speed = speed
+        self.executable = executable or _find_executable("espeak-ng", "espeak")
+
+    def voice(self, lang):
+        return ESPEAK_VOICES.get(lang, lang)
+
+    def supports(self, lang):
+        return self.voice(lang).lower() in _espeak_voices(self.executable)
+
+    def synthesize(self, text, lang, output_file):
+        command = [self.executable, "-v", self.voice(lang), "-w", str(output_file)]
+        if self.speed:
+            command += ["-s", str(self.speed)]
+        # "--" keeps a translation starting with "-" from being read as an option
+        return self._run(command + ["--", text], output_file)
+
+
+class PiperBackend(LocalBackend):
+    name = "piper"
+
+    def __init__(self, models_dir=None, executable=None):
+        # Models are named like es_ES-davefx-medium.onnx (with the .onnx.json config next to them)
+        self.models_dir = Path(models_dir or os.environ.get("PIPER_MODELS_DIR", "piper_models"))
+        self.executable = executable or _find_executable("piper")
+
+    def model(self, lang):
+        """First model in models_dir whose name starts with the language (e.g. zh_CN for zh-cn)"""
+        prefix = lang.lower().replace("-", "_")
+        prefix += "" if "_" in prefix else "_"
+        for path in sorted(self.models_dir.glob("*.onnx")):
+            if path.stem.lower().startswith(prefix):
+                return path
+        return None
+
+    def supports(self, lang):
+        return self.model(lang) is not None
+
+    def synthesize(self, text, lang, output_file):
+        model = self.model(lang)
+        if model is None:
+            raise ValueError(f"No Piper model for '{lang}' in {self.models_dir}")
+        command = [self.executable, "--model", str(model), "--output_file", str(output_file)]
+        return self._run(command, output_file, stdin=text.encode("utf-8"))
+
+
+BACKENDS = {"google": GoogleBackend, "espeak": EspeakBackend, "piper": PiperBackend}
+
+
+def get_backend(name, **options):
+    """Build a backend by name with backend-specific options (e.g. batch=True for google)"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown TTS backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](**options)
+
+
+def pick_backend(lang, primary, fallback=None):
+    """primary if it supports lang, else fallback if that does; otherwise primary (which will raise)"""
+    if primary.supports(lang) or fallback is None or not fallback.supports(lang):
+        return primary
+    return fallback
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Validate a corpus.json before it ships.
+
+Every word x language cell is checked in parallel:
+  translation   non-empty translated word
+  script        the translation is written in the language's script
+  respelling    Latin-only, and present for non-Latin-script languages
+  audio         audio_file is set, and it and any audio_file_* variants exist under
+                the app's audio_files/ dir, decode as MP3/WAV frame by frame and
+                have a duration in bounds
+Corpus-wide checks cover entries without an original word, duplicate words and
+parity of language codes (and flag assets) with language_metadata.json.
+
+The report is printed grouped by check (or written as JSON with --json); the
+exit code is 1 if any error was found (or any warning, with --strict).
+"""
+
+import json
+import sys
+import unicodedata
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from tools.audio_tools import mp3_duration
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = REPO_ROOT / "HelloGoodbye/app/src/main/assets"
+# playAssetAudio() opens assets/audio_files/<audio_file>
+AUDIO_DIR = ASSETS_DIR / "audio_files"
+
+# Unicode script (first word of the character name) expected in translations
+LANGUAGE_SCRIPTS = {
+    "ru": {"CYRILLIC"},
+    "uk": {"CYRILLIC"},
+    "bg": {"CYRILLIC"},
+    "el": {"GREEK"},
+    "ar": {"ARABIC"},
+    "he": {"HEBREW"},
+    "hi": {"DEVANAGARI"},
+    "th": {"THAI"},
+    "ko": {"HANGUL"},
+    "ja": {"HIRAGANA", "KATAKANA", "CJK"},
+    "zh-cn": {"CJK"},
+    "zh-tw": {"CJK"},
+}
+LATIN = {"LATIN"}
+
+
+def _scripts(text):
+    # Scripts of the letters in text ("LATIN", "CYRILLIC", "CJK", ...)
+    found = set()
+    for char in text:
+        if char.isalpha():
+            found.add(unicodedata.name(char, "UNKNOWN").split()[0])
+    return found
+
+
+def audio_duration(path):
+    """Decode an audio file's framing and return its duration in seconds"""
+    path = Path(path)
+    if path.suffix.lower() == ".wav":
+        with wave.open(str(path)) as w:
+            return w.getnframes() / w.getframerate()
+    return mp3_duration(path.read_bytes())
+
+
+def _issue(severity, check, message, word=None, lang=None):
+    return {"severity": severity, "check": check, "word": word, "lang": lang, "message": message}
+
+
+def check_cell(job):
+    """Run every per-cell check for one (word, lang, cell, audio_dir, min_s, max_s) job"""
+    word, lang, cell, audio_dir, min_duration, max_duration = job
+    issues = []
+    if not isinstance(cell, dict):
+        return [_issue("error", "translation", "cell is not an object", word, lang)]
+
+    translation = cell.get("word")
+    if not translation or not str(translation).strip():
+        issues.append(_issue("error", "translation", f"empty translation{': ' + cell['error'] if cell.get('error') else ''}", word, lang))
+    else:
+        expected = LANGUAGE_SCRIPTS.get(lang, LATIN)
+        scripts = _scripts(translation)
+        if scripts and not scripts & expected:
+            issues.append(_issue("error", "script", f"{translation!r} is {sorted(scripts)}, expected {sorted(expected)}", word, lang))
+
+    respelling = cell.get("respelling")
+    if respelling:
+        scripts = _scripts(respelling)
+        if scripts - LATIN:
+            issues.append(_issue("error", "respelling", f"respelling {respelling!r} is not Latin ({sorted(scripts)})", word, lang))
+    elif lang in LANGUAGE_SCRIPTS:
+        issues.append(_issue("warning", "respelling", "no respelling for a non-Latin-script language", word, lang))
+
+    if not cell.get("audio_file"):
+        issues.append(_issue("warning", "audio", "no audio_file", word, lang))
+        return issues
+    # audio_file plus its slow/normalized variants; a slowed clip may run up to twice as long
+    for key in [k for k in cell if k == "audio_file" or k.startswith("audio_file_")]:
+        path = Path(audio_dir) / Path(cell[key]).name
+        if not path.is_file():
+            issues.append(_issue("error", "audio", f"{path} does not exist", word, lang))
+            continue
+        # A corrupt file is a finding to report, not a reason to stop the other cells
+        try:
+            duration = audio_duration(path)
+        except (ValueError, EOFError, wave.Error) as e:
+            issues.append(_issue("error", "audio", f"{path.name} does not decode: {e}", word, lang))
+            continue
+        longest = max_duration * (2 if key == "audio_file_slow" else 1)
+        if not min_duration <= duration <= longest:
+            issues.append(_issue("error", "audio", f"{path.name} lasts {duration:.2f}s, outside [{min_duration}, {longest}]s", word, lang))
+    return issues
+
+
+def check_corpus_shape(corpus, metadata, assets_dir=ASSETS_DIR):
+    """Corpus-wide checks: originals, duplicates and metadata parity"""
+    issues = []
+    seen = set()
+    for index, entry in enumerate(corpus):
+        original = entry.get("original")
+        if not original:
+            issues.append(_issue("error", "entry", f"entry {index} has no original word"))
+        elif original in seen:
+            issues.append(_issue("error", "entry", f"duplicate entry for {original!r}", original))
+        seen.add(original)
+
+    meta_langs = set(metadata["languages"])
+    corpus_langs = {lang for entry in corpus for lang in entry if lang != "original"}
+    for lang in sorted(corpus_langs - meta_langs):
+        issues.append(_issue("error", "metadata", "language used in the corpus but missing from language_metadata.json", lang=lang))
+    for lang in sorted(meta_langs - corpus_langs):
+        issues.append(_issue("error", "metadata", "language in language_metadata.json but absent from the corpus", lang=lang))
+    for lang in sorted(corpus_langs & meta_langs):
+        for entry in corpus:
+            if lang not in entry:
+                issues.append(_issue("error", "metadata", "word has no cell for this language", entry.get("original"), lang))
+        info = metadata["languages"][lang]
+        if not info.get("name"):
+            issues.append(_issue("error", "metadata", "metadata has no name", lang=lang))
+        flag = info.get("flagAsset")
+        if flag and not (Path(assets_dir) / flag).is_file():
+            # The emoji flag is still there to show, so a missing SVG alone is a warning
+            severity = "warning" if info.get("flag") else "error"
+            issues.append(_issue(severity, "metadata", f"flagAsset {flag} does not exist", lang=lang))
+    return issues
+
+
+def validate_corpus(corpus, metadata, audio_dir=AUDIO_DIR, min_duration=0.2, max_duration=10.0,
+                    max_workers=None, assets_dir=ASSETS_DIR):
+    """Run all checks and return {"summary": {...}, "issues": [...]}"""
+    issues = check_corpus_shape(corpus, metadata, assets_dir)
+    jobs = [
+        (entry.get("original"), lang, cell, str(audio_dir), min_duration, max_duration)
+        for entry in corpus
+        for lang, cell in entry.items()
+        if lang != "original"
+    ]
+    chunksize = max(1, len(jobs) // 64)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for cell_issues in executor.map(check_cell, jobs, chunksize=chunksize):
+            issues.extend(cell_issues)
+
+    summary = {
+        "words": len(corpus),
+        "cells": len(jobs),
+        "errors": sum(1 for i in issues if i["severity"] == "error"),
+        "warnings": sum(1 for i in issues if i["severity"] == "warning"),
+    }
+    return {"summary": summary, "issues": issues}
+
+
+def main():
+    # CLI: validate_corpus.py [--corpus corpus.json] [--metadata language_metadata.json] [--audio-dir DIR]
+    #                         [--min-duration 0.2] [--max-duration 10] [--json OUT] [--strict] [--workers N]
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--corpus", dest="corpus", default=str(ASSETS_DIR / "corpus.json"), help="Corpus JSON to validate")
+    parser.add_argument("--metadata", dest="metadata", default=str(ASSETS_DIR / "language_metadata.json"), help="Language metadata JSON")
+    parser.add_argument("--audio-dir", dest="audio_dir", default=str(AUDIO_DIR), help="Directory holding the audio files")
+    parser.add_argument("--min-duration", dest="min_duration", type=float, default=0.2, help="Shortest acceptable clip in seconds")
+    parser.add_argument("--max-duration", dest="max_duration", type=float, default=10.0, help="Longest acceptable clip in seconds")
+    parser.add_argument("--json", dest="json_out", default=None, help="Write the full report as JSON")
+    parser.add_argument("--strict", dest="strict", action="store_true", help="Fail on warnings too")
+    parser.add_argument("--workers", dest="workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+    with open(args.metadata, encoding="utf-8") as f:
+        metadata = json.load(f)
+
+    report = validate_corpus(corpus, metadata, args.audio_dir, args.min_duration, args.max_duration, args.workers)
+
+    by_check = {}
+    for issue in report["issues"]:
+        by_check.setdefault((issue["severity"], issue["check"]), []).append(issue)
+    for (severity, check), issues in sorted(by_check.items()):
+        print(f"\n{'❌' if severity == 'error' else '⚠️ '} {check}: {len(issues)} {severity}(s)")
+        for issue in issues[:20]:
+            where = "/".join(str(part) for part in (issue["word"], issue["lang"]) if part)
+            print(f"   {where}: {issue['message']}" if where else f"   {issue['message']}")
+        if len(issues) > 20:
+            print(f"   ... and {len(issues) - 20} more")
+
+    summary = report["summary"]
+    print(f"\nChecked {summary['cells']} cell(s) across {summary['words']} word(s): "
+          f"{summary['errors']} error(s), {summary['warnings']} warning(s)")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    failed = summary["errors"] or (args.strict and summary["warnings"])
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()